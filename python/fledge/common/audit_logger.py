@@ -4,6 +4,9 @@
 # See: http://fledge-iot.readthedocs.io/
 # FLEDGE_END
 
+import asyncio
+import json
+
 from fledge.common.logger import FLCoreLogger
 from fledge.common.storage_client.payload_builder import PayloadBuilder
 from fledge.common.storage_client.storage_client import StorageClientAsync
@@ -16,6 +19,12 @@ __version__ = "${VERSION}"
 
 _logger = FLCoreLogger().get_logger(__name__)
 
+DEFAULT_MAX_QUEUE_SIZE = 1000
+"""Maximum number of audit entries waiting to be written, callers wait for room beyond it"""
+
+DEFAULT_MAX_BATCH_SIZE = 100
+"""Maximum number of audit entries written by one insert"""
+
 
 class AuditLoggerSingleton(object):
     """ AuditLoggerSingleton
@@ -32,6 +41,11 @@ class AuditLogger(AuditLoggerSingleton):
     """ Audit Logger
 
         Singleton interface to an audit logging class
+
+        Entries are queued and written in the background, the entries queued while an insert is in progress being
+        written together by the next one. Callers that need an entry to be in storage before they carry on pass
+        wait=True, they then get the storage error if the entry could not be written. Processes call flush before
+        they exit so that no queued entry is lost.
     """
 
     _success = 0
@@ -43,34 +57,101 @@ class AuditLogger(AuditLoggerSingleton):
     _storage = None
     """ The storage client we should use to talk to the storage service """
 
+    _queue = None
+    """ (log row, future of a caller waiting for it or None) of the entries to write """
+
+    _writer_task = None
+    """ asyncio task writing the queued entries """
+
+    _batch_written = None
+    """ future done when the insert in progress completes """
+
+    _max_queue_size = DEFAULT_MAX_QUEUE_SIZE
+    _max_batch_size = DEFAULT_MAX_BATCH_SIZE
+
     def __init__(self, storage=None):
         AuditLoggerSingleton.__init__(self)
         if self._storage is None:
             if not isinstance(storage, StorageClientAsync):
                 raise TypeError('Must be a valid Storage object')
             self._storage = storage
-
-    async def _log(self, level, code, log):
+        if self._queue is None:
+            self._queue = []
+
+    async def _log(self, level, code, log, wait=False):
+        row = {"code": code, "level": level}
+        if log is not None:
+            row["log"] = log
+        loop = asyncio.get_event_loop()
+        writer = self._writer_task
+        if writer is not None and not writer.done() and writer.get_loop() is not loop:
+            # The writer runs in the event loop of another thread, write the entry directly
+            await self._insert([row])
+            return
+        while len(self._queue) >= self._max_queue_size and self._writer_task is not None \
+                and not self._writer_task.done():
+            # Back pressure, wait for the insert in progress to make room
+            if self._batch_written is None:
+                await asyncio.sleep(0)
+            else:
+                await asyncio.shield(self._batch_written)
+        waiter = loop.create_future() if wait else None
+        self._queue.append((row, waiter))
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.ensure_future(self._write_queue())
+        if waiter is not None:
+            await waiter
+
+    async def _insert(self, rows):
         try:
-            if log is None:
-                payload = PayloadBuilder().INSERT(code=code, level=level).payload()
+            if len(rows) == 1:
+                payload = PayloadBuilder().INSERT(**rows[0]).payload()
             else:
-                payload = PayloadBuilder().INSERT(code=code, level=level, log=log).payload()
-
+                payload = json.dumps({"inserts": rows}, sort_keys=False)
             await self._storage.insert_into_tbl("log", payload)
-
         except (StorageServerError, Exception) as ex:
-            _logger.error(ex, "Failed to log audit trail entry '{}'.".format(code))
+            _logger.error(ex, "Failed to log audit trail entry '{}'.".format(
+                "', '".join(str(row["code"]) for row in rows)))
             raise ex
 
-    async def success(self, code, log):
-        await self._log(self._success, code, log)
-
-    async def failure(self, code, log):
-        await self._log(self._failure, code, log)
-
-    async def warning(self, code, log):
-        await self._log(self._warning, code, log)
-
-    async def information(self, code, log):
-        await self._log(self._information, code, log)
+    async def _write_queue(self):
+        loop = asyncio.get_event_loop()
+        while self._queue:
+            batch = self._queue[:self._max_batch_size]
+            del self._queue[:len(batch)]
+            self._batch_written = loop.create_future()
+            try:
+                await self._insert([row for row, _ in batch])
+            except Exception as ex:
+                for _, waiter in batch:
+                    if waiter is not None and not waiter.done():
+                        waiter.set_exception(ex)
+            else:
+                for _, waiter in batch:
+                    if waiter is not None and not waiter.done():
+                        waiter.set_result(None)
+            finally:
+                self._batch_written.set_result(None)
+                self._batch_written = None
+
+    async def flush(self):
+        """ Wait until every queued entry has been written, or has failed to """
+        while self._writer_task is not None and not self._writer_task.done() and \
+                self._writer_task.get_loop() is asyncio.get_event_loop():
+            await asyncio.shield(self._writer_task)
+        if self._queue:
+            # Entries left by a writer of a closed event loop
+            self._writer_task = asyncio.ensure_future(self._write_queue())
+            await self._writer_task
+
+    async def success(self, code, log, wait=False):
+        await self._log(self._success, code, log, wait)
+
+    async def failure(self, code, log, wait=False):
+        await self._log(self._failure, code, log, wait)
+
+    async def warning(self, code, log, wait=False):
+        await self._log(self._warning, code, log, wait)
+
+    async def information(self, code, log, wait=False):
+        await self._log(self._information, code, log, wait)
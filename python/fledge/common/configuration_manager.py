@@ -12,6 +12,7 @@ import inspect
 import ipaddress
 import datetime
 import os
+import time
 from math import *
 import collections
 import ast
@@ -45,67 +46,130 @@ RESERVED_CATG = ['South', 'North', 'General', 'Advanced', 'Utilities', 'rest_api
 
 
 class ConfigurationCache(object):
-    """Configuration Cache Manager"""
+    """Configuration Cache Manager
 
-    def __init__(self, size=30):
+    Least recently used categories are evicted first. The cache is an ordered dictionary kept in access order, the
+    least recently used entry first, so that a hit and an eviction are both O(1).
+    """
+
+    def __init__(self, size=30, ttl=0, max_bytes=0):
         """
         cache: value stored in dictionary as per category_name
         max_cache_size: Hold the recently requested categories in the cache. Default cache size is 30
+        ttl: seconds an entry is served from the cache after its update, 0 for no expiry
+        max_cache_bytes: approximate size in bytes of the cached category values, 0 for no limit
         hit: number of times an item is read from the cache
         miss: number of times an item was not found in the cache and a read of the storage layer was required
         """
-        self.cache = {}
+        self.cache = collections.OrderedDict()
         self.max_cache_size = size
+        self.ttl = ttl
+        self.max_cache_bytes = max_bytes
         self.hit = 0
         self.miss = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @cache.setter
+    def cache(self, value):
+        self._cache = collections.OrderedDict(value)
+        # category_name: (expiry time, approximate size in bytes) of the entries added through update
+        self._entries_info = {}
+        self._bytes = 0
 
     def __contains__(self, category_name):
         """Returns True or False depending on whether or not the key is in the cache
-        and update the hit and data_accessed"""
-        if category_name in self.cache:
-            try:
-                current_hit = self.cache[category_name]['hit']
-            except KeyError:
-                current_hit = 0
-
-            self.hit += 1
-            self.cache[category_name].update({'date_accessed': datetime.datetime.now(), 'hit': current_hit + 1})
-            return True
+        and update the hit count and the access order"""
+        entry = self._cache.get(category_name)
+        if entry is not None:
+            info = self._entries_info.get(category_name)
+            if info is not None and info[0] is not None and info[0] <= time.monotonic():
+                self.remove(category_name)
+                self.expired += 1
+            else:
+                self.hit += 1
+                entry['hit'] = entry.get('hit', 0) + 1
+                self._cache.move_to_end(category_name)
+                return True
         self.miss += 1
         return False
 
     def update(self, category_name, category_description, category_val, display_name=None):
-        """Update the cache dictionary and remove the oldest item"""
-        if category_name not in self.cache and len(self.cache) >= self.max_cache_size:
-            self.remove_oldest()
+        """Update the cache dictionary and remove the least recently used items"""
+        if category_name in self._cache:
+            self.remove(category_name)
+        else:
+            while self._cache and len(self._cache) >= self.max_cache_size:
+                self.remove_oldest()
         display_name = category_name if display_name is None else display_name
-        self.cache[category_name] = {'date_accessed': datetime.datetime.now(), 'description': category_description,
-                                     'value': category_val, 'displayName': display_name}
-        _logger.debug("Updated Configuration Cache %s", self.cache)
+        self._cache[category_name] = {'date_accessed': datetime.datetime.now(), 'description': category_description,
+                                      'value': category_val, 'displayName': display_name}
+        entry_bytes = self._approximate_size(category_val)
+        self._entries_info[category_name] = (time.monotonic() + self.ttl if self.ttl else None, entry_bytes)
+        self._bytes += entry_bytes
+        # Keep the entry just added even when it alone is over the limit
+        while self.max_cache_bytes and self._bytes > self.max_cache_bytes and len(self._cache) > 1:
+            self.remove_oldest()
+        _logger.debug("Updated Configuration Cache %s", category_name)
+
+    def update_value(self, category_name, category_val):
+        """Replace the value of a cached category, keeping its description and display name
+
+        Like any write, it goes through update so that the size and expiry of the entry are recomputed
+        """
+        entry = self._cache.get(category_name)
+        if entry is not None:
+            self.update(category_name, entry['description'], category_val, entry['displayName'])
 
     def remove_oldest(self):
-        """Remove the entry that has the oldest accessed date"""
-        oldest_entry = None
-        for category_name in self.cache:
-            if oldest_entry is None:
-                oldest_entry = category_name
-            elif self.cache[category_name].get('date_accessed') and self.cache[oldest_entry].get('date_accessed') \
-                    and self.cache[category_name]['date_accessed'] < self.cache[oldest_entry]['date_accessed']:
-                oldest_entry = category_name
-        if oldest_entry:
-            self.cache.pop(oldest_entry)
+        """Remove the least recently used entry"""
+        if self._cache:
+            category_name = next(iter(self._cache))
+            self.remove(category_name)
+            self.evicted += 1
 
     def remove(self, key):
         """Remove the entry with given key name"""
-        for category_name in self.cache:
-            if key == category_name:
-                self.cache.pop(key)
-                break
+        if self._cache.pop(key, None) is not None:
+            info = self._entries_info.pop(key, None)
+            if info is not None:
+                self._bytes -= info[1]
+
+    @staticmethod
+    def _approximate_size(category_val):
+        try:
+            return len(json.dumps(category_val, default=str))
+        except (TypeError, ValueError):
+            return 0
 
     @property
     def size(self):
         """Return the size of the cache"""
-        return len(self.cache)
+        return len(self._cache)
+
+    def stats(self):
+        """ Cache usage counters, to tune the cache size from
+
+        Returns:
+            dict with the size and limits of the cache, the hit, miss, expired and evicted counters and the hit ratio
+        """
+        lookups = self.hit + self.miss
+        return {
+            "size": len(self._cache),
+            "maxSize": self.max_cache_size,
+            "bytes": self._bytes,
+            "maxBytes": self.max_cache_bytes,
+            "ttl": self.ttl,
+            "hit": self.hit,
+            "miss": self.miss,
+            "hitRatio": round(self.hit / lookups, 4) if lookups else 0.0,
+            "expired": self.expired,
+            "evicted": self.evicted
+        }
 
 
 class ConfigurationManagerSingleton(object):
@@ -149,6 +213,7 @@ class ConfigurationManager(ConfigurationManagerSingleton):
     _registered_interests = None
     _registered_interests_child = None
     _cacheManager = None
+    _category_groups = None
     _acl_handler = None
 
     def __init__(self, storage=None):
@@ -692,6 +757,7 @@ class ConfigurationManager(ConfigurationManagerSingleton):
                                               value=new_category_val, display_name=display_name).payload()
             result = await self._storage.insert_into_tbl("configuration", payload)
             response = result['response']
+            self._invalidate_category_groups()
             self._cacheManager.update(category_name, category_description, new_category_val, display_name)
         except KeyError:
             raise ValueError(result['message'])
@@ -763,47 +829,59 @@ class ConfigurationManager(ConfigurationManagerSingleton):
         result = await self._storage.query_tbl_with_payload('configuration', payload)
         return result['rows'][0] if result['rows'] else None
 
-    async def _read_all_groups(self, root, children):
-        async def nested_children(child):
-            # Recursively find children
-            if not child:
-                return
-            next_children = await self.get_category_child(child["key"])
-            if len(next_children) == 0:
-                child.update({"children": []})
-            else:
-                child.update({"children": next_children})
-                # call for each child
-                for next_child in child["children"]:
-                    await nested_children(next_child)
+    async def _read_category_groups(self):
+        """ Categories and their children, read with one query per table and kept until a category or a parent-child
+        relation is created, changed or deleted
+
+        Returns:
+            (list of (key, description, display_name) of all categories,
+             dict of parent key: list of child keys in creation order)
+        """
+        if self._category_groups is None:
+            # SELECT key, description, display_name FROM configuration
+            payload = PayloadBuilder().SELECT("key", "description", "display_name").payload()
+            all_categories = await self._storage.query_tbl_with_payload('configuration', payload)
 
-        # SELECT key, description, display_name FROM configuration
-        payload = PayloadBuilder().SELECT("key", "description", "display_name").payload()
-        all_categories = await self._storage.query_tbl_with_payload('configuration', payload)
+            # SELECT parent, child FROM category_children ORDER BY id
+            children_payload = PayloadBuilder().SELECT("parent", "child").ORDER_BY(["id"]).payload()
+            category_children = await self._storage.query_tbl_with_payload('category_children', children_payload)
 
-        # SELECT DISTINCT child FROM category_children
-        unique_category_children_payload = PayloadBuilder().SELECT("child").DISTINCT(["child"]).payload()
-        unique_category_children = await self._storage.query_tbl_with_payload('category_children',
-                                                                              unique_category_children_payload)
+            categories = [(row["key"], row["description"], row["display_name"]) for row in all_categories['rows']]
+            children = {}
+            for row in category_children['rows']:
+                children.setdefault(row["parent"], []).append(row["child"])
+            self._category_groups = (categories, children)
+        return self._category_groups
 
-        list_child = [row['child'] for row in unique_category_children['rows']]
+    def _invalidate_category_groups(self):
+        self._category_groups = None
+
+    async def _read_all_groups(self, root, children):
+        categories, category_children = await self._read_category_groups()
+        list_child = {child for _children in category_children.values() for child in _children}
         list_root = []
         list_not_root = []
 
-        for row in all_categories['rows']:
-            if row["key"] in list_child:
-                list_not_root.append((row["key"], row["description"], row["display_name"]))
+        for category in categories:
+            if category[0] in list_child:
+                list_not_root.append(category)
             else:
-                list_root.append((row["key"], row["description"], row["display_name"]))
+                list_root.append(category)
         if children:
-            tree = []
-            for k, v, d in list_root if root is True else list_not_root:
-                tree.append({"key": k, "description": v, "displayName": d, "children": []})
+            info = {k: (v, d) for k, v, d in categories}
 
-            for branch in tree:
-                await nested_children(branch)
+            def nested_children(key, ancestors):
+                # Children that are not a category anymore are skipped, as are relations looping back to an ancestor
+                branch = []
+                for child in category_children.get(key, []):
+                    if child in info and child not in ancestors:
+                        description, display_name = info[child]
+                        branch.append({"key": child, "description": description, "displayName": display_name,
+                                       "children": nested_children(child, ancestors | {child})})
+                return branch
 
-            return tree
+            return [{"key": k, "description": v, "displayName": d, "children": nested_children(k, {k})}
+                    for k, v, d in (list_root if root is True else list_not_root)]
 
         return list_root if root else list_not_root
 
@@ -985,14 +1063,14 @@ class ConfigurationManager(ConfigurationManagerSingleton):
             cat_value = await self._read_category_val(category_name)
             self._handle_config_items(category_name, cat_value)
             # Category config items cache updated
-            for item_name, new_val in config_item_list.items():
-                if category_name in self._cacheManager.cache:
-                    if item_name in self._cacheManager.cache[category_name]['value']:
-                        self._cacheManager.cache[category_name]['value'][item_name]['value'] = cat_value[item_name][
-                            'value']
+            if category_name in self._cacheManager.cache:
+                category_val = self._cacheManager.cache[category_name]['value']
+                for item_name, new_val in config_item_list.items():
+                    if item_name in category_val:
+                        category_val[item_name]['value'] = cat_value[item_name]['value']
                     else:
-                        self._cacheManager.cache[category_name]['value'].update(
-                            {item_name: cat_value[item_name]['value']})
+                        category_val.update({item_name: cat_value[item_name]['value']})
+                self._cacheManager.update_value(category_name, category_val)
 
             # Configuration Change audit entry
             audit = AuditLogger(self._storage)
@@ -1043,16 +1121,10 @@ class ConfigurationManager(ConfigurationManagerSingleton):
                                            display_name=display_name).WHERE(["key", "=", category_name]).payload()
             result = await self._storage.update_tbl("configuration", payload)
             response = result['response']
+            self._invalidate_category_groups()
             # Re-read category from DB
             new_category_val_db = await self._read_category_val(category_name)
-            if category_name in self._cacheManager.cache:
-                self._cacheManager.cache[category_name]['description'] = category_description
-                self._cacheManager.cache[category_name]['value'] = new_category_val_db
-                self._cacheManager.cache[category_name]['displayName'] = display_name
-            else:
-                self._cacheManager.cache.update({category_name: {"description": category_description,
-                                                                 "value": new_category_val_db,
-                                                                 "displayName": display_name}})
+            self._cacheManager.update(category_name, category_description, new_category_val_db, display_name)
         except KeyError:
             raise ValueError(result['message'])
         except StorageServerError as ex:
@@ -1255,12 +1327,14 @@ class ConfigurationManager(ConfigurationManagerSingleton):
                 cat_item["file"] = script_file_path
 
             if category_name in self._cacheManager.cache:
-                if item_name in self._cacheManager.cache[category_name]['value']:
-                    self._cacheManager.cache[category_name]['value'][item_name]['value'] = cat_item['value']
+                category_val = self._cacheManager.cache[category_name]['value']
+                if item_name in category_val:
+                    category_val[item_name]['value'] = cat_item['value']
                     if storage_value_entry['type'] == 'script':
-                        self._cacheManager.cache[category_name]['value'][item_name]["file"] = script_file_path
+                        category_val[item_name]["file"] = script_file_path
                 else:
-                    self._cacheManager.cache[category_name]['value'].update({item_name: cat_item['value']})
+                    category_val.update({item_name: cat_item['value']})
+                self._cacheManager.update_value(category_name, category_val)
         except Exception as ex:
             if 'Forbidden' not in str(ex):
                 _logger.exception(
@@ -1357,11 +1431,12 @@ class ConfigurationManager(ConfigurationManagerSingleton):
             # always get value from storage
             cat_item = await self._read_item_val(category_name, item_name)
             if category_name in self._cacheManager.cache:
-                if item_name in self._cacheManager.cache[category_name]['value']:
-                    self._cacheManager.cache[category_name]['value'][item_name][optional_entry_name] = cat_item[
-                        optional_entry_name]
+                category_val = self._cacheManager.cache[category_name]['value']
+                if item_name in category_val:
+                    category_val[item_name][optional_entry_name] = cat_item[optional_entry_name]
                 else:
-                    self._cacheManager.cache[category_name]['value'].update({item_name: cat_item[optional_entry_name]})
+                    category_val.update({item_name: cat_item[optional_entry_name]})
+                self._cacheManager.update_value(category_name, category_val)
         except:
             _logger.exception(
                 'Unable to set optional %s entry based on category_name %s and item_name %s and value_item_entry %s',
@@ -1536,6 +1611,7 @@ class ConfigurationManager(ConfigurationManagerSingleton):
             payload = PayloadBuilder().INSERT(parent=category_name, child=child).payload()
             result = await self._storage.insert_into_tbl("category_children", payload)
             response = result['response']
+            self._invalidate_category_groups()
         except KeyError:
             raise ValueError(result['message'])
         except StorageServerError as ex:
@@ -1664,6 +1740,7 @@ class ConfigurationManager(ConfigurationManagerSingleton):
             payload = PayloadBuilder().WHERE(["parent", "=", category_name]).AND_WHERE(
                 ["child", "=", child_category]).payload()
             result = await self._storage.delete_from_tbl("category_children", payload)
+            self._invalidate_category_groups()
 
             if result['response'] == 'deleted':
                 child_dict = await self._read_all_child_category_names(category_name)
@@ -1706,6 +1783,7 @@ class ConfigurationManager(ConfigurationManagerSingleton):
         try:
             payload = PayloadBuilder().WHERE(["parent", "=", category_name]).payload()
             result = await self._storage.delete_from_tbl("category_children", payload)
+            self._invalidate_category_groups()
             response = result["response"]
             # TODO: Shall we write audit trail code entry here? log_code?
 
@@ -1770,12 +1848,14 @@ class ConfigurationManager(ConfigurationManagerSingleton):
             # Remove cat as child from parent-child relation.
             payload = PayloadBuilder().WHERE(["child", "=", cat]).payload()
             result = await self._storage.delete_from_tbl("category_children", payload)
+            self._invalidate_category_groups()
             if result['response'] == 'deleted':
                 _logger.info('Deleted parent in category_children: {}'.format(cat))
 
             # Remove category.
             payload = PayloadBuilder().WHERE(["key", "=", cat]).payload()
             result = await self._storage.delete_from_tbl("configuration", payload)
+            self._invalidate_category_groups()
             if result['response'] == 'deleted':
                 _logger.info('Deleted parent category from configuration: {}'.format(cat))
                 audit = AuditLogger(self._storage)
@@ -2162,6 +2242,19 @@ class ConfigurationManager(ConfigurationManagerSingleton):
         if cat_name == 'CONFIGURATION':
             if 'cacheSize' in cat_value:
                 self._cacheManager.max_cache_size = int(cat_value['cacheSize']['value'])
+            if 'cacheTTL' in cat_value:
+                self._cacheManager.ttl = int(cat_value['cacheTTL']['value'])
+            if 'cacheMemoryLimit' in cat_value:
+                self._cacheManager.max_cache_bytes = int(cat_value['cacheMemoryLimit']['value']) * 1024
+        elif cat_name == 'STORAGE_CLIENT':
+            kwargs = {}
+            if 'connectionLimit' in cat_value:
+                kwargs['limit'] = int(cat_value['connectionLimit']['value'])
+            if 'connectionLimitPerHost' in cat_value:
+                kwargs['limit_per_host'] = int(cat_value['connectionLimitPerHost']['value'])
+            if 'keepaliveTimeout' in cat_value:
+                kwargs['keepalive_timeout'] = float(cat_value['keepaliveTimeout']['value'])
+            StorageClientAsync.session_pool.configure(**kwargs)
         elif cat_name == 'firewall':
             from fledge.services.core.firewall import Firewall
             Firewall.IPAddresses.save(data=cat_value)
@@ -23,16 +23,40 @@ class JQFilter:
     This class uses pyjq (https://pypi.python.org/pypi/jq) which contains Python bindings for jq
     """
 
+    _MAX_PROGRAMS = 16
+    """Maximum number of compiled filter programs kept"""
+
+    _programs = {}
+    """Compiled filter programs keyed by the filter string"""
+
     def __init__(self):
         """Initialise the JQFilter"""
         self._logger = FLCoreLogger().get_logger("JQFilter")
 
+    @classmethod
+    def compile(cls, filter_string):
+        """Compiled program of the filter, compiled on first use only
+
+        Args:
+            filter_string: filter in JQ format
+        Returns: compiled program
+        Raises:
+            ValueError: If filter is not a proper JQ filter
+        """
+        program = cls._programs.get(filter_string)
+        if program is None:
+            program = pyjq.compile(filter_string)
+            if len(cls._programs) >= cls._MAX_PROGRAMS:
+                del cls._programs[next(iter(cls._programs))]
+            cls._programs[filter_string] = program
+        return program
+
     def transform(self, reading_block, filter_string):
         """
         Args:
             reading_block: Formatted JSON on which filter needs to be applied.
             filter_string: filter to apply. Filter should be in JQ format.
-        Returns: transformed JSON (if apply_filter is true)
+        Returns: list of the results of the filter, as python objects
         Raises:
             TypeError: If reading_block is not a valid JSON
             ValueError: If filter is not a proper JQ filter
@@ -43,7 +67,7 @@ class JQFilter:
 
         """
         try:
-            return pyjq.all(filter_string, reading_block)
+            return self.compile(filter_string).all(reading_block)
         except TypeError as ex:
             self._logger.error(ex, "Invalid JSON passed during jq transform.")
             raise
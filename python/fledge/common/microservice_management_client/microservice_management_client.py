@@ -9,8 +9,11 @@ import json
 import urllib.parse
 import logging
 
+import aiohttp
+
 from fledge.common import logger
 from fledge.common.microservice_management_client import exceptions as client_exceptions
+from fledge.common.web.session_pool import SessionPool
 
 __author__ = "Ashwin Gopalakrishnan"
 __copyright__ = "Copyright (c) 2017 OSIsoft, LLC"
@@ -23,6 +26,9 @@ _logger = logger.setup(__name__, level=logging.INFO)
 class MicroserviceManagementClient(object):
     _management_client_conn = None
 
+    session_pool = SessionPool()
+    """Keep-alive client sessions of the async requests, shared by all the clients of the process"""
+
     def __init__(self, microservice_management_host, microservice_management_port):
         self._management_client_conn = http.client.HTTPConnection("{0}:{1}".format(microservice_management_host, microservice_management_port))
         self.hostname = microservice_management_host
@@ -391,6 +397,30 @@ class MicroserviceManagementClient(object):
         response = json.loads(res)
         return response
 
+    async def create_asset_tracker_events(self, asset_events):
+        """ Registers a batch of asset tracker events with a single request
+
+        :param asset_events: list of asset tracker events
+               e.g. [{"asset": "AirIntake", "event": "Ingest", "service": "PT100_In1", "plugin": "PT100"}]
+        :return: list of the asset tracker events that could not be registered
+        """
+        url = 'http://{}:{}/fledge/track'.format(self.hostname, self.port)
+        session = self.session_pool.get_session()
+        try:
+            async with session.post(url, data=json.dumps(asset_events)) as resp:
+                if resp.status >= 400:
+                    _logger.error("Failed to register %d asset tracker events, error code: %d, Reason: %s",
+                                  len(asset_events), resp.status, resp.reason)
+                    return list(asset_events)
+                response = await resp.json()
+        except aiohttp.ClientError as ex:
+            _logger.error("Failed to register %d asset tracker events: %s", len(asset_events), str(ex))
+            return list(asset_events)
+        failed = response.get('failed', [])
+        if failed:
+            _logger.error("Failed to register asset tracker events %s", failed)
+        return failed
+
     def get_alert_by_key(self, key):
         url = "/fledge/alert/{}".format(key)
         self._management_client_conn.request(method='GET', url=url)
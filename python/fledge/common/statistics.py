@@ -4,6 +4,7 @@
 # See: http://fledge-iot.readthedocs.io/
 # FLEDGE_END
 
+import asyncio
 import json
 from fledge.common.logger import FLCoreLogger
 from fledge.common.storage_client.payload_builder import PayloadBuilder
@@ -17,6 +18,12 @@ __version__ = "${VERSION}"
 
 _logger = FLCoreLogger().get_logger(__name__)
 
+DEFAULT_FLUSH_INTERVAL = 5
+"""Seconds between two writes of the increments buffered by a StatisticsAggregator"""
+
+DEFAULT_FLUSH_THRESHOLD = 100
+"""Number of buffered increments that triggers a write before the flush interval is over"""
+
 
 async def create_statistics(storage=None):
     stat = Statistics(storage)
@@ -155,3 +162,108 @@ class Statistics(object):
                 self._registered_keys.append(row['key'])
         except Exception as ex:
             _logger.exception(ex, 'Failed to retrieve statistics keys')
+
+
+class StatisticsAggregator(object):
+    """ Buffers statistics increments per key and writes them with a single update_bulk
+
+    Increments of the same key are summed in memory. They are written every flush_interval seconds, or as soon as
+    flush_threshold increments have been added, and when the aggregator is closed. Increments that could not be written
+    are kept and added to the next write, so that a storage failure does not lose them.
+    """
+
+    def __init__(self, stats, flush_interval=DEFAULT_FLUSH_INTERVAL, flush_threshold=DEFAULT_FLUSH_THRESHOLD):
+        """
+        Args:
+            stats: Statistics instance used to write the increments
+            flush_interval: seconds between two writes
+            flush_threshold: number of increments added that triggers a write
+        """
+        if not isinstance(stats, Statistics):
+            raise TypeError('Must be a valid Statistics object')
+        self._stats = stats
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        self._pending = {}
+        self._added = 0
+        self._flush_task = None
+        self._timer_task = None
+        self._closed = False
+
+    @property
+    def pending(self):
+        """Increments per key not written yet"""
+        return dict(self._pending)
+
+    def start(self):
+        """ Start writing the buffered increments every flush_interval seconds """
+        if self._timer_task is None:
+            self._timer_task = asyncio.ensure_future(self._timer())
+
+    def add(self, key, value_increment):
+        """ Buffer an increment of a statistics key
+
+        Args:
+            key: statistics key
+            value_increment: amount to increment the value by
+        """
+        if not isinstance(key, str):
+            raise TypeError('key must be a string')
+        if not isinstance(value_increment, int):
+            raise ValueError('value must be an integer')
+        if value_increment == 0:
+            return
+        self._pending[key] = self._pending.get(key, 0) + value_increment
+        self._added += 1
+        if self._added >= self._flush_threshold and not self._closed and \
+                (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.ensure_future(self.flush())
+
+    async def flush(self):
+        """ Write the buffered increments with one update_bulk
+
+        Returns:
+            True if there was nothing to write or the increments were written, False if they were kept to be written
+            again by the next flush
+        """
+        if not self._pending:
+            return True
+        # Take the increments before awaiting, those added during the write go to the next one
+        updates, self._pending, self._added = self._pending, {}, 0
+        try:
+            await self._stats.update_bulk(updates)
+        except Exception:
+            # update_bulk has logged the error, keep the increments for the next write
+            for key, value in updates.items():
+                self._pending[key] = self._pending.get(key, 0) + value
+            return False
+        return True
+
+    async def close(self):
+        """ Stop the timer and write the remaining increments
+
+        If the bulk write fails, the keys are written one by one so that a single bad key does not lose the others.
+        """
+        self._closed = True
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            try:
+                await self._timer_task
+            except asyncio.CancelledError:
+                pass
+            self._timer_task = None
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        if await self.flush():
+            return
+        updates, self._pending = self._pending, {}
+        for key, value in updates.items():
+            try:
+                await self._stats.update(key, value)
+            except Exception:
+                _logger.error('Statistics increment %s of key %s has been lost', value, key)
+
+    async def _timer(self):
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
@@ -12,7 +12,6 @@ __copyright__ = "Copyright (c) 2017 OSIsoft, LLC"
 __license__ = "Apache 2.0"
 __version__ = "${VERSION}"
 
-import aiohttp
 import http.client
 import json
 import time
@@ -21,10 +20,14 @@ from abc import ABC, abstractmethod
 from fledge.common import logger
 from fledge.common.service_record import ServiceRecord
 from fledge.common.storage_client.exceptions import *
-from fledge.common.storage_client.utils import Utils
+from fledge.common.storage_client.utils import Utils, RowsStreamDecoder
+from fledge.common.web.session_pool import SessionPool
 
 _LOGGER = logger.setup(__name__)
 
+FETCH_CHUNK_SIZE = 500
+""" Default number of rows per sub-batch yielded by ReadingsStorageClientAsync.fetch_iter and query_iter """
+
 
 class AbstractStorage(ABC):
     """ abstract class for storage client """
@@ -49,6 +52,10 @@ class AbstractStorage(ABC):
 
 
 class StorageClientAsync(AbstractStorage):
+
+    session_pool = SessionPool()
+    """ Keep-alive HTTP sessions to the storage service, shared by all client instances of an event loop """
+
     def __init__(self, core_management_host, core_management_port, svc=None):
         try:
             if svc:
@@ -126,7 +133,7 @@ class StorageClientAsync(AbstractStorage):
         """ insert json payload into given table
 
         :param tbl_name:
-        :param data: JSON payload
+        :param data: JSON payload, or a dict / list which is serialised once
         :return:
 
         :Example:
@@ -145,19 +152,20 @@ class StorageClientAsync(AbstractStorage):
         if not data:
             raise ValueError("Data to insert is missing")
 
-        if not Utils.is_json(data):
+        data = Utils.to_payload(data)
+        if data is None:
             raise TypeError("Provided data to insert must be a valid JSON")
 
         post_url = '/storage/table/{tbl_name}'.format(tbl_name=tbl_name)
         url = 'http://' + self.base_url + post_url
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, data=data) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("POST %s, with payload: %s", post_url, data)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.post(url, data=data) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.info("POST %s, with payload: %s", post_url, data)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
@@ -165,7 +173,7 @@ class StorageClientAsync(AbstractStorage):
         """ update json payload for specified condition into given table
 
         :param tbl_name:
-        :param data: JSON payload
+        :param data: JSON payload, or a dict / list which is serialised once
         :return:
 
         :Example:
@@ -188,20 +196,21 @@ class StorageClientAsync(AbstractStorage):
         if not data:
             raise ValueError("Data to update is missing")
 
-        if not Utils.is_json(data):
+        data = Utils.to_payload(data)
+        if data is None:
             raise TypeError("Provided data to update must be a valid JSON")
 
         put_url = '/storage/table/{tbl_name}'.format(tbl_name=tbl_name)
 
         url = 'http://' + self.base_url + put_url
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, data=data) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("PUT %s, with payload: %s", put_url, data)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.put(url, data=data) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.info("PUT %s, with payload: %s", put_url, data)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
@@ -209,7 +218,7 @@ class StorageClientAsync(AbstractStorage):
         """ Delete for specified condition from given table
 
         :param tbl_name:
-        :param condition: JSON payload
+        :param condition: JSON payload, or a dict which is serialised once
         :return:
 
         :Example:
@@ -227,18 +236,20 @@ class StorageClientAsync(AbstractStorage):
 
         del_url = '/storage/table/{tbl_name}'.format(tbl_name=tbl_name)
 
-        if condition and (not Utils.is_json(condition)):
-            raise TypeError("condition payload must be a valid JSON")
+        if condition:
+            condition = Utils.to_payload(condition)
+            if condition is None:
+                raise TypeError("condition payload must be a valid JSON")
 
         url = 'http://' + self.base_url + del_url
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(url, data=condition) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("DELETE %s, with payload: %s", del_url, condition if condition else '')
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.delete(url, data=condition) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.info("DELETE %s, with payload: %s", del_url, condition if condition else '')
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
@@ -262,14 +273,14 @@ class StorageClientAsync(AbstractStorage):
             get_url += '?{}'.format(query)
 
         url = 'http://' + self.base_url + get_url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("GET %s", get_url)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.get(url) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.info("GET %s", get_url)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
@@ -277,7 +288,7 @@ class StorageClientAsync(AbstractStorage):
         """ Complex SELECT query for the specified table with a payload
 
         :param tbl_name:
-        :param query_payload: payload in valid JSON format
+        :param query_payload: payload in valid JSON format, or a dict which is serialised once
         :return:
 
         :Example:
@@ -295,21 +306,22 @@ class StorageClientAsync(AbstractStorage):
         if not query_payload:
             raise ValueError("Query payload is missing")
 
-        if not Utils.is_json(query_payload):
+        query_payload = Utils.to_payload(query_payload)
+        if query_payload is None:
             raise TypeError("Query payload must be a valid JSON")
 
         put_url = '/storage/table/{tbl_name}/query'.format(tbl_name=tbl_name)
 
         url = 'http://' + self.base_url + put_url
 
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, data=query_payload) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("PUT %s, with query payload: %s", put_url, query_payload)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.put(url, data=query_payload) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.info("PUT %s, with query payload: %s", put_url, query_payload)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
@@ -326,14 +338,14 @@ class StorageClientAsync(AbstractStorage):
         data = {"id": str(int(time.time()))}
 
         url = 'http://' + self.base_url + post_url
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, data=json.dumps(data)) as resp:
-                status_code = resp.status
-                jdoc = await resp.text()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("POST %s", post_url)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.post(url, data=json.dumps(data)) as resp:
+            status_code = resp.status
+            jdoc = await resp.text()
+            if status_code not in range(200, 209):
+                _LOGGER.info("POST %s", post_url)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
         return json.loads(jdoc)
 
     async def put_snapshot(self, tbl_name, snapshot_id):
@@ -349,14 +361,14 @@ class StorageClientAsync(AbstractStorage):
         put_url = '/storage/table/{tbl_name}/snapshot/{id}'.format(tbl_name=tbl_name, id=snapshot_id)
 
         url = 'http://' + self.base_url + put_url
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url) as resp:
-                status_code = resp.status
-                jdoc = await resp.text()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("PUT %s", put_url)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.put(url) as resp:
+            status_code = resp.status
+            jdoc = await resp.text()
+            if status_code not in range(200, 209):
+                _LOGGER.info("PUT %s", put_url)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
         return json.loads(jdoc)
 
     async def delete_snapshot(self, tbl_name, snapshot_id):
@@ -372,14 +384,14 @@ class StorageClientAsync(AbstractStorage):
         delete_url = '/storage/table/{tbl_name}/snapshot/{id}'.format(tbl_name=tbl_name, id=snapshot_id)
 
         url = 'http://' + self.base_url + delete_url
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(url) as resp:
-                status_code = resp.status
-                jdoc = await resp.text()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("DELETE %s", delete_url)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.delete(url) as resp:
+            status_code = resp.status
+            jdoc = await resp.text()
+            if status_code not in range(200, 209):
+                _LOGGER.info("DELETE %s", delete_url)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
         return json.loads(jdoc)
 
     async def get_snapshot(self, tbl_name):
@@ -394,14 +406,14 @@ class StorageClientAsync(AbstractStorage):
         get_url = '/storage/table/{tbl_name}/snapshot'.format(tbl_name=tbl_name)
 
         url = 'http://' + self.base_url + get_url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                status_code = resp.status
-                jdoc = await resp.text()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("GET %s", get_url)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.get(url) as resp:
+            status_code = resp.status
+            jdoc = await resp.text()
+            if status_code not in range(200, 209):
+                _LOGGER.info("GET %s", get_url)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
         return json.loads(jdoc)
 
 
@@ -415,7 +427,7 @@ class ReadingsStorageClientAsync(StorageClientAsync):
 
     async def append(self, readings):
         """
-        :param readings:
+        :param readings: JSON payload, or a dict which is serialised once without being parsed again
         :return:
 
         :Example:
@@ -441,18 +453,19 @@ class ReadingsStorageClientAsync(StorageClientAsync):
         if not readings:
             raise ValueError("Readings payload is missing")
 
-        if not Utils.is_json(readings):
+        readings = Utils.to_payload(readings)
+        if readings is None:
             raise TypeError("Readings payload must be a valid JSON")
 
         url = 'http://' + self._base_url + '/storage/reading'
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, data=readings) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.error("POST url %s with payload: %s, Error code: %d, reason: %s, details: %s",
-                                  '/storage/reading', readings, resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.post(url, data=readings) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.error("POST url %s with payload: %s, Error code: %d, reason: %s, details: %s",
+                              '/storage/reading', readings, resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
@@ -480,21 +493,70 @@ class ReadingsStorageClientAsync(StorageClientAsync):
 
         get_url = '/storage/reading?id={}&count={}'.format(reading_id, count)
         url = 'http://' + self._base_url + get_url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.error("GET url: %s, Error code: %d, reason: %s, details: %s", url, resp.status,
-                                  resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.get(url) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.error("GET url: %s, Error code: %d, reason: %s, details: %s", url, resp.status,
+                              resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
+    async def fetch_iter(self, reading_id, count, chunk_size=FETCH_CHUNK_SIZE):
+        """ Same as fetch, but decodes the response while it is received and yields the rows in sub-batches
+
+        Peak memory is bound to a sub-batch and the undecoded part of a network read, rather than to the whole
+        block of readings.
+
+        :param reading_id: the first reading ID in the block that is retrieved
+        :param count: the number of readings to return, if available
+        :param chunk_size: maximum number of rows per yielded list
+        :return: async iterator of lists of rows
+        :Example:
+            async for rows in readings_client.fetch_iter(2, 10000):
+                ...
+        """
+
+        if reading_id is None:
+            raise ValueError("first reading id to retrieve the readings block is required")
+
+        if count is None:
+            raise ValueError("count is required to retrieve the readings block")
+
+        count = int(count)
+        chunk_size = int(chunk_size)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        get_url = '/storage/reading?id={}&count={}'.format(reading_id, count)
+        url = 'http://' + self._base_url + get_url
+        session = self.session_pool.get_session()
+        async with session.get(url) as resp:
+            status_code = resp.status
+            if status_code not in range(200, 209):
+                jdoc = await resp.json()
+                _LOGGER.error("GET url: %s, Error code: %d, reason: %s, details: %s", url, resp.status,
+                              resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+
+            decoder = RowsStreamDecoder()
+            batch = []
+            async for data in resp.content.iter_any():
+                for row in decoder.feed(data):
+                    batch.append(row)
+                    if len(batch) >= chunk_size:
+                        yield batch
+                        batch = []
+            decoder.close()
+            if batch:
+                yield batch
+
     async def query(self, query_payload):
         """
 
-        :param query_payload:
+        :param query_payload: payload in valid JSON format, or a dict which is serialised once
         :return:
         :Example:
             curl -X PUT http://0.0.0.0:8080/storage/reading/query -d @payload.json
@@ -512,21 +574,69 @@ class ReadingsStorageClientAsync(StorageClientAsync):
         if not query_payload:
             raise ValueError("Query payload is missing")
 
-        if not Utils.is_json(query_payload):
+        query_payload = Utils.to_payload(query_payload)
+        if query_payload is None:
             raise TypeError("Query payload must be a valid JSON")
 
         url = 'http://' + self._base_url + '/storage/reading/query'
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, data=query_payload) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.error("PUT url %s with query payload: %s, Error code: %d, reason: %s, details: %s",
-                                  '/storage/reading/query', query_payload, resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self.session_pool.get_session()
+        async with session.put(url, data=query_payload) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.error("PUT url %s with query payload: %s, Error code: %d, reason: %s, details: %s",
+                              '/storage/reading/query', query_payload, resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
+    async def query_iter(self, query_payload, chunk_size=FETCH_CHUNK_SIZE):
+        """ Same as query, but decodes the response while it is received and yields the rows in sub-batches
+
+        :param query_payload: payload in valid JSON format, or a dict which is serialised once
+        :param chunk_size: maximum number of rows per yielded list
+        :return: async iterator of lists of rows
+        :raises StorageServerError: if the storage service fails the query or its response has no rows
+        :Example:
+            async for rows in readings_client.query_iter({"where": {...}}):
+                ...
+        """
+
+        if not query_payload:
+            raise ValueError("Query payload is missing")
+
+        query_payload = Utils.to_payload(query_payload)
+        if query_payload is None:
+            raise TypeError("Query payload must be a valid JSON")
+
+        chunk_size = int(chunk_size)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        url = 'http://' + self._base_url + '/storage/reading/query'
+        session = self.session_pool.get_session()
+        async with session.put(url, data=query_payload) as resp:
+            status_code = resp.status
+            if status_code not in range(200, 209):
+                jdoc = await resp.json()
+                _LOGGER.error("PUT url %s with query payload: %s, Error code: %d, reason: %s, details: %s",
+                              '/storage/reading/query', query_payload, resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+
+            decoder = RowsStreamDecoder()
+            batch = []
+            async for data in resp.content.iter_any():
+                for row in decoder.feed(data):
+                    batch.append(row)
+                    if len(batch) >= chunk_size:
+                        yield batch
+                        batch = []
+            jdoc = decoder.close()
+            if 'rows' not in jdoc:
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+            if batch:
+                yield batch
+
     async def purge(self, age=None, sent_id=0, size=None, flag=None, asset=None):
         """ Purge readings based on the age of the readings
 
@@ -585,19 +695,19 @@ class ReadingsStorageClientAsync(StorageClientAsync):
             put_url = '/storage/reading/purge?asset={}'.format(urllib.parse.quote(asset))
 
         url = 'http://' + self._base_url + put_url
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, data=None) as resp:
-                status_code = resp.status
-                try:
-                    jdoc = await resp.json()
-                    if status_code not in range(200, 209):
-                        _LOGGER.error("PUT url %s, Error code: %d, reason: %s, details: %s", put_url, resp.status,
-                                      resp.reason, jdoc)
-                        raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
-                except ValueError as err:
-                    jdoc = None
-                    _LOGGER.error(err, "Failed to parse JSON data returned of purge from the storage reading plugin.")
-                except Exception as ex:
-                    jdoc = None
-                    _LOGGER.error(ex, "Purge readings is failed.")
+        session = self.session_pool.get_session()
+        async with session.put(url, data=None) as resp:
+            status_code = resp.status
+            try:
+                jdoc = await resp.json()
+                if status_code not in range(200, 209):
+                    _LOGGER.error("PUT url %s, Error code: %d, reason: %s, details: %s", put_url, resp.status,
+                                  resp.reason, jdoc)
+                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+            except ValueError as err:
+                jdoc = None
+                _LOGGER.error(err, "Failed to parse JSON data returned of purge from the storage reading plugin.")
+            except Exception as ex:
+                jdoc = None
+                _LOGGER.error(ex, "Purge readings is failed.")
         return jdoc
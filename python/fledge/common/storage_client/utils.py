@@ -15,11 +15,16 @@ __version__ = "${VERSION}"
 
 # TODO: add utils method here to keep stuff DRY
 
+import codecs
 import json
+import re
 
 
 class Utils(object):
 
+    _encoder = json.dumps
+    """ Callable used to serialise dict and list payloads, it must return str or bytes """
+
     @staticmethod
     def is_json(payload):
         try:
@@ -27,3 +32,105 @@ class Utils(object):
         except (TypeError, ValueError):  # JSONDecodeError is a subclass of ValueError
             return False
         return True
+
+    @classmethod
+    def set_encoder(cls, encoder=None):
+        """ Plug in a JSON encoder for dict and list payloads, e.g. orjson.dumps; None restores json.dumps """
+        if encoder is not None and not callable(encoder):
+            raise TypeError("encoder must be callable")
+        cls._encoder = json.dumps if encoder is None else encoder
+
+    @classmethod
+    def to_payload(cls, payload):
+        """ Request body for a storage payload
+
+        A dict or list is serialised exactly once with the configured encoder and is not validated again;
+        a str or bytes payload is sent as is, once it has been checked to be a valid JSON.
+
+        :param payload: dict, list, JSON str or JSON bytes
+        :return: serialised payload, or None if payload is not valid JSON
+        """
+        if isinstance(payload, (dict, list)):
+            try:
+                return cls._encoder(payload)
+            except (TypeError, ValueError):
+                return None
+        if isinstance(payload, (str, bytes)) and cls.is_json(payload):
+            return payload
+        return None
+
+
+class RowsStreamDecoder(object):
+    """ Incremental decoder for the "rows" array of a storage service response
+
+    Feed it the raw response body chunk by chunk; each call returns the rows completed by that chunk, so only the
+    undecoded tail of the body is held in memory rather than the whole document.
+    """
+
+    _ROWS_START = re.compile(r'"rows"\s*:\s*\[')
+    _WHITESPACE = ' \t\n\r'
+
+    def __init__(self):
+        self._json_decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._in_rows = False
+        self._done = False
+        self._head = ''
+
+    @property
+    def done(self):
+        """ True once the closing bracket of the rows array has been decoded """
+        return self._done
+
+    def feed(self, data):
+        """ Decode the next chunk of the body
+
+        :param data: bytes of the response body
+        :return: list of the rows completed by this chunk
+        """
+        self._buffer += self._text_decoder.decode(data)
+        if self._done:
+            return []
+        if not self._in_rows:
+            match = self._ROWS_START.search(self._buffer)
+            if match is None:
+                return []
+            self._head = self._buffer[:match.start()]
+            self._buffer = self._buffer[match.end():]
+            self._in_rows = True
+        rows = []
+        pos = 0
+        length = len(self._buffer)
+        while pos < length:
+            char = self._buffer[pos]
+            if char in self._WHITESPACE or char == ',':
+                pos += 1
+                continue
+            if char == ']':
+                self._done = True
+                pos += 1
+                break
+            try:
+                row, end = self._json_decoder.raw_decode(self._buffer, pos)
+            except ValueError:
+                # Row is not complete yet, wait for the next chunk
+                break
+            rows.append(row)
+            pos = end
+        self._buffer = self._buffer[pos:]
+        return rows
+
+    def close(self):
+        """ The whole body has been fed, return the document with an emptied rows array
+
+        :return: dict with the non rows members of the response and "rows": [], or the whole document if it has
+            no rows array, e.g. an error response
+        :raises ValueError: if the body is not valid JSON or the rows array is incomplete
+        """
+        self._buffer += self._text_decoder.decode(b'', final=True)
+        if not self._in_rows:
+            return json.loads(self._buffer)
+        if not self._done:
+            raise ValueError("Incomplete rows array in storage response")
+        return json.loads(self._head + '"rows": []' + self._buffer)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+"""Shared, keep-alive aiohttp client sessions"""
+
+import asyncio
+import time
+
+import aiohttp
+
+from fledge.common import logger
+
+__author__ = "agent"
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+_LOGGER = logger.setup(__name__)
+
+DEFAULT_LIMIT = 100
+"""Maximum number of simultaneous connections in the pool"""
+
+DEFAULT_LIMIT_PER_HOST = 0
+"""Maximum number of simultaneous connections to the same endpoint, 0 means no limit"""
+
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+"""Seconds an idle connection is kept open for reuse"""
+
+
+class SessionPool(object):
+    """ One aiohttp.ClientSession per event loop, backed by a bounded keep-alive connector
+
+    A session is bound to the event loop it was created on; the pool therefore hands out a session per loop and
+    recreates it if it was closed. Sessions of loops that have been closed are discarded on the next lookup.
+    Sessions created before a :meth:`configure` call that changed the limits are replaced on their next lookup; the
+    replaced sessions keep serving their requests in flight and are closed by :meth:`close`.
+    """
+
+    def __init__(self, limit=DEFAULT_LIMIT, limit_per_host=DEFAULT_LIMIT_PER_HOST,
+                 keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT):
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._sessions = {}
+        """event loop: (session, settings the session was created with)"""
+        self._retired = {}
+        """event loop: sessions replaced after a configure call, to close with the loop session"""
+        self._connections_created = 0
+        self._connections_reused = 0
+        self._wait_count = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def configure(self, limit=None, limit_per_host=None, keepalive_timeout=None):
+        """ Change the connector limits; the sessions of the pool are replaced on their next lookup
+
+        Args:
+            limit: maximum number of simultaneous connections
+            limit_per_host: maximum number of simultaneous connections per endpoint, 0 for no limit
+            keepalive_timeout: seconds an idle connection is kept alive
+        """
+        if limit is not None:
+            if int(limit) < 0:
+                raise ValueError("limit must be a non negative integer")
+            self._limit = int(limit)
+        if limit_per_host is not None:
+            if int(limit_per_host) < 0:
+                raise ValueError("limit_per_host must be a non negative integer")
+            self._limit_per_host = int(limit_per_host)
+        if keepalive_timeout is not None:
+            if float(keepalive_timeout) <= 0:
+                raise ValueError("keepalive_timeout must be greater than 0")
+            self._keepalive_timeout = float(keepalive_timeout)
+
+    def _settings(self):
+        return self._limit, self._limit_per_host, self._keepalive_timeout
+
+    def get_session(self):
+        """ Return the shared session of the running event loop, creating it if needed """
+        loop = asyncio.get_event_loop()
+        self._discard_closed_loops()
+        session, settings = self._sessions.get(loop, (None, None))
+        if session is None or session.closed or settings != self._settings():
+            if session is not None and not session.closed:
+                self._retired.setdefault(loop, []).append(session)
+            session = self._create_session()
+            self._sessions[loop] = (session, self._settings())
+        return session
+
+    async def close(self):
+        """ Close the shared session of the running event loop and its idle connections """
+        loop = asyncio.get_event_loop()
+        session, _ = self._sessions.pop(loop, (None, None))
+        for retired in self._retired.pop(loop, []):
+            if not retired.closed:
+                await retired.close()
+        if session is not None and not session.closed:
+            await session.close()
+            _LOGGER.debug("Closed shared client session, pool metrics: %s", self.metrics())
+
+    def metrics(self):
+        """ Pool usage of the running event loop session and wait time counters across all sessions
+
+        Returns:
+            dict with in_use and idle connection counts, connections created and reused, and the number of
+            requests that queued for a free connection with their total, average and maximum wait time in seconds
+        """
+        in_use = idle = 0
+        try:
+            session, _ = self._sessions.get(asyncio.get_event_loop(), (None, None))
+        except RuntimeError:
+            session = None
+        if session is not None and not session.closed:
+            connector = session.connector
+            # aiohttp does not offer a public API for the connection counts
+            in_use = len(getattr(connector, '_acquired', ()))
+            idle = sum(len(conns) for conns in getattr(connector, '_conns', {}).values())
+        return {
+            "limit": self._limit,
+            "limitPerHost": self._limit_per_host,
+            "keepaliveTimeout": self._keepalive_timeout,
+            "inUse": in_use,
+            "idle": idle,
+            "created": self._connections_created,
+            "reused": self._connections_reused,
+            "waitCount": self._wait_count,
+            "waitTimeTotal": round(self._wait_time_total, 6),
+            "waitTimeAverage": round(self._wait_time_total / self._wait_count, 6) if self._wait_count else 0.0,
+            "waitTimeMax": round(self._wait_time_max, 6)
+        }
+
+    def _discard_closed_loops(self):
+        for loop in [_loop for _loop in self._sessions if _loop.is_closed()]:
+            session, _ = self._sessions.pop(loop)
+            # Connections of a closed loop can not be closed gracefully anymore, release the connector reference
+            for _session in [session] + self._retired.pop(loop, []):
+                _session.detach()
+
+    def _create_session(self):
+        connector = aiohttp.TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host,
+                                         keepalive_timeout=self._keepalive_timeout)
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_connection_create_end.append(self._on_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_reuseconn)
+        return aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+
+    async def _on_queued_start(self, session, trace_config_ctx, params):
+        trace_config_ctx.queued_at = time.perf_counter()
+
+    async def _on_queued_end(self, session, trace_config_ctx, params):
+        waited = time.perf_counter() - trace_config_ctx.queued_at
+        self._wait_count += 1
+        self._wait_time_total += waited
+        if waited > self._wait_time_max:
+            self._wait_time_max = waited
+
+    async def _on_create_end(self, session, trace_config_ctx, params):
+        self._connections_created += 1
+
+    async def _on_reuseconn(self, session, trace_config_ctx, params):
+        self._connections_reused += 1
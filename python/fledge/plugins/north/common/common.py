@@ -111,6 +111,179 @@ def evaluate_type(value):
     return evaluated_type
 
 
+_MAX_EXACT_INT = 2 ** 53
+""" Integers up to this magnitude survive the float round trip of evaluate_type unchanged """
+
+_INF = float("inf")
+
+
+def _convert_float(value):
+    """convert_to_type of a finite float is the value itself, anything else takes the generic path"""
+    if type(value) is float and -_INF < value < _INF:
+        return value
+    return _convert_datapoint(value)
+
+
+def _convert_int(value):
+    """convert_to_type of an int in the exact float range is the value itself"""
+    if type(value) is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+        return value
+    return _convert_datapoint(value)
+
+
+def _convert_str(value):
+    """convert_to_type of a string, parsing it once"""
+    if type(value) is not str:
+        return _convert_datapoint(value)
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    if number.is_integer():
+        int_value = int(number)
+        return int_value if str(int_value) == value else number
+    if -_INF < number < _INF:
+        return number
+    # nan stays a string, inf fails as in convert_to_type
+    return convert_to_type(value)
+
+
+def _convert_datapoint(value):
+    """Converts a top level datapoint, a dict is not converted itself but the dicts it holds are"""
+    if isinstance(value, dict):
+        for inner_value in value.values():
+            if isinstance(inner_value, dict):
+                convert_reading(inner_value)
+        return value
+    return convert_value(value)
+
+
+def convert_value(value):
+    """Same result as convert_to_type, without the float/int/str round trips for native numbers
+
+     Args:
+        value : value to evaluate and convert
+     Returns:
+         value_converted: converted value
+     Raises:
+     """
+    value_type = type(value)
+    if value_type is float:
+        if -_INF < value < _INF:
+            return value
+    elif value_type is int:
+        if -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+            return value
+    elif value_type is str:
+        return _convert_str(value)
+    return convert_to_type(value)
+
+
+def convert_reading(reading):
+    """Converts in place the datapoints of a reading payload, for example "180.2" to float 180.2
+
+    Top level values are converted, a dict value is not converted itself but the dicts it holds are
+    converted in turn.
+
+     Args:
+        reading : reading payload
+     Returns:
+         reading: the converted payload
+     Raises:
+     """
+    for key, value in reading.items():
+        reading[key] = _convert_datapoint(value)
+    return reading
+
+
+class TypeCoercer(object):
+    """Converts the reading payloads of a whole block at once
+
+    The converter of each datapoint is chosen from its value the first time an asset is seen and cached with the
+    asset datapoint names, repeat readings of the same asset skip the type detection. A converter only takes its
+    fast path when the value still has the cached type, so the result is always the same as convert_reading.
+    """
+
+    def __init__(self, max_assets=1000):
+        """
+        Args:
+            max_assets: maximum number of asset schemas to cache, the oldest one is dropped beyond it
+        """
+        self._max_assets = max_assets
+        self._schemas = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _converter_for(value):
+        value_type = type(value)
+        if value_type is float:
+            return _convert_float
+        if value_type is int:
+            return _convert_int
+        if value_type is str:
+            return _convert_str
+        return _convert_datapoint
+
+    def _new_schema(self, asset_code, reading):
+        schema = (tuple(reading), tuple(self._converter_for(value) for value in reading.values()))
+        if asset_code not in self._schemas and len(self._schemas) >= self._max_assets:
+            del self._schemas[next(iter(self._schemas))]
+        self._schemas[asset_code] = schema
+        self.misses += 1
+        return schema
+
+    def convert(self, asset_code, reading):
+        """Converts in place a reading payload of asset_code
+
+         Args:
+            asset_code : asset of the reading
+            reading : reading payload
+         Returns:
+             reading: the converted payload
+         Raises:
+         """
+        schema = self._schemas.get(asset_code)
+        if schema is None or schema[0] != tuple(reading):
+            schema = self._new_schema(asset_code, reading)
+        else:
+            self.hits += 1
+        for (key, value), converter in zip(reading.items(), schema[1]):
+            reading[key] = converter(value)
+        return reading
+
+    def convert_block(self, rows):
+        """Converts in place the reading payload of every row of a block
+
+         Args:
+            rows : block of rows having asset_code and reading
+         Returns:
+             errors: dict of row index to the exception raised converting that row, its reading may be partially
+                converted
+         Raises:
+         """
+        errors = {}
+        schemas = self._schemas
+        misses = self.misses
+        for index, row in enumerate(rows):
+            try:
+                reading = row['reading']
+                asset_code = row['asset_code']
+                schema = schemas.get(asset_code)
+                if schema is None or schema[0] != tuple(reading):
+                    schema = self._new_schema(asset_code, reading)
+                for (key, value), converter in zip(reading.items(), schema[1]):
+                    reading[key] = converter(value)
+            except Exception as ex:
+                errors[index] = ex
+        self.hits += len(rows) - (self.misses - misses)
+        return errors
+
+    def clear(self):
+        """Drops the cached asset schemas"""
+        self._schemas.clear()
+
+
 def identify_unique_asset_codes(raw_data):
     """Identify unique asset codes in the data block
 
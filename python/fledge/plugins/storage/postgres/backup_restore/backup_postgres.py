@@ -398,10 +398,10 @@ class BackupProcess(FledgeProcess):
         loop = asyncio.get_event_loop()
         if status != lib.BackupStatus.COMPLETED:
             self._logger.error(self._MESSAGES_LIST["e000007"])
-            loop.run_until_complete(audit.information('BKEXC', {'status': 'failed'}))
+            loop.run_until_complete(audit.information('BKEXC', {'status': 'failed'}, wait=True))
             raise exceptions.BackupFailed
         else:
-            loop.run_until_complete(audit.information('BKEXC', {'status': 'completed'}))
+            loop.run_until_complete(audit.information('BKEXC', {'status': 'completed'}, wait=True))
 
     def _purge_old_backups(self):
         """  Deletes old backups in relation at the retention parameter
@@ -125,7 +125,7 @@ async def deprecate_asset_track_entry(request: web.Request) -> web.Response:
                         try:
                             audit = AuditLogger(storage_client)
                             audit_details = {'asset': asset_name, 'service': svc_name, 'event': audit_event_name}
-                            await audit.information('ASTDP', audit_details)
+                            await audit.information('ASTDP', audit_details, wait=True)
                         except:
                             _logger.warning("Failed to log the audit entry for {} deprecation.".format(asset_name))
                             pass
@@ -106,7 +106,7 @@ async def create_audit_entry(request):
 
     try:
         audit = AuditLogger()
-        await getattr(audit, str(severity).lower())(source, details)
+        await getattr(audit, str(severity).lower())(source, details, wait=True)
 
         # Set timestamp for return message
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
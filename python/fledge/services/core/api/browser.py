@@ -10,7 +10,7 @@ Experimental browser for extracting reading data from the Fledge data buffer
 Supports a number of REST API:
 
   http://<address>/fledge/asset
-     - Return a summary count of all asset readings
+     - Return a summary count of all asset readings, maintained from the statistics unless exact=true
   http://<address>/fledge/asset/{asset_code}
     - Return a set of asset readings for the given asset
   http://<address>/fledge/asset/{asset_code}/latest
@@ -29,6 +29,9 @@ Supports a number of REST API:
   All but the /fledge/asset API call take a set of optional query parameters
     limit=x     Return the first x rows only
     skip=x      skip first n entries and used with limit to implemented paged interfaces
+    points=x    Downsample the rows to at most x points per datapoint, only for /fledge/asset/{asset_code}
+                and /fledge/asset/{asset_code}/{reading}
+    method=x    Downsampling method, lttb (default) or minmax
     seconds=x   Limit the data return to be less than x seconds old
     minutes=x   Limit the data returned to be less than x minutes old
     hours=x     Limit the data returned to be less than x hours old
@@ -37,15 +40,20 @@ Supports a number of REST API:
   will have an effect.
   Note: if datetime units are supplied then limit will not respect i.e mutually exclusive
 """
+import asyncio
+import copy
 import time
 import datetime
 import json
+from collections import OrderedDict
 
 from aiohttp import web
 
 from fledge.common.logger import FLCoreLogger
+from fledge.common.storage_client.exceptions import StorageServerError
 from fledge.common.storage_client.payload_builder import PayloadBuilder
 from fledge.services.core import connect
+from fledge.services.core.api.downsampling import Downsampler
 
 _logger = FLCoreLogger().get_logger(__name__)
 
@@ -61,6 +69,279 @@ __DEFAULT_OFFSET = 0
 DATAPOINT_TYPES = ['__DPIMAGE', '__DATABUFFER']
 IMAGE_PLACEHOLDER = "Data removed for brevity"
 
+SUMMARY_MAX_CONCURRENT_QUERIES = 8
+"""Maximum number of datapoint summary queries of a request run at the same time"""
+
+READING_KEYS_CACHE_SECONDS = 60
+"""How long the datapoint names of an asset are kept for the asset summary"""
+
+_reading_keys = {}
+"""asset code: (expiry, datapoint names) of the latest reading of the asset"""
+
+MULTI_AGGREGATE_RETRY_SECONDS = 600
+"""How long the summaries use one query per datapoint after the storage service rejected a single query"""
+
+_multi_aggregate_unsupported_until = 0
+"""time.monotonic() until which the summaries use one query per datapoint"""
+
+ASSET_COUNTS_RECONCILE_SECONDS = 300
+"""How long the maintained asset counts are used before they are reconciled with the readings"""
+
+
+class _AssetCounts(object):
+    """ Readings count of each asset, maintained without scanning the readings
+
+    The counts are seeded by the count GROUP BY asset_code query and then moved forward with the statistics: the key
+    of the statistic of an asset is its upper case asset code and its value the number of readings ingested for it.
+    The purge task only reports a total, so an increase of the PURGED statistic triggers a reconciliation with the
+    readings, as do a new statistic, most likely a new asset, and the expiry of ASSET_COUNTS_RECONCILE_SECONDS.
+    """
+
+    counts = None
+    """asset code: readings count, None until seeded"""
+
+    assets = {}
+    """statistics key: asset code, for the statistics of the seeded assets"""
+
+    statistics = {}
+    """statistics key: value the counts have been moved forward to"""
+
+    expiry = 0
+
+    @classmethod
+    def clear(cls):
+        cls.counts = None
+        cls.assets = {}
+        cls.statistics = {}
+        cls.expiry = 0
+
+    @classmethod
+    def seed(cls, rows, statistics):
+        cls.counts = {r['asset_code']: r['count'] for r in rows}
+        keys = {}
+        for asset_code in cls.counts:
+            keys.setdefault(asset_code.upper(), []).append(asset_code)
+        # Asset codes differing by case only share their statistic, it can not be split between them
+        cls.assets = {key: codes[0] for key, codes in keys.items() if len(codes) == 1}
+        cls.statistics = statistics
+        cls.expiry = time.monotonic() + ASSET_COUNTS_RECONCILE_SECONDS
+
+    @classmethod
+    def update(cls, statistics):
+        """ Moves the counts forward to the given statistics
+
+        Returns:
+            False when the counts have to be reconciled with the readings instead
+        """
+        if cls.counts is None or time.monotonic() >= cls.expiry:
+            return False
+        increments = {}
+        for key, value in statistics.items():
+            previous = cls.statistics.get(key)
+            if previous is None or value < previous:
+                return False
+            if value > previous:
+                if key == 'PURGED':
+                    return False
+                if key in cls.assets:
+                    increments[cls.assets[key]] = value - previous
+        for asset_code, increment in increments.items():
+            cls.counts[asset_code] += increment
+        cls.statistics = statistics
+        return True
+
+    @classmethod
+    def purged(cls, asset_code=None):
+        """ Records a purge of all the readings of an asset, or of all the assets when no asset code is given """
+        if cls.counts is None:
+            return
+        if asset_code is None:
+            cls.counts = dict.fromkeys(cls.counts, 0)
+        elif asset_code in cls.counts:
+            cls.counts[asset_code] = 0
+
+    @classmethod
+    def response(cls):
+        return [{"count": count, "assetCode": asset_code} for asset_code, count in cls.counts.items() if count]
+
+
+async def _get_statistics():
+    """ statistics key: value of all the statistics """
+    payload = PayloadBuilder().SELECT("key", "value").payload()
+    results = await connect.get_storage_async().query_tbl_with_payload('statistics', payload)
+    if 'rows' not in results:
+        raise ValueError(results.get('message', "Failed to get the statistics"))
+    return {r['key']: r['value'] for r in results['rows']}
+
+
+async def _get_purged():
+    """ Value of the PURGED statistic, None if there is none """
+    payload = PayloadBuilder().SELECT("value").WHERE(["key", "=", "PURGED"]).payload()
+    results = await connect.get_storage_async().query_tbl_with_payload('statistics', payload)
+    if 'rows' not in results:
+        raise ValueError(results.get('message', "Failed to get the statistics"))
+    return results['rows'][0]['value'] if results['rows'] else None
+
+
+SERIES_CACHE_SETTLE_SECONDS = 60
+"""Age after which the readings of a time bucket are assumed to have all been received"""
+
+SERIES_CACHE_TTL_SECONDS = 600
+"""How long the buckets of a series are reused before the whole series is queried again"""
+
+SERIES_CACHE_MAX_BUCKETS = 100000
+"""Maximum number of time buckets cached for all the series"""
+
+SERIES_CACHE_PURGED_CHECK_SECONDS = 5
+"""How long the PURGED statistic read by the bucketed series queries is reused"""
+
+
+class _SeriesCache(object):
+    """ Closed time buckets of the bucketed series queries
+
+    A series is identified by the asset code, datapoint and bucket size of a query. Its entry holds the rows of
+    each bucket by bucket time, in ascending order, and the range [first, last] of bucket times it covers: a bucket
+    of the range without rows has no readings. The storage labels a bucket with the start or the middle of the time
+    it spans, depending on the query, so the readings of the bucket of time t are always within [t - size, t + size).
+    The purge task only reports a total, so all the entries are dropped once the PURGED statistic has moved, which
+    is read at most every SERIES_CACHE_PURGED_CHECK_SECONDS.
+    """
+
+    entries = OrderedDict()
+    """series key: entry, least recently used first"""
+
+    buckets = 0
+    """Number of buckets of all the entries"""
+
+    purged = None
+    """Value of the PURGED statistic the entries were cached with"""
+
+    purged_expiry = 0
+    """time.monotonic() after which the PURGED statistic is read again"""
+
+    @classmethod
+    def clear(cls, asset_code=None):
+        """ Drops the series of an asset, or all the series when no asset code is given """
+        for key in list(cls.entries):
+            if asset_code is None or asset_code == key[0]:
+                cls.buckets -= len(cls.entries.pop(key)['rows'])
+
+    @classmethod
+    def check_purged(cls, purged):
+        """ Drops all the series when readings have been purged since they were cached """
+        if purged != cls.purged:
+            cls.clear()
+            cls.purged = purged
+        cls.purged_expiry = time.monotonic() + SERIES_CACHE_PURGED_CHECK_SECONDS
+
+    @classmethod
+    def get(cls, key):
+        entry = cls.entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry['expiry']:
+            cls.buckets -= len(cls.entries.pop(key)['rows'])
+            return None
+        cls.entries.move_to_end(key)
+        return entry
+
+    @classmethod
+    def store(cls, key, rows, first, last):
+        """ Caches the rows of the buckets of times within [first, last], given newest first """
+        try:
+            buckets = OrderedDict()
+            for row in reversed(rows):
+                bucket_time = _bucket_time(row)
+                if first <= bucket_time <= last:
+                    buckets.setdefault(bucket_time, []).append(row)
+        except (KeyError, TypeError, ValueError):
+            # Bucket times are only known for the formatted timestamps of whole second buckets
+            return
+        if first > last:
+            return
+        cls.clear_key(key)
+        cls.entries[key] = {'first': first, 'last': last, 'rows': buckets,
+                            'expiry': time.monotonic() + SERIES_CACHE_TTL_SECONDS}
+        cls.buckets += len(buckets)
+        cls._evict()
+
+    @classmethod
+    def extend(cls, key, rows, last):
+        """ Adds the rows of the buckets after the entry up to last, given newest first """
+        entry = cls.entries.get(key)
+        if entry is None:
+            return
+        buckets = entry['rows']
+        count = len(buckets)
+        for row in reversed(rows):
+            bucket_time = _bucket_time(row)
+            if entry['last'] < bucket_time <= last:
+                buckets.setdefault(bucket_time, []).append(row)
+        entry['last'] = max(entry['last'], last)
+        cls.buckets += len(buckets) - count
+        cls._evict()
+
+    @classmethod
+    def clear_key(cls, key):
+        entry = cls.entries.pop(key, None)
+        if entry is not None:
+            cls.buckets -= len(entry['rows'])
+
+    @classmethod
+    def _evict(cls):
+        while cls.buckets > SERIES_CACHE_MAX_BUCKETS and cls.entries:
+            cls.buckets -= len(cls.entries.popitem(last=False)[1]['rows'])
+
+
+def _bucket_time(row):
+    """ Epoch seconds of the 'YYYY-MM-DD HH24:MI:SS' timestamp of a bucket row, which the storage formats in UTC
+    for the aggregates of a datapoint
+    """
+    return int(datetime.datetime.strptime(row['timestamp'], "%Y-%m-%d %H:%M:%S").replace(
+        tzinfo=datetime.timezone.utc).timestamp())
+
+
+async def _bucket_series(key, size, start, stop, limit, query):
+    """ Rows of a bucketed series between two epoch seconds, newest first, reusing the cached closed buckets
+
+    Only the buckets at both ends of the window are queried when the series is cached, the whole window otherwise.
+
+    Args:
+        key: series key, (asset code, datapoint, size)
+        size: bucket size in whole seconds
+        start: epoch seconds of the start of the window
+        stop: epoch seconds of the end of the window
+        limit: maximum number of rows
+        query: coroutine function (start, stop, limit) returning the storage rows of the buckets of a window
+    Returns:
+        the same rows the query of the whole window would have
+    """
+    settled = min(stop, int(time.time()) - SERIES_CACHE_SETTLE_SECONDS)
+    if time.monotonic() >= _SeriesCache.purged_expiry:
+        _SeriesCache.check_purged(await _get_purged())
+    entry = _SeriesCache.get(key)
+    if entry is not None:
+        # Buckets of the window which have all their readings within it
+        first = max(entry['first'], start + size)
+        last = min(entry['last'], stop - size)
+    if entry is None or first > last:
+        rows = await query(start, stop, limit)
+        _SeriesCache.store(key, rows, start + size, settled - size)
+        return rows
+
+    head, tail = await asyncio.gather(query(start, first + size, None), query(last - size, stop, None))
+    rows = [row for row in tail if _bucket_time(row) > last]
+    for bucket_time, bucket_rows in reversed(entry['rows'].items()):
+        if bucket_time < first:
+            break
+        if bucket_time <= last:
+            rows.extend(bucket_rows)
+    rows.extend(row for row in head if _bucket_time(row) < first)
+    # The entry may have been dropped or replaced by another request while the ends were queried
+    if _SeriesCache.entries.get(key) is entry and last == entry['last'] and settled - size > last:
+        _SeriesCache.extend(key, tail, settled - size)
+    return rows[:limit]
+
 
 def setup(app):
     """ Add the routes for the API endpoints supported by the data browser """
@@ -116,6 +397,62 @@ def prepare_limit_skip_payload(request, _dict):
     return payload.chain_payload()
 
 
+def downsampler(request: web.Request):
+    """ Downsampler of the points and method query params
+
+    Args:
+        request: points and method request query params
+    Returns:
+        Downsampler or None when no points are requested
+    """
+    if request.query.get('points', '') == '':
+        return None
+    try:
+        points = int(request.query['points'])
+    except ValueError:
+        points = None
+    try:
+        return Downsampler(points, request.query.get('method', 'lttb'))
+    except ValueError as err:
+        msg = str(err)
+        raise web.HTTPBadRequest(reason=msg, body=json.dumps({"message": msg}))
+
+
+async def _downsampled_query(_readings, payload, sampler, series, prune):
+    """ Same as the readings query, with the rows downsampled while they are received
+
+    Only the rows selected for at least one datapoint are kept, so memory is bound by the number of points rather
+    than by the number of rows.
+
+    Args:
+        _readings: readings storage client
+        payload: readings query payload
+        sampler: Downsampler
+        series: function of a row returning its (series key, value) pairs
+        prune: function of a row and of its selected series keys returning the row to respond with
+    Returns:
+        query result with the selected rows, or the storage response when it has no rows
+    """
+    index = 0
+    try:
+        async for rows in _readings.query_iter(payload):
+            for row in rows:
+                for key, value in series(row):
+                    if Downsampler.is_value(value):
+                        sampler.add(key, index, value, row)
+                index += 1
+    except StorageServerError as err:
+        if err.code not in range(200, 209):
+            raise
+        return err.error
+    selected = {}
+    for key, points in sampler.result().items():
+        for point_index, value, row in points:
+            selected.setdefault(point_index, (row, []))[1].append(key)
+    rows = [prune(*selected[point_index]) for point_index in sorted(selected)]
+    return {'rows': rows, 'count': len(rows)}
+
+
 def is_image_excluded(request: web.Request) -> bool:
     """ image type datapoints exclusion
     Args:
@@ -136,28 +473,37 @@ async def asset_counts(request):
     """ Browse all the assets for which we have recorded readings and
     return a readings count.
 
+    The counts are maintained from the statistics and reconciled with the readings every
+    ASSET_COUNTS_RECONCILE_SECONDS, or after a purge. Use exact=true to count the readings instead.
+
     Returns:
            json result on basis of SELECT asset_code, count(*) FROM readings GROUP BY asset_code;
 
     :Example:
             curl -sX GET http://localhost:8081/fledge/asset
+            curl -sX GET http://localhost:8081/fledge/asset?exact=true
     """
-    payload = PayloadBuilder().AGGREGATE(["count", "*"]).ALIAS("aggregate", ("*", "count", "count")) \
-        .GROUP_BY("asset_code").payload()
-    _readings = connect.get_readings_async()
-    results = await _readings.query(payload)
+    exact = request.query.get('exact', 'false').lower() == 'true'
     try:
-        response = results['rows']
-        asset_json = [{"count": r['count'], "assetCode": r['asset_code']} for r in response]
-    except KeyError:
-        msg = results['message']
-        raise web.HTTPBadRequest(reason=msg, body=json.dumps({"message": msg}))
+        if not exact and _AssetCounts.update(await _get_statistics()):
+            return web.json_response(_AssetCounts.response())
+        payload = PayloadBuilder().AGGREGATE(["count", "*"]).ALIAS("aggregate", ("*", "count", "count")) \
+            .GROUP_BY("asset_code").payload()
+        _readings = connect.get_readings_async()
+        results = await _readings.query(payload)
+        if 'rows' in results:
+            asset_json = [{"count": r['count'], "assetCode": r['asset_code']} for r in results['rows']]
+            if not exact:
+                # The statistics are taken after the count, the readings ingested in between are not counted twice
+                _AssetCounts.seed(results['rows'], await _get_statistics())
     except Exception as exc:
         msg = str(exc)
         _logger.error(exc, "Failed to get all assets.")
         raise web.HTTPInternalServerError(reason=msg, body=json.dumps({"message": msg}))
-    else:
-        return web.json_response(asset_json)
+    if 'rows' not in results:
+        msg = results['message']
+        raise web.HTTPBadRequest(reason=msg, body=json.dumps({"message": msg}))
+    return web.json_response(asset_json)
 
 
 async def asset(request):
@@ -181,6 +527,8 @@ async def asset(request):
             curl -sX GET "http://localhost:8081/fledge/asset/fogbench_humidity?additional=sinusoid,random&seconds=600"
             curl -sX GET "http://localhost:8081/fledge/asset/sinusoid?mostrecent=true&seconds=600"
             curl -sX GET "http://localhost:8081/fledge/asset/sinusoid?mostrecent=true&seconds=60&additional=randomwalk"
+            curl -sX GET "http://localhost:8081/fledge/asset/sinusoid?hours=24&points=500"
+            curl -sX GET "http://localhost:8081/fledge/asset/sinusoid?hours=24&points=500&method=minmax"
     """
     asset_code = request.match_info.get('asset_code', '')
     # A comma separated list of additional assets to generate the readings to display multiple graphs in GUI
@@ -246,9 +594,16 @@ async def asset(request):
             msg = "order must be asc or desc"
             raise web.HTTPBadRequest(reason=msg, body=json.dumps({"message": msg}))
     payload = PayloadBuilder(_and_where).ORDER_BY(["user_ts", _order]).payload()
+    sampler = downsampler(request)
     try:
         _readings = connect.get_readings_async()
-        results = await _readings.query(payload)
+        if sampler is None:
+            results = await _readings.query(payload)
+        else:
+            results = await _downsampled_query(
+                _readings, payload, sampler,
+                lambda row: (((row.get('asset_code'), name), value) for name, value in row['reading'].items()),
+                lambda row, keys: dict(row, reading={name: row['reading'][name] for _, name in keys}))
         rows = results['rows']
         for index, data in enumerate(rows):
             for item_name, item_val in data.items():
@@ -335,6 +690,7 @@ async def asset_reading(request):
             curl -sX GET http://localhost:8081/fledge/asset/fogbench_humidity/temperature?skip=10
             curl -sX GET "http://localhost:8081/fledge/asset/fogbench_humidity/temperature?limit=1&skip=10"
             curl -sX GET http://localhost:8081/fledge/asset/fogbench_humidity/temperature?minutes=60
+            curl -sX GET "http://localhost:8081/fledge/asset/fogbench_humidity/temperature?hours=24&points=500"
     """
     asset_code = request.match_info.get('asset_code', '')
     reading = request.match_info.get('reading', '')
@@ -354,9 +710,14 @@ async def asset_reading(request):
         # Add the order by and limit, offset clause
         _and_where = prepare_limit_skip_payload(request, _where)
     payload = PayloadBuilder(_and_where).ORDER_BY(["user_ts", "desc"]).payload()
+    sampler = downsampler(request)
     try:
         _readings = connect.get_readings_async()
-        results = await _readings.query(payload)
+        if sampler is None:
+            results = await _readings.query(payload)
+        else:
+            results = await _downsampled_query(_readings, payload, sampler, lambda row: ((reading, row.get(reading)),),
+                                               lambda row, keys: row)
         rows = results['rows']
         for index, data in enumerate(rows):
             for item_name, item_val in data.items():
@@ -394,19 +755,8 @@ async def asset_all_readings_summary(request):
     try:
         # Get readings from asset_code
         asset_code = request.match_info.get('asset_code', '')
-        # TODO: Use only the latest asset read to determine the data points to use. This
-        # avoids reading every single reading into memory and creating a very big result set See FOGL-2635
-        payload = PayloadBuilder().SELECT("reading").WHERE(
-            ["asset_code", "=", asset_code]).LIMIT(1).ORDER_BY(["user_ts", "desc"]).payload()
         _readings = connect.get_readings_async()
-        results = await _readings.query(payload)
-        if not results['rows']:
-            raise KeyError("{} asset_code not found".format(asset_code))
-
-        # TODO: FOGL-1768 when support available from storage layer then avoid multiple calls
-        # Find keys in readings
-        reading_keys = list(results['rows'][-1]['reading'].keys())
-        rows = []
+        reading_keys = await _get_reading_keys(_readings, asset_code)
         _where = PayloadBuilder().WHERE(["asset_code", "=", asset_code]).chain_payload()
         if 'previous' in request.query and (
                 'seconds' in request.query or 'minutes' in request.query or 'hours' in request.query):
@@ -420,16 +770,7 @@ async def asset_all_readings_summary(request):
             # Add limit, offset clause
             _and_where = prepare_limit_skip_payload(request, _where)
 
-        for reading in reading_keys:
-            _aggregate = PayloadBuilder(_and_where).AGGREGATE(["min", ["reading", reading]],
-                                                              ["max", ["reading", reading]],
-                                                              ["avg", ["reading", reading]]) \
-                .ALIAS('aggregate', ('reading', 'min', 'min'),
-                       ('reading', 'max', 'max'),
-                       ('reading', 'avg', 'average')).chain_payload()
-            payload = PayloadBuilder(_aggregate).payload()
-            results = await _readings.query(payload)
-            rows.append({reading: results['rows'][0]})
+        rows = await _readings_summary(_readings, reading_keys, _and_where)
         for index, data in enumerate(rows):
             for item_name, item_val in data.items():
                 if isinstance(item_val, dict):
@@ -451,6 +792,76 @@ async def asset_all_readings_summary(request):
         return web.json_response(response)
 
 
+async def _get_reading_keys(_readings, asset_code):
+    """ Datapoint names of the latest reading of an asset, cached for READING_KEYS_CACHE_SECONDS """
+    try:
+        expiry, reading_keys = _reading_keys[asset_code]
+        if expiry > time.monotonic():
+            return reading_keys
+    except KeyError:
+        pass
+    # TODO: Use only the latest asset read to determine the data points to use. This
+    # avoids reading every single reading into memory and creating a very big result set See FOGL-2635
+    payload = PayloadBuilder().SELECT("reading").WHERE(
+        ["asset_code", "=", asset_code]).LIMIT(1).ORDER_BY(["user_ts", "desc"]).payload()
+    results = await _readings.query(payload)
+    if not results['rows']:
+        raise KeyError("{} asset_code not found".format(asset_code))
+    # Find keys in readings
+    reading_keys = list(results['rows'][-1]['reading'].keys())
+    _reading_keys[asset_code] = (time.monotonic() + READING_KEYS_CACHE_SECONDS, reading_keys)
+    return reading_keys
+
+
+async def _readings_summary(_readings, reading_keys, _and_where):
+    """ min, max and average of each datapoint, with a single query when the storage service supports it and
+    otherwise with one query per datapoint, at most SUMMARY_MAX_CONCURRENT_QUERIES at a time
+    """
+    global _multi_aggregate_unsupported_until
+    if len(reading_keys) > 1 and _multi_aggregate_unsupported_until <= time.monotonic():
+        # Aliases made of the datapoint index, datapoint names can be anything
+        payload = json.loads(PayloadBuilder(_and_where).payload())
+        payload["aggregate"] = [{"operation": operation, "json": {"column": "reading", "properties": reading},
+                                 "alias": "{}_{}".format(alias, index)}
+                                for index, reading in enumerate(reading_keys)
+                                for operation, alias in (("min", "min"), ("max", "max"), ("avg", "average"))]
+        try:
+            results = await _readings.query(json.dumps(payload))
+        except StorageServerError as ex:
+            # A client error is the storage service rejecting the query, anything else may well be transient and
+            # only this summary falls back to one query per datapoint
+            if 400 <= ex.code < 500:
+                _multi_aggregate_unsupported_until = time.monotonic() + MULTI_AGGREGATE_RETRY_SECONDS
+                _logger.warning("Storage service failed to aggregate several datapoints in one query, summaries "
+                                "will use one query per datapoint for {} seconds. {}".format(
+                                    MULTI_AGGREGATE_RETRY_SECONDS, ex))
+            else:
+                _logger.warning("Storage service failed to aggregate several datapoints in one query, falling back "
+                                "to one query per datapoint. {}".format(ex))
+        else:
+            row = results['rows'][0]
+            return [{reading: {'min': row.get('min_{}'.format(index)), 'max': row.get('max_{}'.format(index)),
+                               'average': row.get('average_{}'.format(index))}}
+                    for index, reading in enumerate(reading_keys)]
+
+    semaphore = asyncio.Semaphore(SUMMARY_MAX_CONCURRENT_QUERIES)
+
+    async def _reading_summary(reading):
+        # AGGREGATE adds to the payload it is given, each datapoint needs its own copy of the where clause
+        _aggregate = PayloadBuilder(copy.deepcopy(_and_where)).AGGREGATE(["min", ["reading", reading]],
+                                                          ["max", ["reading", reading]],
+                                                          ["avg", ["reading", reading]]) \
+            .ALIAS('aggregate', ('reading', 'min', 'min'),
+                   ('reading', 'max', 'max'),
+                   ('reading', 'avg', 'average')).chain_payload()
+        payload = PayloadBuilder(_aggregate).payload()
+        async with semaphore:
+            results = await _readings.query(payload)
+        return {reading: results['rows'][0]}
+
+    return list(await asyncio.gather(*[_reading_summary(reading) for reading in reading_keys]))
+
+
 async def asset_summary(request):
     """ Browse all the assets for which we have recorded readings and
     return a summary for a particular sensor. The values that are
@@ -763,6 +1174,8 @@ async def asset_datapoints_with_bucket_size(request: web.Request) -> web.Respons
 
         # Sort & timebucket modifiers can not be used in same payload
         # payload = PayloadBuilder(limit).ORDER_BY(["user_ts", "desc"]).payload()
+        # Not cached, unlike the series of a datapoint: the storage may label the buckets of all the datapoints
+        # in local time, e.g. sqlite, and their bucket times are not known here
         results = await _readings.query(payload)
         response = results['rows']
     except (KeyError, IndexError) as e:
@@ -825,25 +1238,34 @@ async def asset_readings_with_bucket_size(request: web.Request) -> web.Response:
             if start_found is False:
                 start = ts - length
 
-        # Build datetime from timestamp
-        start_time = time.gmtime(start)
-        start_date = time.strftime("%Y-%m-%d %H:%M:%S", start_time)
-        stop_time = time.gmtime(start + length)
-        stop_date = time.strftime("%Y-%m-%d %H:%M:%S", stop_time)
-
-        # Prepare payload
-        _where = PayloadBuilder(_aggregate).WHERE(["asset_code", "=", asset_code]).AND_WHERE([
-            "user_ts", ">=", str(start_date)], ["user_ts", "<=", str(stop_date)], [
-            "user_ts", "<=", str(stop_date)]).chain_payload()
-        _bucket = PayloadBuilder(_where).TIMEBUCKET('user_ts', bucket_size, 'YYYY-MM-DD HH24:MI:SS',
-                                                    'timestamp').chain_payload()
-
-        payload = PayloadBuilder(_bucket).LIMIT(int(length / int(bucket_size))).payload()
+        async def query(first, last, limit):
+            # Build datetime from timestamp
+            start_time = time.gmtime(first)
+            start_date = time.strftime("%Y-%m-%d %H:%M:%S", start_time)
+            stop_time = time.gmtime(last)
+            stop_date = time.strftime("%Y-%m-%d %H:%M:%S", stop_time)
+
+            # Prepare payload
+            _where = PayloadBuilder(copy.deepcopy(_aggregate)).WHERE(["asset_code", "=", asset_code]).AND_WHERE([
+                "user_ts", ">=", str(start_date)], ["user_ts", "<=", str(stop_date)], [
+                "user_ts", "<=", str(stop_date)]).chain_payload()
+            _bucket = PayloadBuilder(_where).TIMEBUCKET('user_ts', bucket_size, 'YYYY-MM-DD HH24:MI:SS',
+                                                        'timestamp').chain_payload()
+            if limit is not None:
+                _bucket = PayloadBuilder(_bucket).LIMIT(limit).chain_payload()
+            payload = PayloadBuilder(_bucket).payload()
+
+            # Sort & timebucket modifiers can not be used in same payload
+            # payload = PayloadBuilder(limit).ORDER_BY(["user_ts", "desc"]).payload()
+            results = await _readings.query(payload)
+            return results['rows']
 
-        # Sort & timebucket modifiers can not be used in same payload
-        # payload = PayloadBuilder(limit).ORDER_BY(["user_ts", "desc"]).payload()
-        results = await _readings.query(payload)
-        response = results['rows']
+        limit = int(length / int(bucket_size))
+        if int(bucket_size) >= 1:
+            key = (asset_code, reading, int(bucket_size))
+            response = await _bucket_series(key, key[2], int(start), int(start + length), limit, query)
+        else:
+            response = await query(start, start + length, limit)
     except (KeyError, IndexError) as e:
         raise web.HTTPNotFound(reason=e)
     except (TypeError, ValueError) as e:
@@ -948,8 +1370,11 @@ async def asset_purge_all(request):
         start_time = time.strftime('%Y-%m-%d %H:%M:%S.%s', time.localtime(time.time()))
 
         results = await _readings.purge(asset="")
+        _reading_keys.clear()
+        _SeriesCache.clear()
 
         if 'purged' in results:
+            _AssetCounts.purged()
             end_time = time.strftime('%Y-%m-%d %H:%M:%S.%s', time.localtime(time.time()))
             await _audit.information('PURGE',
                                      {
@@ -988,8 +1413,11 @@ async def asset_purge(request):
         start_time = time.strftime('%Y-%m-%d %H:%M:%S.%s', time.localtime(time.time()))
 
         results = await _readings.purge(asset=asset_code)
+        _reading_keys.pop(asset_code, None)
+        _SeriesCache.clear(asset_code)
 
         if 'purged' in results:
+            _AssetCounts.purged(asset_code)
             end_time = time.strftime('%Y-%m-%d %H:%M:%S.%s', time.localtime(time.time()))
             await _audit.information('PURGE',
                                      {
@@ -18,6 +18,7 @@ from fledge.common.configuration_manager import ConfigurationManager, _optional_
 from fledge.common.logger import FLCoreLogger
 from fledge.common.storage_client.payload_builder import PayloadBuilder
 from fledge.services.core import connect
+from fledge.services.core.interest_registry import change_callback
 
 
 __author__ = "Amarendra K. Sinha, Ashish Jabble"
@@ -35,6 +36,8 @@ _help = """
     | GET POST       | /fledge/category/{category_name}/children                  |
     | DELETE         | /fledge/category/{category_name}/children/{child_category} |
     | DELETE         | /fledge/category/{category_name}/parent                    |
+    | GET            | /fledge/configuration/cache                                |
+    | GET            | /fledge/configuration/notifications                        |
     --------------------------------------------------------------------------------
 """
 
@@ -415,7 +418,9 @@ async def add_configuration_item(request):
 
         # update cache with new config item
         if category_name in cf_mgr._cacheManager.cache:
-            cf_mgr._cacheManager.cache[category_name]['value'].update({new_config_item: data})
+            category_val = cf_mgr._cacheManager.cache[category_name]['value']
+            category_val.update({new_config_item: data})
+            cf_mgr._cacheManager.update_value(category_name, category_val)
 
         # logged audit new config item for category
         audit = AuditLogger(storage_client)
@@ -677,6 +682,36 @@ async def upload_script(request):
         return web.json_response(result)
 
 
+async def get_cache_statistics(request):
+    """
+    Args:
+         request:
+
+    Returns:
+            the size, limits and hit, miss, expired and evicted counters of the Configuration Manager cache
+
+    :Example:
+            curl -sX GET http://localhost:8081/fledge/configuration/cache
+    """
+    cf_mgr = ConfigurationManager(connect.get_storage_async())
+    return web.json_response(cf_mgr._cacheManager.stats())
+
+
+async def get_notification_metrics(request):
+    """
+    Args:
+         request:
+
+    Returns:
+            the number of category change notifications sent, failed, coalesced and pending, and their delivery
+            latency
+
+    :Example:
+            curl -sX GET http://localhost:8081/fledge/configuration/notifications
+    """
+    return web.json_response(change_callback.metrics())
+
+
 def hide_password(config: dict) -> Dict:
     new_config = copy.deepcopy(config)
     try:
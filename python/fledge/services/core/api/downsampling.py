@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+"""Single pass downsampling of the datapoint series of the readings returned by the browser API"""
+
+__author__ = "agent"
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+METHODS = ('lttb', 'minmax')
+
+
+class _Series(object):
+    """ Min and max points of the consecutive buckets of a series whose length is not known in advance
+
+    Buckets hold width consecutive points. Once there are more than max_buckets of them, pairs of buckets are merged
+    and the width doubled, so that memory is bound to max_buckets whatever the number of points.
+    A point is (index, value, item), index being its position in the stream, e.g. its row number.
+    """
+
+    __slots__ = ['max_buckets', 'width', 'count', 'buckets', 'first', 'last']
+
+    def __init__(self, max_buckets):
+        self.max_buckets = max_buckets
+        self.width = 1
+        self.count = 0
+        self.buckets = []
+        """[min point, max point] of each bucket"""
+        self.first = None
+        self.last = None
+
+    def add(self, point):
+        if self.first is None:
+            self.first = point
+        self.last = point
+        if self.count % self.width == 0:
+            self.buckets.append([point, point])
+            if len(self.buckets) > self.max_buckets:
+                self._merge()
+        else:
+            bucket = self.buckets[-1]
+            if point[1] < bucket[0][1]:
+                bucket[0] = point
+            elif point[1] > bucket[1][1]:
+                bucket[1] = point
+        self.count += 1
+
+    def _merge(self):
+        merged = []
+        for i in range(0, len(self.buckets), 2):
+            group = self.buckets[i:i + 2]
+            merged.append([min((b[0] for b in group), key=lambda p: p[1]),
+                           max((b[1] for b in group), key=lambda p: p[1])])
+        self.buckets = merged
+        self.width *= 2
+
+    def candidates(self):
+        """ Min and max points of all the buckets, and the first and last points, in stream order """
+        points = {self.first[0]: self.first, self.last[0]: self.last}
+        for low, high in self.buckets:
+            points[low[0]] = low
+            points[high[0]] = high
+        return [points[index] for index in sorted(points)]
+
+    def minmax(self, points):
+        """ Min and max points of points // 2 groups of consecutive buckets """
+        if self.count <= points:
+            return self.candidates()
+        groups = min(points // 2, len(self.buckets))
+        size = len(self.buckets) / groups
+        selected = {}
+        for g in range(groups):
+            group = self.buckets[int(g * size):int((g + 1) * size)]
+            low = min((b[0] for b in group), key=lambda p: p[1])
+            high = max((b[1] for b in group), key=lambda p: p[1])
+            selected[low[0]] = low
+            selected[high[0]] = high
+        return [selected[index] for index in sorted(selected)]
+
+    def lttb(self, points):
+        """ Largest Triangle Three Buckets over the candidate points, the stream index being the x axis """
+        data = self.candidates()
+        if len(data) <= points:
+            return data
+        every = (len(data) - 2) / (points - 2)
+        selected = [data[0]]
+        a = data[0]
+        for i in range(points - 2):
+            # Average of the next bucket, the third vertex of the triangles
+            next_start = int((i + 1) * every) + 1
+            next_end = min(int((i + 2) * every) + 1, len(data))
+            next_points = data[next_start:next_end]
+            avg_x = sum(p[0] for p in next_points) / len(next_points)
+            avg_y = sum(p[1] for p in next_points) / len(next_points)
+            best = None
+            best_area = -1
+            for p in data[int(i * every) + 1:next_start]:
+                area = abs((a[0] - avg_x) * (p[1] - a[1]) - (a[0] - p[0]) * (avg_y - a[1]))
+                if area > best_area:
+                    best_area = area
+                    best = p
+            selected.append(best)
+            a = best
+        selected.append(data[-1])
+        return selected
+
+
+class Downsampler(object):
+    """ Downsamples any number of series to at most points points each, in a single pass over their values
+
+    Values are added in stream order with :meth:`add` and only the min and max points of 2 * points buckets are kept
+    per series, so memory does not depend on the number of values. :meth:`result` then selects the points:
+
+        minmax  the min and max values of points / 2 groups of consecutive values
+        lttb    Largest Triangle Three Buckets run over the kept min and max points (MinMaxLTTB), which keeps the
+                first and last values and uses the stream index as the x axis, i.e. treats values as evenly spaced
+    """
+
+    def __init__(self, points, method='lttb'):
+        """
+        Args:
+            points: maximum number of points per series, at least 3 for lttb and 2 for minmax
+            method: one of METHODS
+        """
+        if method not in METHODS:
+            raise ValueError("method must be one of {}".format(", ".join(METHODS)))
+        minimum = 3 if method == 'lttb' else 2
+        if not isinstance(points, int) or isinstance(points, bool) or points < minimum:
+            raise ValueError("points must be an integer greater than or equal to {}".format(minimum))
+        self._points = points
+        self._method = method
+        self._series = {}
+
+    @staticmethod
+    def is_value(value):
+        """ Whether a datapoint value can be downsampled, i.e. is a number """
+        return isinstance(value, (int, float)) and not isinstance(value, bool) and value == value
+
+    def add(self, key, index, value, item):
+        """ Adds the next value of a series
+
+        Args:
+            key: series key, e.g. the datapoint name
+            index: position of the value in the stream, increasing from one value of the series to the next
+            value: number
+            item: anything, returned along with the value when it is selected
+        """
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series(2 * self._points)
+        series.add((index, value, item))
+
+    def result(self):
+        """ series key: selected (index, value, item) points in stream order """
+        if self._method == 'minmax':
+            return {key: series.minmax(self._points) for key, series in self._series.items()}
+        return {key: series.lttb(self._points) for key, series in self._series.items()}
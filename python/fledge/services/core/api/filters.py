@@ -543,6 +543,7 @@ async def _delete_configuration_category(storage: StorageClientAsync, key: str)
     config_mgr = ConfigurationManager(storage)
     config_mgr.delete_category_related_things(key)
     config_mgr._cacheManager.remove(key)
+    config_mgr._invalidate_category_groups()
 
 
 def _diff(list1: Union[List, str], list2: Union[List, str]) -> List:
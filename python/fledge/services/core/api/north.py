@@ -56,6 +56,8 @@ async def _get_tasks_status():
 
     tasks = {}
     try:
+        # The scheduler writes the tasks rows in batches, the latest ones may still be queued
+        await server.Server.scheduler.flush_tasks()
         _storage = connect.get_storage_async()
         results = await _storage.query_tbl_with_payload('tasks', payload.payload())
         previous_schedule = None
@@ -353,7 +353,7 @@ def install_package_from_repo(name: str, pkg_mgt: str, version: str, uid: uuid,
         audit = AuditLogger(storage)
         audit_detail = {'packageName': name}
         log_code = 'PKGUP' if msg == 'updated' else 'PKGIN'
-        loop.run_until_complete(audit.information(log_code, audit_detail))
+        loop.run_until_complete(audit.information(log_code, audit_detail, wait=True))
         _LOGGER.info('{} plugin {} successfully.'.format(name, msg))
 
 
@@ -173,7 +173,7 @@ def _uninstall(pkg_name: str, version: str, uid: uuid, storage: connect) -> tupl
             # Audit logger
             audit = AuditLogger(storage)
             audit_detail = {'package_name': pkg_name, 'version': version}
-            loop.run_until_complete(audit.information('PKGRM', audit_detail))
+            loop.run_until_complete(audit.information('PKGRM', audit_detail, wait=True))
             _logger.info('{} removed successfully.'.format(pkg_name))
     except Exception:
         # Non-Zero integer - Case of fail
@@ -422,7 +422,7 @@ def purge_plugin(plugin_type: str, plugin_name: str, pkg_name: str, version: str
             # Audit info
             audit = AuditLogger(storage)
             audit_detail = {'package_name': pkg_name, 'version': version}
-            loop.run_until_complete(audit.information('PKGRM', audit_detail))
+            loop.run_until_complete(audit.information('PKGRM', audit_detail, wait=True))
             _logger.info('{} plugin removed successfully.'.format(pkg_name))
     except KeyError:
         # This case is for non-package installation - python plugin path will be tried first and then C
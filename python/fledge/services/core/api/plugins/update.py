@@ -396,7 +396,7 @@ def do_update(protocol: str, host: str, port: int, storage: connect, _type: str,
         audit_detail = {'packageName': pkg_name}
         if version:
             audit_detail['version'] = version[0]
-        loop.run_until_complete(audit.information('PKGUP', audit_detail))
+        loop.run_until_complete(audit.information('PKGUP', audit_detail, wait=True))
         _logger.info('{} package updated successfully.'.format(pkg_name))
 
     # Restart the services which were disabled before plugin update
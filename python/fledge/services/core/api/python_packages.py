@@ -101,7 +101,7 @@ async def install_package(request: web.Request) -> web.Response:
             audit_message = {"package": input_package_name, "status": "Success"}
             if input_package_version:
                 audit_message["version"] = input_package_version
-            await pip_audit_log.information('PIPIN', audit_message)
+            await pip_audit_log.information('PIPIN', audit_message, wait=True)
         except:
             _LOGGER.error("Failed to log the audit entry for PIPIN, for package {} install", format(
                 input_package_name))
@@ -36,6 +36,7 @@ _help = """
     | PUT             | /fledge/schedule/disable                                 |
     | POST            | /fledge/schedule/start/{schedule_id}                     |
     | GET             | /fledge/schedule/type                                    |
+    | GET             | /fledge/schedule/metrics                                 |
 
     | GET             | /fledge/task                                             |
     | GET             | /fledge/task/latest                                      |
@@ -749,6 +750,22 @@ async def get_schedule_type(request):
     return web.json_response({'scheduleType': results})
 
 
+async def get_schedule_metrics(request):
+    """
+    Args:
+        request:
+
+    Returns:
+         the number of scheduled tasks started and the delay, in seconds, between the time they were due and the
+         time they started
+
+    :Example:
+             curl -X GET  http://localhost:8081/fledge/schedule/metrics
+    """
+
+    return web.json_response(server.Server.scheduler.dispatch_metrics())
+
+
 #################################
 # Tasks
 #################################
@@ -878,6 +895,8 @@ async def get_tasks_latest(request):
         payload.WHERE(["schedule_name", "=", name])
 
     try:
+        # The scheduler writes the tasks rows in batches, the latest ones may still be queued
+        await server.Server.scheduler.flush_tasks()
         _storage = connect.get_storage_async()
         results = await _storage.query_tbl_with_payload('tasks', payload.payload())
 
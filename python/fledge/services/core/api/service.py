@@ -44,6 +44,7 @@ _help = """
     | GET POST            | /fledge/service                                      |
     | GET                 | /fledge/service/available                            |
     | GET                 | /fledge/service/installed                            |
+    | GET                 | /fledge/service/monitor/metrics                      |
     | PUT                 | /fledge/service/{type}/{name}/update                 |
     | DELETE              | /fledge/service/{service_name}                       |
     | POST                | /fledge/service/{service_name}/otp                   |
@@ -615,6 +616,18 @@ async def get_installed(request: web.Request) -> web.Response:
     return web.json_response({"services": services})
 
 
+async def get_monitor_metrics(request: web.Request) -> web.Response:
+    """ get the health check round metrics of the service monitor
+
+        :Example:
+            curl -X GET http://localhost:8081/fledge/service/monitor/metrics
+    """
+    if server.Server.service_monitor is None:
+        msg = "Service monitor is not running"
+        raise web.HTTPNotFound(reason=msg, body=json.dumps({"message": msg}))
+    return web.json_response(server.Server.service_monitor.metrics())
+
+
 async def update_service(request: web.Request) -> web.Response:
     """ update service
 
@@ -744,7 +757,7 @@ def do_update(protocol: str, host: str, port: int, storage: connect, pkg_name: s
         # Audit info
         audit = AuditLogger(storage)
         audit_detail = {'packageName': pkg_name}
-        loop.run_until_complete(audit.information('PKGUP', audit_detail))
+        loop.run_until_complete(audit.information('PKGUP', audit_detail, wait=True))
         _logger.info('{} service updated successfully. Logs available at {}'.format(pkg_name, link))
 
     # Restart the service which was disabled before service update
@@ -189,7 +189,8 @@ EOF
         storage = connect.get_storage_async()
         config_mgr = ConfigurationManager(storage)
 
-        # Abort the operation if there are already executed tasks
+        # Abort the operation if there are already executed tasks, the scheduler writes their rows in batches
+        await server.Server.scheduler.flush_tasks()
         payload = PayloadBuilder() \
             .SELECT(["id", "schedule_name"]) \
             .WHERE(['schedule_name', '=', name]) \
@@ -354,6 +355,8 @@ async def delete_statistics_key(storage, key):
 
 
 async def delete_task_entry_with_schedule_id(storage, sch_id):
+    # Writes the queued tasks rows first, a queued insert would otherwise outlive the delete
+    await server.Server.scheduler.flush_tasks()
     payload = PayloadBuilder().WHERE(["schedule_id", "=", str(sch_id)]).payload()
     await storage.delete_from_tbl("tasks", payload)
 
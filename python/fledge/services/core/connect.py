@@ -16,13 +16,38 @@ __version__ = "${VERSION}"
 _logger = FLCoreLogger().get_logger(__name__)
 
 
+_storage_client = None
+"""(storage service record, its endpoint, StorageClientAsync) of the last get_storage_async call"""
+
+_readings_client = None
+"""(storage service record, its endpoint, ReadingsStorageClientAsync) of the last get_readings_async call"""
+
+
+def _endpoint(storage_svc):
+    return storage_svc._protocol, storage_svc._address, storage_svc._port, storage_svc._management_port
+
+
+def _cached(cached_client, storage_svc):
+    """ The cached client if it was created for this very storage service record and endpoint, None otherwise
+
+    A storage service that registers again gets a new service record, hence a new client.
+    """
+    if cached_client is not None and cached_client[0] is storage_svc and cached_client[1] == _endpoint(storage_svc):
+        return cached_client[2]
+    return None
+
+
 # TODO: Needs refactoring or better way to allow global discovery in core process
 def get_storage_async():
     """ Storage Object """
+    global _storage_client
     try:
         services = ServiceRegistry.get(name="Fledge Storage")
         storage_svc = services[0]
-        _storage = StorageClientAsync(core_management_host=None, core_management_port=None, svc=storage_svc)
+        _storage = _cached(_storage_client, storage_svc)
+        if _storage is None:
+            _storage = StorageClientAsync(core_management_host=None, core_management_port=None, svc=storage_svc)
+            _storage_client = (storage_svc, _endpoint(storage_svc), _storage)
     except Exception as ex:
         _logger.error(ex)
         raise
@@ -32,10 +57,14 @@ def get_storage_async():
 # TODO: Needs refactoring or better way to allow global discovery in core process
 def get_readings_async():
     """ Storage Object """
+    global _readings_client
     try:
         services = ServiceRegistry.get(name="Fledge Storage")
         storage_svc = services[0]
-        _readings = ReadingsStorageClientAsync(core_mgt_host=None, core_mgt_port=None, svc=storage_svc)
+        _readings = _cached(_readings_client, storage_svc)
+        if _readings is None:
+            _readings = ReadingsStorageClientAsync(core_mgt_host=None, core_mgt_port=None, svc=storage_svc)
+            _readings_client = (storage_svc, _endpoint(storage_svc), _readings)
     except Exception as ex:
         _logger.error(ex)
         raise
@@ -4,12 +4,18 @@
 # See: http://fledge-iot.readthedocs.io/
 # FLEDGE_END
 
-""" Module to hold the callback to notify microservices of config changes. """
+""" Module to hold the callback to notify microservices of config changes.
+
+Notifications are sent concurrently over a shared keep-alive session whose connector bounds the number of requests in
+flight. A notification waits COALESCE_WINDOW seconds before it is sent; further changes of the same category for the
+same microservice within the window replace its payload, so that only the latest value is delivered.
+"""
 
 import json
 import asyncio
-import aiohttp
+import time
 from fledge.common.configuration_manager import ConfigurationManager
+from fledge.common.web.session_pool import SessionPool
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
 from fledge.services.core.service_registry import exceptions as service_registry_exceptions
 from fledge.services.core.interest_registry.interest_registry import InterestRegistry
@@ -22,6 +28,136 @@ __version__ = "${VERSION}"
 
 _LOGGER = logger.setup(__name__)
 
+MAX_CONCURRENT_NOTIFICATIONS = 20
+"""Maximum number of notifications sent at the same time"""
+
+COALESCE_WINDOW = 0.05
+"""Seconds a notification waits for further changes of its category before it is sent"""
+
+_HEADERS = {'content-type': 'application/json'}
+
+session_pool = SessionPool(limit=MAX_CONCURRENT_NOTIFICATIONS)
+
+_pending = {}
+"""(microservice uuid, endpoint, parent category name, category name): _Notification waiting for its coalescing
+window to close"""
+
+_metrics = {"sent": 0, "failed": 0, "coalesced": 0, "latencyTotal": 0.0, "latencyMax": 0.0}
+
+
+class _Notification(object):
+    __slots__ = ['method', 'url', 'payload', 'microservice_uuid', 'done']
+
+    def __init__(self, method, url, payload, microservice_uuid, done):
+        self.method = method
+        self.url = url
+        self.payload = payload
+        self.microservice_uuid = microservice_uuid
+        self.done = done
+
+
+def metrics():
+    """ Delivery counters of the notifications sent since the core started
+
+    Returns:
+        dict with the number of notifications sent, failed and coalesced into a later one, and their total, average
+        and maximum delivery latency in seconds
+    """
+    delivered = _metrics["sent"] + _metrics["failed"]
+    return {
+        "sent": _metrics["sent"],
+        "failed": _metrics["failed"],
+        "coalesced": _metrics["coalesced"],
+        "pending": len(_pending),
+        "latencyTotal": round(_metrics["latencyTotal"], 6),
+        "latencyAverage": round(_metrics["latencyTotal"] / delivered, 6) if delivered else 0.0,
+        "latencyMax": round(_metrics["latencyMax"], 6)
+    }
+
+
+async def close():
+    """ Close the keep-alive connections to the microservices """
+    await session_pool.close()
+
+
+def _service_url(microservice_uuid, endpoint):
+    """ Management API url of an interested microservice, None when it is not in the service registry """
+    # get microservice management server info of microservice through service registry
+    try:
+        service_record = ServiceRegistry.get(idx=microservice_uuid)[0]
+    except service_registry_exceptions.DoesNotExist:
+        _LOGGER.exception("Unable to notify microservice with uuid %s as it is not found in the service registry",
+                          microservice_uuid)
+        return None
+    return "{}://{}:{}/fledge/{}".format(service_record._protocol, service_record._address,
+                                         service_record._management_port, endpoint)
+
+
+def _notify(microservice_uuid, method, endpoint, payload):
+    """ Queue a notification, or replace the payload of the one of the same category still waiting to be sent
+
+    Returns:
+        awaitable done once the notification carrying the payload has been delivered or has failed
+    """
+    url = _service_url(microservice_uuid, endpoint)
+    if url is None:
+        return None
+    key = (microservice_uuid, endpoint, payload.get("parent_category"), payload["category"])
+    notification = _pending.get(key)
+    if notification is not None and notification.url == url and notification.method == method:
+        notification.payload = payload
+        _metrics["coalesced"] += 1
+    else:
+        notification = _Notification(method, url, payload, microservice_uuid,
+                                      asyncio.get_event_loop().create_future())
+        _pending[key] = notification
+        asyncio.ensure_future(_deliver(key, notification))
+    # A cancelled caller must not cancel a notification shared with other callers
+    return asyncio.shield(notification.done)
+
+
+async def _deliver(key, notification):
+    await asyncio.sleep(COALESCE_WINDOW)
+    # Changes from now on need a new notification, this one may already carry an outdated value
+    if _pending.get(key) is notification:
+        del _pending[key]
+    start = time.perf_counter()
+    delivered = False
+    try:
+        session = session_pool.get_session()
+        request = session.delete if notification.method == "delete" else session.post
+        async with request(notification.url, data=json.dumps(notification.payload, sort_keys=True),
+                           headers=_HEADERS) as resp:
+            await resp.text()
+            status_code = resp.status
+            if status_code in range(400, 500):
+                _LOGGER.error("Bad request error code: %d, reason: %s", status_code, resp.reason)
+            elif status_code in range(500, 600):
+                _LOGGER.error("Server error code: %d, reason: %s", status_code, resp.reason)
+            else:
+                delivered = True
+    except Exception as ex:
+        _LOGGER.exception(ex, "Unable to notify microservice with uuid {}".format(notification.microservice_uuid))
+    finally:
+        latency = time.perf_counter() - start
+        _metrics["sent" if delivered else "failed"] += 1
+        _metrics["latencyTotal"] += latency
+        if latency > _metrics["latencyMax"]:
+            _metrics["latencyMax"] = latency
+        if not notification.done.done():
+            notification.done.set_result(delivered)
+
+
+async def _notify_all(notifications):
+    """ Send notifications concurrently and wait until all of them have been delivered or have failed
+
+    Args:
+        notifications: iterable of (microservice uuid, method, endpoint, payload)
+    """
+    waiters = [waiter for waiter in (_notify(*notification) for notification in notifications) if waiter is not None]
+    if waiters:
+        await asyncio.gather(*waiters)
+
 
 async def run(category_name):
     """ Callback run by configuration category to notify changes to interested microservices
@@ -42,30 +178,9 @@ async def run(category_name):
 
     category_value = await cfg_mgr.get_category_all_items(category_name)
     payload = {"category" : category_name, "items" : category_value}
-    headers = {'content-type': 'application/json'}
 
     # for each microservice interested in category_name, notify change
-    for i in interest_records:
-        # get microservice management server info of microservice through service registry
-        try: 
-            service_record = ServiceRegistry.get(idx=i._microservice_uuid)[0]
-        except service_registry_exceptions.DoesNotExist:
-            _LOGGER.exception("Unable to notify microservice with uuid %s as it is not found in the service registry", i._microservice_uuid)
-            continue
-        url = "{}://{}:{}/fledge/change".format(service_record._protocol, service_record._address, service_record._management_port)
-
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, data=json.dumps(payload, sort_keys=True), headers=headers) as resp:
-                    result = await resp.text()
-                    status_code = resp.status
-                    if status_code in range(400, 500):
-                        _LOGGER.error("Bad request error code: %d, reason: %s", status_code, resp.reason)
-                    if status_code in range(500, 600):
-                        _LOGGER.error("Server error code: %d, reason: %s", status_code, resp.reason)
-            except Exception as ex:
-                _LOGGER.exception(ex, "Unable to notify microservice with uuid {}".format(i._microservice_uuid))
-                continue
+    await _notify_all((i._microservice_uuid, "post", "change", payload) for i in interest_records)
 
 
 async def run_child_create(parent_category_name, child_category_list):
@@ -84,35 +199,13 @@ async def run_child_create(parent_category_name, child_category_list):
     except interest_registry_exceptions.DoesNotExist:
         return
 
+    notifications = []
     for child_category in child_category_list:
-
         category_value = await cfg_mgr.get_category_all_items(child_category)
         payload = {"parent_category" : parent_category_name, "category" : child_category, "items" : category_value}
-        headers = {'content-type': 'application/json'}
-
         # for each microservice interested in category_name, notify change
-        for i in interest_records:
-            # get microservice management server info of microservice through service registry
-            try:
-                service_record = ServiceRegistry.get(idx=i._microservice_uuid)[0]
-            except service_registry_exceptions.DoesNotExist:
-                _LOGGER.exception("Unable to notify microservice with uuid {} as it is not "
-                                  "found in the service registry".format(i._microservice_uuid))
-                continue
-            url = "{}://{}:{}/fledge/child_create".format(service_record._protocol, service_record._address, service_record._management_port)
-
-            async with aiohttp.ClientSession() as session:
-                try:
-                    async with session.post(url, data=json.dumps(payload, sort_keys=True), headers=headers) as resp:
-                        result = await resp.text()
-                        status_code = resp.status
-                        if status_code in range(400, 500):
-                            _LOGGER.error("Bad request error code: %d, reason: %s", status_code, resp.reason)
-                        if status_code in range(500, 600):
-                            _LOGGER.error("Server error code: %d, reason: %s", status_code, resp.reason)
-                except Exception as ex:
-                    _LOGGER.exception(ex, "Unable to notify microservice with uuid {}".format(i._microservice_uuid))
-                    continue
+        notifications.extend((i._microservice_uuid, "post", "child_create", payload) for i in interest_records)
+    await _notify_all(notifications)
 
 
 async def run_child_delete(parent_category_name, child_category):
@@ -133,31 +226,9 @@ async def run_child_delete(parent_category_name, child_category):
 
     category_value = await cfg_mgr.get_category_all_items(child_category)
     payload = {"parent_category" : parent_category_name, "category" : child_category, "items" : category_value}
-    headers = {'content-type': 'application/json'}
 
     # for each microservice interested in category_name, notify change
-    for i in interest_records:
-        # get microservice management server info of microservice through service registry
-        try:
-            service_record = ServiceRegistry.get(idx=i._microservice_uuid)[0]
-        except service_registry_exceptions.DoesNotExist:
-            _LOGGER.exception("Unable to notify microservice with uuid %s as it is not found in the service registry", i._microservice_uuid)
-            continue
-
-        url = "{}://{}:{}/fledge/child_delete".format(service_record._protocol, service_record._address, service_record._management_port)
-
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.delete(url, data=json.dumps(payload, sort_keys=True), headers=headers) as resp:
-                    result = await resp.text()
-                    status_code = resp.status
-                    if status_code in range(400, 500):
-                        _LOGGER.error("Bad request error code: %d, reason: %s", status_code, resp.reason)
-                    if status_code in range(500, 600):
-                        _LOGGER.error("Server error code: %d, reason: %s", status_code, resp.reason)
-            except Exception as ex:
-                _LOGGER.exception(ex, "Unable to notify microservice with uuid {}".format(i._microservice_uuid))
-                continue
+    await _notify_all((i._microservice_uuid, "delete", "child_delete", payload) for i in interest_records)
 
 
 async def run_child(parent_category_name, child_category_list, operation):
@@ -40,9 +40,14 @@ class InterestRegistry(InterestRegistrySingleton):
     _registered_interests = None
     """ maintains the list of InterestRecord objects """
 
+    _indexes = None
+    """ secondary indexes of _registered_interests, {attribute: {value: [InterestRecord objects]}} """
+
     _configuration_manager = None
     """ ConfigurationManager used by InterestRegistry """
 
+    _INDEXED_ATTRIBUTES = ('_registration_id', '_category_name', '_microservice_uuid')
+
     def __init__(self, configuration_manager=None):
         """ Used to create InterestRegistry object
 
@@ -58,14 +63,33 @@ class InterestRegistry(InterestRegistrySingleton):
             self._configuration_manager = configuration_manager
         if self._registered_interests is None:
             self._registered_interests = list()
-    
+            self._indexes = {attribute: dict() for attribute in self._INDEXED_ATTRIBUTES}
+
     def and_filter(self, **kwargs):
         """ Used to filter InterestRecord objects based on attribute values.
         """
-        interest_records = None
-        interest_records = [s for s in self._registered_interests if all(getattr(s, k, None) == v for k, v in kwargs.items() if v is not None)]
+        criteria = {k: v for k, v in kwargs.items() if v is not None}
+        # Only scan the smallest index bucket matching one of the criteria
+        candidates = self._registered_interests
+        for k, v in criteria.items():
+            if k in self._indexes:
+                bucket = self._indexes[k].get(v, ())
+                if len(bucket) < len(candidates):
+                    candidates = bucket
+        interest_records = [s for s in candidates if all(getattr(s, k, None) == v for k, v in criteria.items())]
         return interest_records
 
+    def _add_to_indexes(self, interest_record):
+        for attribute in self._INDEXED_ATTRIBUTES:
+            self._indexes[attribute].setdefault(getattr(interest_record, attribute), []).append(interest_record)
+
+    def _remove_from_indexes(self, interest_record):
+        for attribute in self._INDEXED_ATTRIBUTES:
+            bucket = self._indexes[attribute][getattr(interest_record, attribute)]
+            bucket.remove(interest_record)
+            if not bucket:
+                del self._indexes[attribute][getattr(interest_record, attribute)]
+
     def get(self, registration_id=None, category_name=None, microservice_uuid=None):
         """ Used to filter InterestRecord objects based on attribute values.
         Args:
@@ -167,6 +191,7 @@ class InterestRegistry(InterestRegistrySingleton):
         registered_interest = InterestRecord(registration_id, microservice_uuid, category_name)
         # add interest record to list of registered interests
         self._registered_interests.append(registered_interest)
+        self._add_to_indexes(registered_interest)
 
         return registration_id
 
@@ -185,6 +210,7 @@ class InterestRegistry(InterestRegistrySingleton):
             registered_interests = self.get(registration_id=registration_id)
             interest_record = registered_interests[0]
             self._registered_interests.remove(registered_interests[0])
+            self._remove_from_indexes(interest_record)
         except interest_registry_exceptions.DoesNotExist:
             raise
         # remove entry from configuration manager if no registered interests exist for this category_name
@@ -75,6 +75,8 @@ def setup(app):
     app.router.add_route('POST', '/fledge/category/{category_name}/{config_item}', api_configuration.add_configuration_item)
     app.router.add_route('DELETE', '/fledge/category/{category_name}/{config_item}/value', api_configuration.delete_configuration_item_value)
     app.router.add_route('POST', '/fledge/category/{category_name}/{config_item}/upload', api_configuration.upload_script)
+    app.router.add_route('GET', '/fledge/configuration/cache', api_configuration.get_cache_statistics)
+    app.router.add_route('GET', '/fledge/configuration/notifications', api_configuration.get_notification_metrics)
     # Scheduler
     # Scheduled_processes - As per doc
     app.router.add_route('GET', '/fledge/schedule/process', api_scheduler.get_scheduled_processes)
@@ -85,6 +87,7 @@ def setup(app):
     app.router.add_route('GET', '/fledge/schedule', api_scheduler.get_schedules)
     app.router.add_route('POST', '/fledge/schedule', api_scheduler.post_schedule)
     app.router.add_route('GET', '/fledge/schedule/type', api_scheduler.get_schedule_type)
+    app.router.add_route('GET', '/fledge/schedule/metrics', api_scheduler.get_schedule_metrics)
     app.router.add_route('GET', '/fledge/schedule/{schedule_id}', api_scheduler.get_schedule)
     app.router.add_route('PUT', '/fledge/schedule/{schedule_id}/enable', api_scheduler.enable_schedule)
     app.router.add_route('PUT', '/fledge/schedule/{schedule_id}/disable', api_scheduler.disable_schedule)
@@ -109,6 +112,7 @@ def setup(app):
     app.router.add_route('DELETE', '/fledge/service/{service_name}', service.delete_service)
     app.router.add_route('GET', '/fledge/service/available', service.get_available)
     app.router.add_route('GET', '/fledge/service/installed', service.get_installed)
+    app.router.add_route('GET', '/fledge/service/monitor/metrics', service.get_monitor_metrics)
     app.router.add_route('PUT', '/fledge/service/{type}/{name}/update', service.update_service)
     app.router.add_route('POST', '/fledge/service/{service_name}/otp', service.issueOTPToken)
 
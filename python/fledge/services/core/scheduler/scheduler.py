@@ -9,6 +9,9 @@
 import asyncio
 import collections
 import datetime
+import heapq
+import itertools
+import json
 import logging
 import math
 import time
@@ -122,6 +125,9 @@ class Scheduler(object):
     _PURGE_TASKS_FREQUENCY_SECONDS = _DAY_SECONDS
     """How frequently to purge the tasks table"""
 
+    _TASK_WRITE_INTERVAL_SECONDS = 1
+    """How long task rows changes are queued for before being written to the tasks table together"""
+
     # Mostly constant class attributes
     _logger = None  # type: logging.Logger
 
@@ -164,6 +170,15 @@ class Scheduler(object):
         """Dictionary of schedules.id to _ScheduleRow"""
         self._schedule_executions = dict()
         """Dictionary of schedules.id to _ScheduleExecution"""
+        self._schedule_heap = []
+        """Heap of (next_start_time, sequence, schedules.id). An entry is stale, and skipped when popped, once
+        the next_start_time of its schedule execution has changed"""
+        self._schedule_heap_sequence = itertools.count()
+        """Keeps the heap order of entries with the same next_start_time, and never compares the ids"""
+        self._schedules_to_check = dict()
+        """schedules.id of the schedules to check whatever their next_start_time, in insertion order"""
+        self._dispatch_metrics = {"dispatched": 0, "totalLatency": 0.0, "maxLatency": 0.0, "lastLatency": None}
+        """Delay in seconds between the time tasks were due to start and the time they started"""
         self._task_processes = dict()
         """Dictionary of tasks.id to _TaskProcess"""
         self._check_processes_pending = False
@@ -182,6 +197,20 @@ class Scheduler(object):
         """asynico task for :meth:`purge_tasks`, if scheduled to run"""
         self._restore_backup_id = None # type: int
         """Restore backup id and it will be used when SCHEDULE_RESTORE_ON_DEMAND runs"""
+        self._task_inserts = dict()
+        """Dictionary of tasks.id to the tasks row to insert"""
+        self._task_updates = dict()
+        """Dictionary of tasks.id to the values to update in a tasks row already inserted"""
+        self._latest_tasks = dict()
+        """Dictionary of schedules.name to the id of its latest finished task, for the schedules of
+        _latest_task_only_schedules"""
+        self._latest_task_only_schedules = set()
+        """Names of the schedules of which only the latest finished task row is kept"""
+        self._write_tasks_task = None  # type: asyncio.Task
+        """asyncio task for :meth:`_write_tasks_later`, if scheduled to run"""
+        self._write_tasks_lock = asyncio.Lock()
+        """Serializes the writes of :meth:`_write_tasks`, so that a flush returns once the rows queued before it
+        are all written"""
 
     @property
     def max_completed_task_age(self) -> datetime.timedelta:
@@ -240,6 +269,8 @@ class Scheduler(object):
 
         schedule_execution = self._schedule_executions[schedule.id]
         del schedule_execution.task_processes[task_process.task_id]
+        # An exclusive, queued or deleted schedule may be waiting for this task to finish
+        self._schedules_to_check[schedule.id] = True
 
         schedule_deleted = False
 
@@ -265,18 +296,9 @@ class Scheduler(object):
             else:
                 state = Task.State.COMPLETE
             # Update the task's status
-            update_payload = PayloadBuilder() \
-                .SET(exit_code=exit_code,
-                     state=int(state),
-                     end_time=str(common_utils.local_timestamp())) \
-                .WHERE(['id', '=', str(task_process.task_id)]) \
-                .payload()
-            try:
-                self._logger.debug('Database command: %s', update_payload)
-                res = await self._storage_async.update_tbl("tasks", update_payload)
-            except Exception:
-                self._logger.exception('Update failed: %s', update_payload)
-                # Must keep going!
+            self._queue_task_update(str(task_process.task_id), schedule.name,
+                                    exit_code=exit_code, state=int(state),
+                                    end_time=str(common_utils.local_timestamp()))
 
         # Due to maximum running tasks reached, it is necessary to
         # look for schedules that are ready to run even if there
@@ -378,25 +400,90 @@ class Scheduler(object):
 
         # Startup tasks are not tracked in the tasks table and do not have any future associated with them.
         if schedule.type != Schedule.Type.STARTUP:
-            # The task row needs to exist before the completion handler runs
-            insert_payload = PayloadBuilder() \
-                .INSERT(id=str(task_id),
-                        pid=(self._schedule_executions[schedule.id].
-                             task_processes[task_id].process.pid),
-                        schedule_name=schedule.name,
-                        schedule_id=str(schedule.id),
-                        process_name=schedule.process_name,
-                        state=int(Task.State.RUNNING),
-                        start_time=str(common_utils.local_timestamp())) \
-                .payload()
-            try:
-                self._logger.debug('Database command: %s', insert_payload)
-                res = await self._storage_async.insert_into_tbl("tasks", insert_payload)
-            except Exception:
-                self._logger.exception('Insert failed: %s', insert_payload)
-                # The process has started. Regardless of this error it must be waited on.
+            # The task row needs to be queued before the completion handler runs
+            self._queue_task_insert(dict(id=str(task_id),
+                                         pid=(self._schedule_executions[schedule.id].
+                                              task_processes[task_id].process.pid),
+                                         schedule_name=schedule.name,
+                                         schedule_id=str(schedule.id),
+                                         process_name=schedule.process_name,
+                                         state=int(Task.State.RUNNING),
+                                         start_time=str(common_utils.local_timestamp())))
             self._task_processes[task_id].future = asyncio.ensure_future(self._wait_for_task_completion(task_process))
 
+    def _queue_task_insert(self, row):
+        """Queues a tasks row to insert with the next write of :meth:`_write_tasks`"""
+        self._task_inserts[row['id']] = row
+        self._schedule_task_write()
+
+    def _queue_task_update(self, task_id, schedule_name, **values):
+        """Queues values to update in a tasks row with the next write of :meth:`_write_tasks`
+
+        The values of a task that has not been written yet go straight into its row to insert
+        """
+        try:
+            self._task_inserts[task_id].update(values)
+        except KeyError:
+            self._task_updates.setdefault(task_id, dict()).update(values)
+        if schedule_name in self._latest_task_only_schedules:
+            self._latest_tasks[schedule_name] = task_id
+        self._schedule_task_write()
+
+    def _schedule_task_write(self):
+        if self._write_tasks_task is None:
+            self._write_tasks_task = asyncio.ensure_future(self._write_tasks_later())
+
+    async def _write_tasks_later(self):
+        try:
+            await asyncio.sleep(self._TASK_WRITE_INTERVAL_SECONDS)
+        finally:
+            self._write_tasks_task = None
+        await self._write_tasks()
+
+    async def _write_tasks(self):
+        """Writes the queued tasks rows, inserts first, with one request per kind of change
+
+        Failures are logged and the rows dropped, the tasks themselves must keep going.
+        """
+        async with self._write_tasks_lock:
+            inserts, self._task_inserts = self._task_inserts, dict()
+            updates, self._task_updates = self._task_updates, dict()
+            latest_tasks, self._latest_tasks = self._latest_tasks, dict()
+
+            if inserts:
+                insert_payload = {"inserts": list(inserts.values())}
+                try:
+                    self._logger.debug('Database command: %s', insert_payload)
+                    await self._storage_async.insert_into_tbl("tasks", insert_payload)
+                except Exception:
+                    self._logger.exception('Insert failed: %s', insert_payload)
+
+            if updates:
+                update_payload = {"updates": [
+                    json.loads(PayloadBuilder().SET(**values).WHERE(['id', '=', task_id]).payload())
+                    for task_id, values in updates.items()]}
+                try:
+                    self._logger.debug('Database command: %s', update_payload)
+                    await self._storage_async.update_tbl("tasks", update_payload)
+                except Exception:
+                    self._logger.exception('Update failed: %s', update_payload)
+
+            for schedule_name, task_id in latest_tasks.items():
+                delete_payload = PayloadBuilder() \
+                    .WHERE(["schedule_name", "=", schedule_name]) \
+                    .AND_WHERE(["state", "!=", int(Task.State.RUNNING)]) \
+                    .AND_WHERE(["id", "!=", task_id]) \
+                    .payload()
+                try:
+                    self._logger.debug('Database command: %s', delete_payload)
+                    await self._storage_async.delete_from_tbl("tasks", delete_payload)
+                except Exception:
+                    self._logger.exception('Delete failed: %s', delete_payload)
+
+    async def flush_tasks(self):
+        """Writes the queued tasks rows now, for the callers that query the tasks table directly"""
+        await self._write_tasks()
+
     async def purge_tasks(self):
         """Deletes rows from the tasks table"""
         if self._paused:
@@ -434,16 +521,81 @@ class Scheduler(object):
                     time.time() - self._last_task_purge_time) >= self._PURGE_TASKS_FREQUENCY_SECONDS):
             self._purge_tasks_task = asyncio.ensure_future(self.purge_tasks())
 
+    def _push_schedule(self, schedule_id, schedule_execution):
+        """Adds the next_start_time of a schedule execution to the heap of start times"""
+        if schedule_execution.next_start_time is None:
+            return
+        if len(self._schedule_heap) > 2 * len(self._schedule_executions) + 64:
+            # Too many stale entries, rebuild the heap from the schedule executions
+            self._schedule_heap = [
+                (execution.next_start_time, next(self._schedule_heap_sequence), _id)
+                for _id, execution in self._schedule_executions.items() if execution.next_start_time is not None]
+            heapq.heapify(self._schedule_heap)
+            return
+        heapq.heappush(self._schedule_heap, (schedule_execution.next_start_time,
+                                             next(self._schedule_heap_sequence), schedule_id))
+
+    def _is_stale(self, entry):
+        next_start_time, _, schedule_id = entry
+        schedule_execution = self._schedule_executions.get(schedule_id)
+        return schedule_execution is None or schedule_execution.next_start_time != next_start_time
+
+    def _due_schedules(self, now):
+        """Pops the schedules due at now from the heap, as well as those to check whatever their start time"""
+        schedule_ids = self._schedules_to_check
+        self._schedules_to_check = dict()
+        heap = self._schedule_heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if not self._is_stale(entry):
+                schedule_ids[entry[2]] = True
+        return list(schedule_ids)
+
+    def _earliest_start_time(self):
+        heap = self._schedule_heap
+        while heap and self._is_stale(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def _record_dispatch_latency(self, next_start_time):
+        latency = max(0.0, time.time() - next_start_time)
+        metrics = self._dispatch_metrics
+        metrics["dispatched"] += 1
+        metrics["totalLatency"] += latency
+        metrics["lastLatency"] = latency
+        if latency > metrics["maxLatency"]:
+            metrics["maxLatency"] = latency
+
+    def dispatch_metrics(self):
+        """Returns the delay, in seconds, between the time scheduled tasks were due and the time they started"""
+        metrics = self._dispatch_metrics
+        dispatched = metrics["dispatched"]
+        return {"dispatched": dispatched,
+                "averageLatency": metrics["totalLatency"] / dispatched if dispatched else 0.0,
+                "maxLatency": metrics["maxLatency"],
+                "lastLatency": metrics["lastLatency"],
+                "pendingTimers": len(self._schedule_heap)}
+
     async def _check_schedules(self):
-        """Starts tasks according to schedules based on the current time"""
-        earliest_start_time = None
+        """Starts tasks according to schedules based on the current time
+
+        Only the schedules due now, popped from the heap of start times, and the schedules flagged in
+        _schedules_to_check are looked at.
+        """
+        now = self.current_time if self.current_time else time.time()
+        schedule_ids = self._due_schedules(now)
 
-        # Can not iterate over _schedule_executions - it can change mid-iteration
-        for schedule_id in list(self._schedule_executions.keys()):
+        for index, schedule_id in enumerate(schedule_ids):
             if self._paused or len(self._task_processes) >= self._max_running_tasks:
+                # Check the schedules left over when a task completes
+                for pending_id in schedule_ids[index:]:
+                    self._schedules_to_check[pending_id] = True
                 return None
 
-            schedule_execution = self._schedule_executions[schedule_id]
+            # _schedule_executions can change at each await
+            schedule_execution = self._schedule_executions.get(schedule_id)
+            if schedule_execution is None:
+                continue
 
             try:
                 schedule = self._schedules[schedule_id]
@@ -482,13 +634,14 @@ class Scheduler(object):
                 elif schedule.exclusive:
                     # Exclusive tasks won't start again until they terminate
                     # Or the schedule doesn't repeat
-                    next_start_time = None
+                    pass
                 else:
                     # _schedule_next_task alters next_start_time
                     self._schedule_next_task(schedule)
-                    next_start_time = schedule_execution.next_start_time
 
                 await self._start_task(schedule)
+                if right_time:
+                    self._record_dispatch_latency(next_start_time)
 
                 # Queued manual execution is ignored when it was
                 # already time to run the task. The task doesn't
@@ -499,12 +652,7 @@ class Scheduler(object):
                 # will undo that because, after all, the task started.
                 schedule_execution.start_now = False
 
-            # Keep track of the earliest next_start_time
-            if next_start_time and (earliest_start_time is None or
-                                            earliest_start_time > next_start_time):
-                earliest_start_time = next_start_time
-
-        return earliest_start_time
+        return self._earliest_start_time()
 
     async def _scheduler_loop(self):
         """Main loop for the scheduler"""
@@ -580,6 +728,7 @@ class Scheduler(object):
                 dt += self._ONE_DAY
 
         schedule_execution.next_start_time = time.mktime(dt.timetuple())
+        self._push_schedule(schedule.id, schedule_execution)
 
     def _schedule_next_task(self, schedule) -> None:
         """Computes the next time to start a task for a schedule.
@@ -628,10 +777,12 @@ class Scheduler(object):
                     self._schedule_next_timed_task(schedule, schedule_execution, next_dt)
                 else:
                     schedule_execution.next_start_time = time.mktime(next_dt.timetuple())
+                    self._push_schedule(schedule.id, schedule_execution)
             else:
                 if schedule.type == Schedule.Type.MANUAL:
                     schedule_execution.next_start_time = time.time()
                 schedule_execution.next_start_time += advance_seconds
+                self._push_schedule(schedule.id, schedule_execution)
 
             self._logger.info(
                 "Scheduled task for schedule '%s' to start at %s", schedule.name,
@@ -684,6 +835,9 @@ class Scheduler(object):
                 datetime.datetime.fromtimestamp(current_time))
         elif schedule.type == Schedule.Type.STARTUP:
             schedule_execution.next_start_time = current_time
+        if schedule.type != Schedule.Type.TIMED:
+            # _schedule_next_timed_task pushes the timed ones
+            self._push_schedule(schedule.id, schedule_execution)
 
         if self._logger.isEnabledFor(logging.INFO):
             self._logger.info(
@@ -790,6 +944,13 @@ class Scheduler(object):
                 "default": str(self._DEFAULT_MAX_COMPLETED_TASK_AGE_DAYS),
                 "displayName": "Max Age Of Task (In days)"
             },
+            "latest_task_only_schedules": {
+                "description": "Comma separated names of the schedules of which only the latest finished task "
+                               "is kept in the tasks table",
+                "type": "string",
+                "default": "",
+                "displayName": "Schedules Keeping Latest Task Only"
+            },
         }
 
         cfg_manager = ConfigurationManager(self._storage_async)
@@ -799,6 +960,8 @@ class Scheduler(object):
         self._max_running_tasks = int(config['max_running_tasks']['value'])
         self._max_completed_task_age = datetime.timedelta(
             seconds=int(config['max_completed_task_age_days']['value']) * self._DAY_SECONDS)
+        self._latest_task_only_schedules = {
+            name.strip() for name in config['latest_task_only_schedules']['value'].split(',') if name.strip()}
 
     async def start(self):
         """Starts the scheduler
@@ -942,7 +1105,14 @@ class Scheduler(object):
             if task_count != 0:
                 raise TimeoutError("Timeout Error: Could not stop scheduler as {} tasks are pending".format(task_count))
 
+        if self._write_tasks_task is not None:
+            self._write_tasks_task.cancel()
+            self._write_tasks_task = None
+        await self._write_tasks()
+
         self._schedule_executions = None
+        self._schedule_heap = []
+        self._schedules_to_check = dict()
         self._task_processes = None
         self._schedules = None
         self._process_scripts = None
@@ -1438,6 +1608,7 @@ class Scheduler(object):
 
         if start_now:
             schedule_execution.start_now = True
+        self._schedules_to_check[schedule_id] = True
 
         self._logger.debug("Queued schedule '%s' for execution", schedule_row.name)
         self._resume_check_schedules()
@@ -1466,6 +1637,8 @@ class Scheduler(object):
             raise ScheduleNotFoundError(schedule_id)
 
         del self._schedules[schedule_id]
+        # Let _check_schedules remove its schedule execution
+        self._schedules_to_check[schedule_id] = True
 
         # TODO: Inspect race conditions with _set_first
         delete_payload = PayloadBuilder() \
@@ -1509,6 +1682,7 @@ class Scheduler(object):
 
     async def get_task(self, task_id: uuid.UUID) -> Task:
         """Retrieves a task given its id"""
+        await self._write_tasks()
         query_payload = PayloadBuilder().SELECT("id", "process_name", "schedule_name", "state", "start_time", "end_time", "reason", "exit_code")\
             .ALIAS("return", ("start_time", 'start_time'), ("end_time", 'end_time'))\
             .FORMAT("return", ("start_time", "YYYY-MM-DD HH24:MI:SS.MS"), ("end_time", "YYYY-MM-DD HH24:MI:SS.MS"))\
@@ -1548,6 +1722,7 @@ class Scheduler(object):
                 A tuple of Task attributes to sort by.
                 Defaults to ("start_time", "desc")
         """
+        await self._write_tasks()
         chain_payload = PayloadBuilder().SELECT("id", "process_name", "schedule_name", "state", "start_time", "end_time", "reason", "exit_code") \
             .ALIAS("return", ("start_time", 'start_time'), ("end_time", 'end_time'))\
             .FORMAT("return", ("start_time", "YYYY-MM-DD HH24:MI:SS.MS"), ("end_time", "YYYY-MM-DD HH24:MI:SS.MS"))\
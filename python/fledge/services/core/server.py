@@ -41,6 +41,7 @@ from fledge.services.core.service_registry.service_registry import ServiceRegist
 from fledge.services.core.service_registry import exceptions as service_registry_exceptions
 from fledge.services.core.interest_registry.interest_registry import InterestRegistry
 from fledge.services.core.interest_registry import exceptions as interest_registry_exceptions
+from fledge.services.core.interest_registry import change_callback
 from fledge.services.core.scheduler.scheduler import Scheduler
 from fledge.services.core.service_registry.monitor import Monitor
 from fledge.services.common.service_announcer import ServiceAnnouncer
@@ -336,6 +337,53 @@ class Server:
             'order': '1',
             'minimum': '1',
             'maximum': '1000'
+        },
+        'cacheTTL': {
+            'description': 'Seconds a category is served from the Core Configuration Manager cache before it is read '
+                           'again from storage, 0 for no expiry',
+            'type': 'integer',
+            'displayName': 'Cache TTL (seconds)',
+            'default': '0',
+            'order': '2',
+            'minimum': '0'
+        },
+        'cacheMemoryLimit': {
+            'description': 'Approximate memory held by the categories in the Core Configuration Manager cache, '
+                           'in KB, 0 for no limit',
+            'type': 'integer',
+            'displayName': 'Cache Memory Limit (KB)',
+            'default': '0',
+            'order': '3',
+            'minimum': '0'
+        }
+    }
+
+    _STORAGE_CLIENT_DEFAULT_CONFIG = {
+        'connectionLimit': {
+            'description': 'Maximum number of simultaneous connections of the Core to the Storage service, 0 for '
+                           'no limit',
+            'type': 'integer',
+            'displayName': 'Connection Limit',
+            'default': '100',
+            'order': '1',
+            'minimum': '0'
+        },
+        'connectionLimitPerHost': {
+            'description': 'Maximum number of simultaneous connections of the Core to the same storage endpoint, '
+                           '0 for no limit',
+            'type': 'integer',
+            'displayName': 'Connection Limit Per Host',
+            'default': '0',
+            'order': '2',
+            'minimum': '0'
+        },
+        'keepaliveTimeout': {
+            'description': 'Seconds an idle connection to the Storage service is kept open for reuse',
+            'type': 'float',
+            'displayName': 'Keepalive Timeout (seconds)',
+            'default': '30',
+            'order': '3',
+            'minimum': '1'
         }
     }
 
@@ -748,6 +796,31 @@ class Server:
                     default_cache_size))
                 cache_size = default_cache_size
             cls._configuration_manager._cacheManager.max_cache_size = cache_size
+            if 'cacheTTL' in config:
+                cls._configuration_manager._cacheManager.ttl = int(config['cacheTTL']['value'])
+            if 'cacheMemoryLimit' in config:
+                cls._configuration_manager._cacheManager.max_cache_bytes = int(
+                    config['cacheMemoryLimit']['value']) * 1024
+        except Exception as ex:
+            _logger.exception(ex)
+            raise
+
+    @classmethod
+    async def storage_client_setup(cls):
+        """ Connection pool of the storage client category """
+        try:
+            if cls._configuration_manager is None:
+                cls._configuration_manager = ConfigurationManager(cls._storage_client_async)
+
+            config = cls._STORAGE_CLIENT_DEFAULT_CONFIG
+            category = 'STORAGE_CLIENT'
+            description = "Connection pool of the Core to the Storage service"
+            await cls._configuration_manager.create_category(category, config, description, True,
+                                                             display_name='Storage Client')
+            config = await cls._configuration_manager.get_category_all_items(category)
+            StorageClientAsync.session_pool.configure(limit=int(config['connectionLimit']['value']),
+                                                      limit_per_host=int(config['connectionLimitPerHost']['value']),
+                                                      keepalive_timeout=float(config['keepaliveTimeout']['value']))
         except Exception as ex:
             _logger.exception(ex)
             raise
@@ -998,7 +1071,8 @@ class Server:
         try:
             await cls._configuration_manager.create_category("Advanced", {}, 'Advanced', True)
             await cls._configuration_manager.create_child_category("Advanced", ["SMNTR", "SCHEDULER", "LOGGING", "RESOURCE_LIMIT",
-                                                                                "CONFIGURATION","FEATURES"])
+                                                                                "CONFIGURATION", "STORAGE_CLIENT",
+                                                                                "FEATURES"])
         except KeyError:
             _logger.error('Failed to create Advanced parent configuration category for service')
             raise
@@ -1050,6 +1124,7 @@ class Server:
 
             # Configuration Manager setup
             loop.run_until_complete(cls.setup_config_manager())
+            loop.run_until_complete(cls.storage_client_setup())
 
             # Logging category
             loop.run_until_complete(cls.core_logger_setup())
@@ -1228,10 +1303,19 @@ class Server:
             cls._audit = AuditLogger(cls._storage_client_async)
             audit_msg = {"message": "Exited from safe mode"} if cls.running_in_safe_mode else None
             await cls._audit.information('FSTOP', audit_msg)
+            await cls._audit.flush()
+            # and the token expiry refreshes not written yet
+            await User.Objects.write_token_expiry()
 
             # stop storage
             await cls.stop_storage()
 
+            # close the keep-alive connections to the storage service
+            await StorageClientAsync.session_pool.close()
+
+            # close the keep-alive connections used to notify microservices of configuration changes
+            await change_callback.close()
+
             # stop core management api
             # loop.stop does it all
 
@@ -1441,7 +1525,7 @@ class Server:
                 try:
                     if not cls._storage_client_async is None:
                         cls._audit = AuditLogger(cls._storage_client_async)
-                        await cls._audit.information('SRVRG', {'name': service_name})
+                        await cls._audit.information('SRVRG', {'name': service_name}, wait=True)
                 except Exception as ex:
                     _logger.info("Failed to audit registration: %s", str(ex))
             except service_registry_exceptions.AlreadyExistsWithTheSameName:
@@ -1512,7 +1596,7 @@ class Server:
             if cls._storage_client_async is not None and services[0]._name not in ("Fledge Storage", "Fledge Core"):
                 try:
                     cls._audit = AuditLogger(cls._storage_client_async)
-                    await cls._audit.information('SRVUN', {'name': services[0]._name})
+                    await cls._audit.information('SRVUN', {'name': services[0]._name}, wait=True)
                 except Exception as ex:
                     _logger.exception(ex)
 
@@ -1540,7 +1624,7 @@ class Server:
             if cls._storage_client_async is not None and services[0]._name not in ("Fledge Storage", "Fledge Core"):
                 try:
                     cls._audit = AuditLogger(cls._storage_client_async)
-                    await cls._audit.information('SRVRS', {'name': services[0]._name})
+                    await cls._audit.information('SRVRS', {'name': services[0]._name}, wait=True)
                 except Exception as ex:
                     _logger.exception(ex)
                 """ Special Case:
@@ -1912,25 +1996,25 @@ class Server:
 
         data = await request.json()
 
-        if not isinstance(data, dict):
-            raise ValueError('Data payload must be a dictionary')
+        if isinstance(data, list):
+            # Batch of events: a failed event does not fail the others, it is returned in "failed"
+            results = []
+            failed = []
+            for event in data:
+                try:
+                    if not isinstance(event, dict):
+                        raise TypeError('Event must be a dictionary')
+                    results.append(await cls._add_track_record(event))
+                except Exception as ex:
+                    _logger.warning("Failed to add asset tracker event %s: %s", event, str(ex))
+                    failed.append(event)
+            return web.json_response({"track": results, "failed": failed})
 
-        jsondata = data.get("data")
+        if not isinstance(data, dict):
+            raise ValueError('Data payload must be a dictionary or a list of dictionaries')
 
         try:
-            if jsondata is None:
-
-                result = await cls._asset_tracker.add_asset_record(asset=data.get("asset"),
-                                                                   plugin=data.get("plugin"),
-                                                                   service=data.get("service"),
-                                                                   event=data.get("event"))
-            else:
-                result = await cls._asset_tracker.add_asset_record(asset=data.get("asset"),
-                                                                   plugin=data.get("plugin"),
-                                                                   service=data.get("service"),
-                                                                   event=data.get("event"),
-                                                                   jsondata=data.get("data"))
-
+            result = await cls._add_track_record(data)
         except (TypeError, StorageServerError) as ex:
             raise web.HTTPBadRequest(reason=str(ex))
         except ValueError as ex:
@@ -1940,6 +2024,21 @@ class Server:
 
         return web.json_response(result)
 
+    @classmethod
+    async def _add_track_record(cls, data):
+        jsondata = data.get("data")
+
+        if jsondata is None:
+            return await cls._asset_tracker.add_asset_record(asset=data.get("asset"),
+                                                             plugin=data.get("plugin"),
+                                                             service=data.get("service"),
+                                                             event=data.get("event"))
+        return await cls._asset_tracker.add_asset_record(asset=data.get("asset"),
+                                                         plugin=data.get("plugin"),
+                                                         service=data.get("service"),
+                                                         event=data.get("event"),
+                                                         jsondata=jsondata)
+
     @classmethod
     async def enable_disable_schedule(cls, request: web.Request) -> web.Response:
         data = await request.json()
@@ -2041,7 +2140,7 @@ class Server:
             message = data.get("details")
 
             # Add audit entry code and message for the given level
-            await getattr(cls._audit, str(level).lower())(code, message)
+            await getattr(cls._audit, str(level).lower())(code, message, wait=True)
 
             # Set timestamp for return message
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
@@ -9,7 +9,10 @@
 import asyncio
 import aiohttp
 import json
+import random
+import time
 from fledge.common import logger
+from fledge.common.web.session_pool import SessionPool
 from fledge.common.audit_logger import AuditLogger
 from fledge.common.configuration_manager import ConfigurationManager
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
@@ -36,6 +39,12 @@ class Monitor(object):
     _DEFAULT_RESTART_FAILED = "auto"
     """Restart failed microservice - manual/auto"""
 
+    _DEFAULT_MAX_CONCURRENT_CHECKS = 20
+    """Maximum number of services pinged at the same time"""
+
+    _DEFAULT_JITTER = 10
+    """Spread of the health checks of the services over a round, as a percentage of the sleep interval"""
+
     _logger = None
 
     def __init__(self):
@@ -51,6 +60,18 @@ class Monitor(object):
         """Number of max attempts for finding a heartbeat of service"""
         self._restart_failed = None  # type: str
         """Restart failed microservice - manual/auto"""
+        self._max_concurrent_checks = None  # type: int
+        """Maximum number of services pinged at the same time"""
+        self._jitter = None  # type: int
+        """Spread of the health checks of the services over a round, as a percentage of the sleep interval"""
+        self._session_pool = None  # type: SessionPool
+        """Keep-alive session shared by the health checks"""
+        self._check_semaphore = None  # type: asyncio.Semaphore
+        """Bounds the number of health checks in flight"""
+        self._check_offsets = {}
+        """service id: delay of its health check from the start of a round, in seconds"""
+        self._round_metrics = {"rounds": 0, "servicesChecked": 0, "unresponsive": 0, "lastRoundDuration": 0.0,
+                               "maxRoundDuration": 0.0, "averageRoundDuration": 0.0}
 
         self.restarted_services = []
         self._acl_handler = None
@@ -65,92 +86,165 @@ class Monitor(object):
         check_count = {}  # dict to hold current count of current status.
                           # In case of ok and running status, count will always be 1.
                           # In case of of non running statuses, count shows since when this status is set.
-        while True:
-            round_cnt += 1
-            self._logger.debug("Starting next round#{} of service monitoring, sleep/i:{} ping/t:{} max/a:{}".format(
-                round_cnt, self._sleep_interval, self._ping_timeout, self._max_attempts))
-            for service_record in ServiceRegistry.all():
-                if service_record._id not in check_count:
-                    check_count.update({service_record._id: 1})
-
-                # Try ping if service status is either running or doubtful (i.e. give service a chance to recover)
-                if service_record._status not in [ServiceRecord.Status.Running,
-                                                  ServiceRecord.Status.Unresponsive,
-                                                  ServiceRecord.Status.Failed,
-                                                  ServiceRecord.Status.Restart]:
-                    continue
-
-                self._logger.debug("Service: {} Status: {}".format(service_record._name, service_record._status))
-
-                if service_record._status == ServiceRecord.Status.Failed:
-                    if self._restart_failed == "auto":
-                        if service_record._id not in self.restarted_services:
-                            self.restarted_services.append(service_record._id)
-                            asyncio.ensure_future(self.restart_service(service_record))
-                    continue
-
-                if service_record._status == ServiceRecord.Status.Restart:
-                     if service_record._id not in self.restarted_services:
-                         self.restarted_services.append(service_record._id)
-                         asyncio.ensure_future(self.restart_service(service_record))
-                     continue
-
-                try:
-                    url = "{}://{}:{}/fledge/service/ping".format(
-                        service_record._protocol, service_record._address, service_record._management_port)
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url, timeout=self._ping_timeout) as resp:
-                            text = await resp.text()
-                            res = json.loads(text)
-                            if res["uptime"] is None:
-                                raise ValueError('res.uptime is None')
-                            # Set the 'debug' status for non-empty values, applicable only to
-                            # Southbound and Northbound services
-                            if service_record._type in ('Southbound', 'Northbound'):
-                                debugger_value = res.get("debug", {})
-                                if not isinstance(debugger_value, dict):
-                                    self._logger.warning("Invalid debug value '{}' in service '{}': "
-                                                       "Expected a dictionary, but received a {}.".format(
-                                        debugger_value, service_record._name, type(debugger_value).__name__))
-                                    debugger_value = {}
-                                service_record._debug = debugger_value
-                except (asyncio.TimeoutError, aiohttp.client_exceptions.ServerTimeoutError) as ex:
-                    service_record._status = ServiceRecord.Status.Unresponsive
-                    check_count[service_record._id] += 1
-                    self._logger.info("ServerTimeoutError: %s, %s", str(ex), service_record.__repr__())
-                except aiohttp.client_exceptions.ClientConnectorError as ex:
-                    service_record._status = ServiceRecord.Status.Unresponsive
-                    check_count[service_record._id] += 1
-                    self._logger.info("ClientConnectorError: %s, %s", str(ex), service_record.__repr__())
-                except ValueError as ex:
-                    service_record._status = ServiceRecord.Status.Unresponsive
-                    check_count[service_record._id] += 1
-                    self._logger.info("Invalid response: %s, %s", str(ex), service_record.__repr__())
-                except Exception as ex:
-                    service_record._status = ServiceRecord.Status.Unresponsive
-                    check_count[service_record._id] += 1
-                    self._logger.info("Exception occurred: %s, %s", str(ex), service_record.__repr__())
-                else:
-                    service_record._status = ServiceRecord.Status.Running
-
-                    self._logger.debug("Resolving pending notification for ACL change "
-                                       "for service {} ".format(service_record._name))
-                    if not self._acl_handler:
-                        self._acl_handler = ACLManager(connect.get_storage_async())
-                    await self._acl_handler.\
-                        resolve_pending_notification_for_acl_change(service_record._name)
-
-                    check_count[service_record._id] = 1
-
-                if check_count[service_record._id] > self._max_attempts:
-                    ServiceRegistry.mark_as_failed(service_record._id)
-                    check_count[service_record._id] = 0
-                    try:
-                        audit = AuditLogger(connect.get_storage_async())
-                        await audit.failure('SRVFL', {'name':service_record._name})
-                    except Exception as ex:
-                        self._logger.info("Failed to audit service failure %s", str(ex))
-            await self._sleep(self._sleep_interval)
+        max_concurrent_checks = self._max_concurrent_checks or self._DEFAULT_MAX_CONCURRENT_CHECKS
+        self._session_pool = SessionPool(limit=max_concurrent_checks)
+        self._check_semaphore = asyncio.Semaphore(max_concurrent_checks)
+        try:
+            while True:
+                round_cnt += 1
+                self._logger.debug("Starting next round#{} of service monitoring, sleep/i:{} ping/t:{} max/a:{}".format(
+                    round_cnt, self._sleep_interval, self._ping_timeout, self._max_attempts))
+                round_start = time.monotonic()
+                checks = []
+                for service_record in ServiceRegistry.all():
+                    if service_record._id not in check_count:
+                        check_count.update({service_record._id: 1})
+
+                    # Try ping if service status is either running or doubtful (i.e. give service a chance to recover)
+                    if service_record._status not in [ServiceRecord.Status.Running,
+                                                      ServiceRecord.Status.Unresponsive,
+                                                      ServiceRecord.Status.Failed,
+                                                      ServiceRecord.Status.Restart]:
+                        continue
+
+                    self._logger.debug("Service: {} Status: {}".format(service_record._name, service_record._status))
+
+                    if service_record._status == ServiceRecord.Status.Failed:
+                        if self._restart_failed == "auto":
+                            if service_record._id not in self.restarted_services:
+                                self.restarted_services.append(service_record._id)
+                                asyncio.ensure_future(self.restart_service(service_record))
+                        continue
+
+                    if service_record._status == ServiceRecord.Status.Restart:
+                         if service_record._id not in self.restarted_services:
+                             self.restarted_services.append(service_record._id)
+                             asyncio.ensure_future(self.restart_service(service_record))
+                         continue
+
+                    checks.append(self._check_service(service_record, check_count))
+
+                # Services are checked concurrently, an unresponsive service does not delay the others
+                results = await asyncio.gather(*checks)
+                round_duration = self._update_round_metrics(round_start, results)
+                # Keep the start of the rounds sleep_interval apart, whatever the duration of the round
+                await self._sleep(max(0, self._sleep_interval - round_duration))
+        finally:
+            await self._session_pool.close()
+
+    async def _check_service(self, service_record, check_count):
+        """Pings a service and updates its status
+
+        Returns:
+            True if the service responded, False otherwise
+        """
+        offset = self._check_offset(service_record)
+        if offset:
+            await asyncio.sleep(offset)
+        async with self._check_semaphore:
+            responsive = await self._ping_service(service_record, check_count)
+
+        if check_count[service_record._id] > self._max_attempts:
+            ServiceRegistry.mark_as_failed(service_record._id)
+            check_count[service_record._id] = 0
+            try:
+                audit = AuditLogger(connect.get_storage_async())
+                await audit.failure('SRVFL', {'name':service_record._name}, wait=True)
+            except Exception as ex:
+                self._logger.info("Failed to audit service failure %s", str(ex))
+        return responsive
+
+    async def _ping_service(self, service_record, check_count):
+        try:
+            url = "{}://{}:{}/fledge/service/ping".format(
+                service_record._protocol, service_record._address, service_record._management_port)
+            session = self._session_pool.get_session()
+            async with session.get(url, timeout=self._ping_timeout) as resp:
+                text = await resp.text()
+                res = json.loads(text)
+                if res["uptime"] is None:
+                    raise ValueError('res.uptime is None')
+                # Set the 'debug' status for non-empty values, applicable only to
+                # Southbound and Northbound services
+                if service_record._type in ('Southbound', 'Northbound'):
+                    debugger_value = res.get("debug", {})
+                    if not isinstance(debugger_value, dict):
+                        self._logger.warning("Invalid debug value '{}' in service '{}': "
+                                           "Expected a dictionary, but received a {}.".format(
+                            debugger_value, service_record._name, type(debugger_value).__name__))
+                        debugger_value = {}
+                    service_record._debug = debugger_value
+        except (asyncio.TimeoutError, aiohttp.client_exceptions.ServerTimeoutError) as ex:
+            service_record._status = ServiceRecord.Status.Unresponsive
+            check_count[service_record._id] += 1
+            self._logger.info("ServerTimeoutError: %s, %s", str(ex), service_record.__repr__())
+        except aiohttp.client_exceptions.ClientConnectorError as ex:
+            service_record._status = ServiceRecord.Status.Unresponsive
+            check_count[service_record._id] += 1
+            self._logger.info("ClientConnectorError: %s, %s", str(ex), service_record.__repr__())
+        except ValueError as ex:
+            service_record._status = ServiceRecord.Status.Unresponsive
+            check_count[service_record._id] += 1
+            self._logger.info("Invalid response: %s, %s", str(ex), service_record.__repr__())
+        except Exception as ex:
+            service_record._status = ServiceRecord.Status.Unresponsive
+            check_count[service_record._id] += 1
+            self._logger.info("Exception occurred: %s, %s", str(ex), service_record.__repr__())
+        else:
+            service_record._status = ServiceRecord.Status.Running
+
+            self._logger.debug("Resolving pending notification for ACL change "
+                               "for service {} ".format(service_record._name))
+            if not self._acl_handler:
+                self._acl_handler = ACLManager(connect.get_storage_async())
+            await self._acl_handler.\
+                resolve_pending_notification_for_acl_change(service_record._name)
+
+            check_count[service_record._id] = 1
+            return True
+        return False
+
+    def _check_offset(self, service_record):
+        """Delay of the health check of a service from the start of a round
+
+        Each service keeps the random offset it was given on its first check, so that it is checked every
+        sleep_interval while the checks of all the services are spread over the first jitter percent of the round
+        """
+        if not self._jitter or not self._sleep_interval:
+            return 0
+        offset = self._check_offsets.get(service_record._id)
+        if offset is None:
+            offset = random.uniform(0, self._sleep_interval * self._jitter / 100)
+            self._check_offsets[service_record._id] = offset
+        return offset
+
+    def _update_round_metrics(self, round_start, results):
+        round_duration = time.monotonic() - round_start
+        metrics = self._round_metrics
+        metrics["rounds"] += 1
+        metrics["servicesChecked"] = len(results)
+        metrics["unresponsive"] = results.count(False)
+        metrics["lastRoundDuration"] = round(round_duration, 6)
+        metrics["maxRoundDuration"] = max(metrics["maxRoundDuration"], metrics["lastRoundDuration"])
+        metrics["averageRoundDuration"] = round(
+            metrics["averageRoundDuration"] + (round_duration - metrics["averageRoundDuration"]) / metrics["rounds"],
+            6)
+        # Forget the offsets of the services that are gone
+        if len(self._check_offsets) > len(results):
+            registered = {service_record._id for service_record in ServiceRegistry.all()}
+            self._check_offsets = {k: v for k, v in self._check_offsets.items() if k in registered}
+        self._logger.debug("Service monitoring round#{} checked {} services in {:.3f}s".format(
+            metrics["rounds"], len(results), round_duration))
+        return round_duration
+
+    def metrics(self):
+        """Health check round metrics
+
+        Returns:
+            dict with the number of rounds, the number of services checked and found unresponsive in the last round,
+            and the last, maximum and average round duration in seconds
+        """
+        return dict(self._round_metrics)
 
     async def _read_config(self):
         """Reads configuration"""
@@ -183,6 +277,22 @@ class Monitor(object):
                 'options': ['auto', 'manual'],
                 "default": self._DEFAULT_RESTART_FAILED,
                 "displayName": "Restart Failed"
+            },
+            "max_concurrent_checks": {
+                "description": "Maximum number of services pinged at the same time",
+                "type": "integer",
+                "default": str(self._DEFAULT_MAX_CONCURRENT_CHECKS),
+                "displayName": "Max Concurrent Health Checks",
+                "minimum": "1"
+            },
+            "jitter": {
+                "description": "Spread of the health checks of the services over the health check interval, "
+                               "as a percentage of the interval",
+                "type": "integer",
+                "default": str(self._DEFAULT_JITTER),
+                "displayName": "Health Check Jitter (%)",
+                "minimum": "0",
+                "maximum": "50"
             }
         }
 
@@ -196,6 +306,8 @@ class Monitor(object):
         self._ping_timeout = int(config['ping_timeout']['value'])
         self._max_attempts = int(config['max_attempts']['value'])
         self._restart_failed = config['restart_failed']['value']
+        self._max_concurrent_checks = int(config['max_concurrent_checks']['value'])
+        self._jitter = int(config['jitter']['value'])
 
     async def restart_service(self, service_record):
         from fledge.services.core import server  # To avoid cyclic import as server also imports monitor
@@ -25,6 +25,12 @@ class ServiceRegistry:
 
     _registry = list()
 
+    _INDEXED_ATTRIBUTES = ('_id', '_name', '_type')
+
+    # Secondary indexes of _registry, {attribute: {value: [service records in registration order]}}, with the
+    # address and port pairs indexed under ('_address', '_port') and ('_address', '_management_port')
+    _indexes = dict()
+
     # Startup tokens to pass to service or tasks being started
     _startupTokens = dict()
 
@@ -112,6 +118,7 @@ class ServiceRegistry:
 
         service_id = str(uuid.uuid4()) if new_service is True else current_service_id
         registered_service = ServiceRecord(service_id, name, s_type, protocol, address, port, management_port)
+        cls._add_to_indexes(registered_service)
         cls._registry.append(registered_service)
         cls._logger.info("Registered {}".format(str(registered_service)))
 
@@ -187,6 +194,7 @@ class ServiceRegistry:
         :param service_id: a uuid of registered service
         """
         services = cls.get(idx=service_id)
+        cls._remove_from_indexes(services[0])
         cls._registry.remove(services[0])
 
     @classmethod
@@ -207,13 +215,51 @@ class ServiceRegistry:
     def all(cls):
         return cls._registry
 
+    @classmethod
+    def reset(cls):
+        """ removes all the services and their indexes """
+        cls._registry = list()
+        cls._indexes = dict()
+
+    @classmethod
+    def _index_keys(cls, service):
+        for attribute in cls._INDEXED_ATTRIBUTES:
+            yield attribute, getattr(service, attribute)
+        yield ('_address', '_port'), (service._address, service._port)
+        yield ('_address', '_management_port'), (service._address, service._management_port)
+
+    @classmethod
+    def _add_to_indexes(cls, service):
+        for attribute, value in cls._index_keys(service):
+            cls._indexes.setdefault(attribute, dict()).setdefault(value, []).append(service)
+
+    @classmethod
+    def _remove_from_indexes(cls, service):
+        for attribute, value in cls._index_keys(service):
+            services = cls._indexes[attribute][value]
+            services.remove(service)
+            if not services:
+                del cls._indexes[attribute][value]
+
+    @classmethod
+    def _lookup(cls, attribute, value):
+        """ Service records whose attribute equals value, in registration order """
+        try:
+            return list(cls._indexes.get(attribute, {}).get(value, ()))
+        except TypeError:
+            # unhashable value, it can not match any indexed one
+            return []
+
     @classmethod
     def filter(cls, **kwargs):
         # OR based filter
         services = cls._registry
         for k, v in kwargs.items():
             if v:
-                services = [s for s in cls._registry if getattr(s, k, None) == v]
+                if k in cls._INDEXED_ATTRIBUTES:
+                    services = cls._lookup(k, v)
+                else:
+                    services = [s for s in cls._registry if getattr(s, k, None) == v]
         return services
 
     @classmethod
@@ -226,8 +272,8 @@ class ServiceRegistry:
     @classmethod
     def check_address_and_port(cls, address, port):
         # AND based check
-        # ugly hack! <Make filter to support AND | OR>
-        services = [s for s in cls._registry if getattr(s, "_address") == address and getattr(s, "_port") == port and getattr(s, "_status") != ServiceRecord.Status.Failed]
+        services = [s for s in cls._lookup(('_address', '_port'), (address, port))
+                    if s._status != ServiceRecord.Status.Failed]
         if len(services) == 0:
             return False
         return True
@@ -235,9 +281,8 @@ class ServiceRegistry:
     @classmethod
     def check_address_and_mgt_port(cls, address, m_port):
         # AND based check
-        # ugly hack! <Make filter to support AND | OR>
-        services = [s for s in cls._registry if getattr(s, "_address") == address
-                    and getattr(s, "_management_port") == m_port and getattr(s, "_status") != ServiceRecord.Status.Failed]
+        services = [s for s in cls._lookup(('_address', '_management_port'), (address, m_port))
+                    if s._status != ServiceRecord.Status.Failed]
         if len(services) == 0:
             return False
         return True
@@ -245,8 +290,7 @@ class ServiceRegistry:
     @classmethod
     def filter_by_name_and_type(cls, name, s_type):
         # AND based check
-        # ugly hack! <Make filter to support AND | OR>
-        services = [s for s in cls._registry if getattr(s, "_name") == name and getattr(s, "_type") == s_type]
+        services = [s for s in cls._lookup('_name', name) if s._type == s_type]
         if len(services) == 0:
             raise service_registry_exceptions.DoesNotExist
         return services
@@ -5,8 +5,10 @@
 # FLEDGE_END
 
 """Fledge user entity class with CRUD operations to Storage layer"""
+import asyncio
 import os
 import json
+import time
 import uuid
 import hashlib
 from datetime import datetime, timedelta, timezone
@@ -33,6 +35,8 @@ ERROR_MSG = 'Something went wrong'
 USED_PASSWORD_HISTORY_COUNT = 3
 HASH_PWD_ALGORITHM = 'SHA512'
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+AUTH_CACHE_TTL_SECONDS = 30
+TOKEN_EXPIRY_WRITE_INTERVAL_SECONDS = 15
 _logger = FLCoreLogger().get_logger(__name__)
 
 
@@ -90,10 +94,14 @@ class User:
 
         @classmethod
         async def get_role_id_by_name(cls, name):
-            storage_client = connect.get_storage_async()
-            payload = PayloadBuilder().SELECT("id").WHERE(['name', '=', name]).payload()
-            result = await storage_client.query_tbl_with_payload('roles', payload)
-            return result["rows"]
+            rows = User.Cache.lookup(User.Cache.roles, name)
+            if rows is None:
+                storage_client = connect.get_storage_async()
+                payload = PayloadBuilder().SELECT("id").WHERE(['name', '=', name]).payload()
+                result = await storage_client.query_tbl_with_payload('roles', payload)
+                rows = result["rows"]
+                User.Cache.store(User.Cache.roles, name, rows)
+            return [dict(row) for row in rows]
 
         @classmethod
         async def get_role_name_by_id(cls, rid):
@@ -235,6 +243,7 @@ class User:
                 payload = PayloadBuilder().SET(**new_kwargs).WHERE(['id', '=', user_id]).AND_WHERE(
                     ['enabled', '=', 't']).payload()
                 result = await storage_client.update_tbl("users", payload)
+                User.Cache.invalidate_user(user_id)
                 if result['rows_affected']:
                     # FIXME: FOGL-1226 active session delete only in case of role_id and password updation
                     if 'password' in user_data or 'role_id' in user_data:
@@ -303,6 +312,10 @@ class User:
 
         @classmethod
         async def get(cls, uid=None, username=None):
+            if uid is not None and username is None:
+                user = User.Cache.lookup(User.Cache.users, str(uid))
+                if user is not None:
+                    return dict(user)
             users = await cls.filter(uid=uid, username=username)
             if len(users) == 0:
                 msg = ''
@@ -314,16 +327,47 @@ class User:
                     msg = "User with id:<{}> and name:<{}> does not exist".format(uid, username)
 
                 raise User.DoesNotExist(msg)
+            if uid is not None and username is None:
+                User.Cache.store(User.Cache.users, str(uid), dict(users[0]))
             return users[0]
 
         @classmethod
         async def refresh_token_expiry(cls, token):
-            storage_client = connect.get_storage_async()
+            """ Extends the token expiry, the new expiry is written to storage with the next
+                :meth:`write_token_expiry` """
             exp = datetime.now() + timedelta(seconds=JWT_EXP_DELTA_SECONDS)
+            login = User.Cache.lookup(User.Cache.tokens, token)
+            if login is not None:
+                login['token_expiration'] = exp.strftime(DATE_FORMAT)
+            User.Cache.token_expiry[token] = str(exp)
+            if User.Cache.write_task is None:
+                User.Cache.write_task = asyncio.ensure_future(cls._write_token_expiry_later())
+
+        @classmethod
+        async def _write_token_expiry_later(cls):
+            try:
+                await asyncio.sleep(TOKEN_EXPIRY_WRITE_INTERVAL_SECONDS)
+            finally:
+                User.Cache.write_task = None
+            await cls.write_token_expiry()
+
+        @classmethod
+        async def write_token_expiry(cls):
+            """ Writes the token expiry refreshes queued by :meth:`refresh_token_expiry` with one update """
+            token_expiry, User.Cache.token_expiry = User.Cache.token_expiry, {}
+            if not token_expiry:
+                return
             """ MODIFIER with allowzero is passed in payload so that storage returns rows_affected 0 in any case """
-            payload = PayloadBuilder().SET(token_expiration=str(exp)).WHERE(['token', '=', token]
-                                                                            ).MODIFIER(["allowzero"]).payload()
-            await storage_client.update_tbl("user_logins", payload)
+            payload = {"updates": [json.loads(PayloadBuilder().SET(token_expiration=exp).WHERE(
+                ['token', '=', token]).MODIFIER(["allowzero"]).payload()) for token, exp in token_expiry.items()]}
+            storage_client = connect.get_storage_async()
+            try:
+                await storage_client.update_tbl("user_logins", payload)
+            except Exception as ex:
+                _logger.error(ex, "Failed to refresh the expiry of {} tokens.".format(len(token_expiry)))
+                # Keep them for the next write, unless refreshed again meanwhile
+                for token, exp in token_expiry.items():
+                    User.Cache.token_expiry.setdefault(token, exp)
 
         @classmethod
         async def validate_token(cls, token):
@@ -333,6 +377,11 @@ class User:
             :param token:
             :return:
             """
+            login = User.Cache.lookup(User.Cache.tokens, token)
+            if login is not None:
+                cls._check_token_expiry(login['token_expiration'])
+                return login['uid']
+
             storage_client = connect.get_storage_async()
             payload = PayloadBuilder().SELECT("token_expiration") \
                 .ALIAS("return", ("token_expiration", 'token_expiration')) \
@@ -345,17 +394,23 @@ class User:
 
             r = result['rows'][0]
             token_expiry = r["token_expiration"]
-            curr_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
-            diff = datetime.strptime(token_expiry, DATE_FORMAT) - datetime.strptime(curr_time, DATE_FORMAT)
-            if diff.seconds < 0:
-                raise User.TokenExpired("The token has expired, login again")
+            cls._check_token_expiry(token_expiry)
 
             # verification of expiry set to false,
             # as we want to refresh token on each successful request
             # and extend it to keep session alive
             user_payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM], options={'verify_exp': False})
+            User.Cache.store(User.Cache.tokens, token,
+                             {'uid': user_payload["uid"], 'token_expiration': token_expiry})
             return user_payload["uid"]
 
+        @classmethod
+        def _check_token_expiry(cls, token_expiry):
+            curr_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+            diff = datetime.strptime(token_expiry, DATE_FORMAT) - datetime.strptime(curr_time, DATE_FORMAT)
+            if diff.seconds < 0:
+                raise User.TokenExpired("The token has expired, login again")
+
         @classmethod
         async def login(cls, username, password, host):
             """
@@ -547,6 +602,7 @@ class User:
                 raise ValueError(ERROR_MSG)
             # Remove user session on basis of user id
             await User.Sessions.remove(data={"uid": user_id})
+            User.Cache.invalidate_user(user_id)
             return res
 
         @classmethod
@@ -561,6 +617,7 @@ class User:
                 raise ValueError(ERROR_MSG)
             # Remove user session on basis of token
             await User.Sessions.remove(data={"token": token})
+            User.Cache.invalidate_token(token)
             return res
 
         @classmethod
@@ -569,6 +626,7 @@ class User:
             await storage_client.delete_from_tbl("user_logins")
             # Clear all user sessions
             await User.Sessions.clear()
+            User.Cache.clear()
 
         @classmethod
         def hash_password(cls, password, algorithm):
@@ -669,3 +727,72 @@ class User:
             from fledge.services.core import server
             server.Server._user_sessions = []
 
+    class Cache:
+        """ In-memory copies of the user_logins, users and roles rows looked up to authenticate each request
+
+        Entries are kept for AUTH_CACHE_TTL_SECONDS, those of a user are dropped as soon as the user logs out or
+        is changed: password, role, enabled... Expired entries that are not looked up again, e.g. the tokens of the
+        clients gone away, are swept at most every AUTH_CACHE_TTL_SECONDS on the next store.
+        """
+
+        tokens = {}
+        """ token: (expiry, {'uid', 'token_expiration'}) """
+
+        users = {}
+        """ str(user id): (expiry, users row) """
+
+        roles = {}
+        """ role name: (expiry, roles rows) """
+
+        token_expiry = {}
+        """ token: new token_expiration to write to user_logins """
+
+        write_task = None
+        """ asyncio task writing token_expiry, if scheduled """
+
+        next_sweep = 0
+        """ time.monotonic() after which the next store sweeps the expired entries """
+
+        @classmethod
+        def lookup(cls, entries, key):
+            try:
+                expiry, value = entries[key]
+            except KeyError:
+                return None
+            if expiry < time.monotonic():
+                del entries[key]
+                return None
+            return value
+
+        @classmethod
+        def store(cls, entries, key, value):
+            now = time.monotonic()
+            if now >= cls.next_sweep:
+                cls.sweep(now)
+            entries[key] = (now + AUTH_CACHE_TTL_SECONDS, value)
+
+        @classmethod
+        def sweep(cls, now):
+            for entries in (cls.tokens, cls.users, cls.roles):
+                for key in [key for key, (expiry, _) in entries.items() if expiry < now]:
+                    del entries[key]
+            cls.next_sweep = now + AUTH_CACHE_TTL_SECONDS
+
+        @classmethod
+        def invalidate_token(cls, token):
+            cls.tokens.pop(token, None)
+            cls.token_expiry.pop(token, None)
+
+        @classmethod
+        def invalidate_user(cls, user_id):
+            cls.users.pop(str(user_id), None)
+            for token in [token for token, (_, login) in cls.tokens.items() if str(login['uid']) == str(user_id)]:
+                del cls.tokens[token]
+
+        @classmethod
+        def clear(cls):
+            cls.tokens.clear()
+            cls.users.clear()
+            cls.roles.clear()
+            cls.token_expiry.clear()
+            cls.next_sweep = 0
@@ -9,12 +9,14 @@
 import asyncio
 import datetime
 import time
-from typing import List, Union
+from itertools import islice
+from typing import Dict, List, Set, Union
 import json
 
 from fledge.common import logger
 from fledge.common import statistics
 from fledge.common.storage_client.exceptions import StorageServerError
+from fledge.services.south.readings_buffer import ReadingsBuffer
 
 __author__ = "Terris Linenbach, Amarendra K Sinha"
 __copyright__ = "Copyright (c) 2017 OSIsoft, LLC"
@@ -32,7 +34,7 @@ class Ingest(object):
     """Adds sensor readings to Fledge
 
     Also tracks readings-related statistics.
-    Readings are added to a configurable list. Configurable batches of inserts are sent to storage
+    Readings are added to a ring buffer of configurable size. Configurable batches of inserts are sent to storage
     """
 
     # Class attributes
@@ -57,38 +59,35 @@ class Ingest(object):
     _started = False
     """True when the server has been started"""
 
-    _readings_lists = None  # type: List
-    """A list of readings lists. Each list contains the inputs to :meth:`add_readings`."""
-
-    _current_readings_list_index = 0
-    """Which readings list to insert into next"""
+    _readings_buffer = None  # type: ReadingsBuffer
+    """Ring buffer of the inputs to :meth:`add_readings`"""
 
     _insert_readings_tasks = None  # type: List[asyncio.Task]
-    """asyncio tasks for :meth:`_insert_readings`"""
-
-    _readings_list_batch_size_reached = None  # type: List[asyncio.Event]
-    """Fired when a readings list has reached _readings_insert_batch_size entries"""
-
-    _readings_list_not_empty = None  # type: List[asyncio.Event]
-    """Fired when a readings list transitions from empty to not empty"""
+    """asyncio tasks for :meth:`_insert_readings`, one per flush worker"""
 
-    _readings_lists_not_full = None  # type: asyncio.Event
-    """Fired when items are removed from any readings list"""
+    _readings_batch_size_reached = None  # type: asyncio.Event
+    """Fired when the pending readings have reached _readings_insert_batch_size entries"""
 
     _insert_readings_wait_tasks = None  # type: List[asyncio.Task]
-    """asyncio tasks blocking :meth:`_insert_readings` that can be canceled"""
+    """asyncio tasks blocking :meth:`_insert_readings` that can be canceled, one per flush worker"""
 
     _last_insert_time = 0  # type: int
     """epoch time of last insert"""
 
-    _readings_list_size = 0  # type: int
-    """Maximum number of readings items in each buffer"""
+    _write_statistics_task = None  # type: asyncio.Task
+    """asyncio task for :meth:`_write_statistics_loop`"""
+
+    _write_statistics_sleep_task = None  # type: asyncio.Task
+    """asyncio task sleeping between two writes of statistics, canceled on stop"""
+
+    _registered_stats_keys = set()  # type: Set[str]
+    """Statistics keys registered by this service, so that each key is registered once"""
 
     _readings_buffer_size = 4096
-    """Maximum number of readings to buffer in memory(_max_concurrent_readings_inserts x _readings_insert_batch_size)"""
+    """Maximum number of readings to buffer in memory, the capacity of the readings ring buffer"""
 
     _max_concurrent_readings_inserts = 4
-    """Maximum number of concurrent processes that send batches of readings to storage. Preferably in multiples of 2."""
+    """Number of flush workers sending batches of readings to storage in parallel. Preferably in multiples of 2."""
 
     _readings_insert_batch_size = 1024
     """Maximum number of readings in a batch of inserts. Preferably in multiples of 2."""
@@ -102,10 +101,37 @@ class Ingest(object):
     _max_readings_insert_batch_reconnect_wait_seconds = 10
     """The maximum number of seconds to wait before reconnecting to storage when inserting readings"""
 
+    _write_statistics_frequency_seconds = 5
+    """Number of seconds between two writes of the collected readings statistics to storage"""
+
     # Configuration (end)
 
-    _payload_events = []
-    """The list of unique reading payload for asset tracker"""
+    _ASSET_TRACKER_EVENT = "Ingest"
+    """Asset tracker event recorded for the assets ingested by this service"""
+
+    _tracked_asset_events = set()  # type: Set[tuple]
+    """Hashed (service, plugin, asset, event) index of the asset tracker events known to be registered"""
+
+    _asset_tracker_service = None  # type: str
+    """Service name of the asset tracker events of this service"""
+
+    _asset_tracker_plugin = None  # type: str
+    """Plugin name of the asset tracker events of this service"""
+
+    _pending_asset_events = []  # type: List[dict]
+    """Asset tracker events waiting to be registered by :meth:`_register_asset_tracker_events`"""
+
+    _register_asset_tracker_events_task = None  # type: asyncio.Task
+    """asyncio task for :meth:`_register_asset_tracker_events`"""
+
+    _ASSET_TRACKER_RETRY_SECONDS = 1
+    """Seconds before an asset tracker event that failed to register is queued again, doubled on each failure"""
+
+    _ASSET_TRACKER_MAX_RETRY_SECONDS = 60
+    """Maximum number of seconds before an asset tracker event that failed to register is queued again"""
+
+    _asset_event_retries = {}  # type: Dict[tuple, tuple]
+    """(service, plugin, asset, event): (monotonic time of the next attempt, delay) of the events that failed"""
 
     stats = None
     """Statistics class instance"""
@@ -158,6 +184,12 @@ class Ingest(object):
                 "type": "integer",
                 "default": str(cls._max_readings_insert_batch_reconnect_wait_seconds)
             },
+            "write_statistics_frequency_seconds": {
+                "description": "Number of seconds between two writes of the readings statistics to storage",
+                "displayName": "Statistics Write Interval",
+                "type": "integer",
+                "default": str(cls._write_statistics_frequency_seconds)
+            },
         }
 
         # Create configuration category and any new keys within it
@@ -191,8 +223,11 @@ class Ingest(object):
             ['value'])
         cls._max_readings_insert_batch_reconnect_wait_seconds = int(
             config['max_readings_insert_batch_reconnect_wait_seconds']['value'])
+        cls._write_statistics_frequency_seconds = int(config['write_statistics_frequency_seconds']['value'])
 
-        cls._payload_events = []
+        cls._tracked_asset_events = set()
+        cls._pending_asset_events = []
+        cls._asset_event_retries = {}
 
     @classmethod
     async def start(cls, parent):
@@ -211,36 +246,31 @@ class Ingest(object):
         # and cannot be a any value other than non zero integers.
         cls._readings_insert_batch_size = 1024 if not cls._readings_insert_batch_size else cls._readings_insert_batch_size
         cls._max_concurrent_readings_inserts = 4 if not cls._max_concurrent_readings_inserts else cls._max_concurrent_readings_inserts
+        cls._write_statistics_frequency_seconds = 5 if cls._write_statistics_frequency_seconds < 1 else cls._write_statistics_frequency_seconds
 
-        cls._readings_list_size = int(cls._readings_buffer_size / (
-            cls._max_concurrent_readings_inserts))
+        buffer_size = cls._readings_buffer_size
 
-        # Is the buffer size as configured big enough to support all of
-        # the buffers filled to the batch size? If not, increase
+        # Is the buffer size as configured big enough to give every flush worker a full batch? If not, increase
         # the buffer size.
-        if cls._readings_list_size < cls._readings_insert_batch_size:
-            cls._readings_list_size = cls._readings_insert_batch_size
+        if buffer_size < cls._readings_insert_batch_size * cls._max_concurrent_readings_inserts:
+            buffer_size = cls._readings_insert_batch_size * cls._max_concurrent_readings_inserts
 
             _LOGGER.warning('Readings buffer size as configured (%s) is too small; increasing '
-                            'to %s', cls._readings_buffer_size,
-                            cls._readings_list_size * cls._max_concurrent_readings_inserts)
+                            'to %s', cls._readings_buffer_size, buffer_size)
 
         cls._last_insert_time = 0
-        cls._insert_readings_wait_tasks = []
-        cls._readings_list_batch_size_reached = []
-        cls._readings_list_not_empty = []
-        cls._readings_lists = []
-
-        for _ in range(cls._max_concurrent_readings_inserts):
-            cls._readings_lists.append([])
-            cls._insert_readings_wait_tasks.append(None)
-            cls._readings_list_batch_size_reached.append(asyncio.Event())
-            cls._readings_list_not_empty.append(asyncio.Event())
-
-        cls._insert_readings_task = asyncio.ensure_future(cls._insert_readings())
-        cls._readings_lists_not_full = asyncio.Event()
-
-        cls._payload_events = cls._parent_service._core_microservice_management_client.get_asset_tracker_events()['track']
+        cls._readings_batch_size_reached = asyncio.Event()
+        cls._readings_buffer = ReadingsBuffer(buffer_size)
+        cls._insert_readings_wait_tasks = [None] * cls._max_concurrent_readings_inserts
+        cls._insert_readings_tasks = [asyncio.ensure_future(cls._insert_readings(worker_index))
+                                      for worker_index in range(cls._max_concurrent_readings_inserts)]
+
+        cls._asset_tracker_service = cls._parent_service._name
+        cls._asset_tracker_plugin = cls._parent_service._plugin_info['config']['plugin']['default']
+        track = cls._parent_service._core_microservice_management_client.get_asset_tracker_events()['track']
+        # Deprecated events are left out so that they are registered again, and hence restored, on the next reading
+        cls._tracked_asset_events = {(event['service'], event['plugin'], event['asset'], event['event'])
+                                     for event in track if not event.get('deprecatedTimestamp')}
 
         cls.stats = await statistics.create_statistics(cls.storage_async)
 
@@ -249,6 +279,8 @@ class Ingest(object):
         await cls.stats.register('DISCARDED', 'Readings discarded at the input side by Fledge, i.e. '
                                               'discarded before being placed in the buffer. This may be due to some '
                                               'error in the readings themselves.')
+        cls._registered_stats_keys = {'READINGS', 'DISCARDED'}
+        cls._write_statistics_task = asyncio.ensure_future(cls._write_statistics_loop())
 
         cls._stop = False
         cls._started = True
@@ -269,18 +301,33 @@ class Ingest(object):
                     task.cancel()
                 except asyncio.CancelledError:
                     pass
+        results = await asyncio.gather(*cls._insert_readings_tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.exception(result, 'An exception was raised by Ingest._insert_readings')
+
+        if cls._write_statistics_sleep_task is not None:
+            cls._write_statistics_sleep_task.cancel()
         try:
-            await cls._insert_readings_task
-            cls._insert_readings_task = None
+            await cls._write_statistics_task
         except Exception:
-            _LOGGER.exception('An exception was raised by Ingest._insert_readings')
+            _LOGGER.exception('An exception was raised by Ingest._write_statistics_loop')
+        cls._write_statistics_task = None
+        # Write the statistics of the readings flushed on stop
+        await cls._write_statistics()
+
+        # Register the asset tracker events still pending
+        if cls._register_asset_tracker_events_task is not None:
+            try:
+                await cls._register_asset_tracker_events_task
+            except Exception:
+                _LOGGER.exception('An exception was raised by Ingest._register_asset_tracker_events')
+            cls._register_asset_tracker_events_task = None
 
         cls._insert_readings_wait_tasks = None
         cls._insert_readings_tasks = None
-        cls._readings_lists = None
-        cls._readings_list_batch_size_reached = None
-        cls._readings_list_not_empty = None
-        cls._readings_lists_not_full = None
+        cls._readings_buffer = None
+        cls._readings_batch_size_reached = None
 
         cls._started = False
 
@@ -290,142 +337,195 @@ class Ingest(object):
         cls._discarded_readings_stats += 1
 
     @classmethod
-    async def _insert_readings(cls):
-        """Inserts rows into the readings table
+    def _track_asset(cls, asset):
+        """Queues the asset tracker event of an asset if it is not registered yet
 
-        Use ReadingsStorageClientAsync().append(json_payload_of_readings)
+        The lookup is a set membership test; new events are registered by a background task. An event that failed
+        to register is not queued again before its retry delay has elapsed
         """
-        _LOGGER.info('Insert readings loop started')
+        key = (cls._asset_tracker_service, cls._asset_tracker_plugin, asset, cls._ASSET_TRACKER_EVENT)
+        if key in cls._tracked_asset_events:
+            return
+        retry = cls._asset_event_retries.get(key)
+        if retry is not None and time.monotonic() < retry[0]:
+            return
+        cls._tracked_asset_events.add(key)
+        cls._pending_asset_events.append({"asset": asset, "event": cls._ASSET_TRACKER_EVENT,
+                                          "service": cls._asset_tracker_service,
+                                          "plugin": cls._asset_tracker_plugin})
+        if cls._register_asset_tracker_events_task is None or cls._register_asset_tracker_events_task.done():
+            cls._register_asset_tracker_events_task = asyncio.ensure_future(cls._register_asset_tracker_events())
 
-        list_index = 0
+    @classmethod
+    async def _register_asset_tracker_events(cls):
+        """Registers the pending asset tracker events in batches
 
-        while list_index <= cls._max_concurrent_readings_inserts-1:
-            if cls._stop:
-                readings = 0
-                for i in range(cls._max_concurrent_readings_inserts):
-                    readings += len(cls._readings_lists[i])
-                if cls._discarded_readings_stats + readings == 0:
-                    break  # Terminate this method as there are no pending readings available
-
-            list_index += 1
-            if list_index > cls._max_concurrent_readings_inserts-1:
-                list_index = 0
-
-            # _LOGGER.debug('Insert readings for list_index: %s', list_index)
-
-            readings_list = cls._readings_lists[list_index]
-            min_readings_reached = cls._readings_list_batch_size_reached[list_index]
-            lists_not_full = cls._readings_lists_not_full
-
-            # Wait for enough items in the list to fill a batch
-            # for some minimum amount of time
-            while not cls._stop:
-                if len(readings_list) >= cls._readings_insert_batch_size:
-                    break
+        Events that fail to register are removed from the index so that a reading of the asset queues them again,
+        once a delay that doubles on each consecutive failure has elapsed
+        """
+        while cls._pending_asset_events:
+            batch = cls._pending_asset_events
+            cls._pending_asset_events = []
+            try:
+                failed = await cls._parent_service._core_microservice_management_client.create_asset_tracker_events(
+                    batch)
+            except Exception as ex:
+                _LOGGER.exception(ex, 'Failed to register {} asset tracker events'.format(len(batch)))
+                failed = batch
+            failed_keys = set()
+            now = time.monotonic()
+            for event in failed:
+                key = (event['service'], event['plugin'], event['asset'], event['event'])
+                failed_keys.add(key)
+                cls._tracked_asset_events.discard(key)
+                retry = cls._asset_event_retries.get(key)
+                delay = cls._ASSET_TRACKER_RETRY_SECONDS if retry is None else min(
+                    retry[1] * 2, cls._ASSET_TRACKER_MAX_RETRY_SECONDS)
+                cls._asset_event_retries[key] = (now + delay, delay)
+            for event in batch:
+                key = (event['service'], event['plugin'], event['asset'], event['event'])
+                if key not in failed_keys:
+                    cls._asset_event_retries.pop(key, None)
 
-                min_readings_reached.clear()
-                waiter = asyncio.ensure_future(min_readings_reached.wait())
-                cls._insert_readings_wait_tasks[list_index] = waiter
+    @classmethod
+    async def _insert_readings(cls, worker_index=0):
+        """Flush worker inserting rows into the readings table
 
-                # _LOGGER.debug('Waiting for entire batch: Queue index: %s Size: %s', list_index, len(readings_list))
+        Each of the _max_concurrent_readings_inserts workers takes its own range of the readings buffer, so that
+        the batches are sent in parallel. Ranges are released to the buffer in the order they were taken, whatever
+        the order their inserts complete in.
 
+        Use ReadingsStorageClientAsync().append(json_payload_of_readings)
+        """
+        _LOGGER.info('Insert readings worker %s started', worker_index)
+
+        buffer = cls._readings_buffer
+        batch_size_reached = cls._readings_batch_size_reached
+
+        while True:
+            if cls._stop and not buffer.pending:
+                break  # Terminate this method as there are no pending readings available
+
+            # Wait for enough readings to fill a batch for some minimum amount of time
+            if not cls._stop and buffer.pending < cls._readings_insert_batch_size:
+                batch_size_reached.clear()
+                waiter = asyncio.ensure_future(batch_size_reached.wait())
+                cls._insert_readings_wait_tasks[worker_index] = waiter
                 try:
                     await asyncio.wait_for(waiter, cls._readings_insert_batch_timeout_seconds)
-                    # _LOGGER.debug('Released: Queue index: %s Size: %s', list_index, len(readings_list))
-                except asyncio.CancelledError:
-                    # _LOGGER.debug('Cancelled: Queue index: %s Size: %s', list_index, len(readings_list))
-                    break
-                except asyncio.TimeoutError:
-                    # _LOGGER.debug('Timed out: Queue index: %s Size: %s', list_index, len(readings_list))
-                    break
+                except (asyncio.CancelledError, asyncio.TimeoutError):
+                    pass
                 finally:
-                    cls._insert_readings_wait_tasks[list_index] = None
+                    cls._insert_readings_wait_tasks[worker_index] = None
 
-            # If list is still empty, then proceed to next list
-            if not len(readings_list):
-                continue
+                # Another worker may have taken the batch. Only send a partial batch when nothing was sent for
+                # the batch timeout.
+                if (not cls._stop) and (buffer.pending < cls._readings_insert_batch_size) and (
+                        time.time() - cls._last_insert_time < cls._readings_insert_batch_timeout_seconds):
+                    continue
 
-            # If batch size still not reached and if there is time then let this list wait and move to next list
-            if (not cls._stop) and (len(readings_list) < cls._readings_insert_batch_size) and ((
-                    time.time() - cls._last_insert_time) < cls._readings_insert_batch_timeout_seconds):
+            # If the buffer is still empty, then wait again
+            if not buffer.pending:
                 continue
 
-            attempt = 0
-            cls._last_insert_time = time.time()
+            start, end = buffer.take(cls._readings_insert_batch_size)
+            # Hand the next full batch over to an idle worker
+            if buffer.pending >= cls._readings_insert_batch_size:
+                batch_size_reached.set()
 
-            # Perform insert. Retry when fails.
-            while True:
-                try:
-                    batch_size = len(readings_list)
-                    payload = json.dumps({"readings": readings_list[:batch_size]})
-                    # insert_start_time = time.time()
-                    # _LOGGER.debug('Begin insert: Queue index: %s Batch size: %s', list_index, batch_size)
-                    try:
-                        await cls.readings_storage_async.append(payload)
-                        # insert_end_time = time.time()
-                        # _LOGGER.debug('Inserted %s records in time %s', batch_size, insert_end_time - insert_start_time)
-                        cls._readings_stats += batch_size
-                    except StorageServerError as ex:
-                        err_response = ex.error
-                        # if key error in next, it will be automatically in parent except block
-                        if err_response["retryable"]:  # retryable is bool
-                            # raise and exception handler will retry
-                            _LOGGER.warning("Got %s error, retrying ...", err_response["source"])
-                            raise
-                        else:
-                            # not retryable
-                            _LOGGER.error("%s, %s", err_response["source"], err_response["message"])
-                            batch_size = len(readings_list)
-                            cls._discarded_readings_stats += batch_size
-                    # _LOGGER.debug('End insert: Queue index: %s Batch size: %s', list_index, batch_size)
-                    break
-                except Exception as ex:
-                    attempt += 1
+            await cls._insert_batch(start, end)
+            buffer.release(start, end)
 
-                    _LOGGER.exception(ex, 'Insert failed on attempt #{}, list index: {}'.format(attempt, list_index))
+        _LOGGER.info('Insert readings worker %s stopped', worker_index)
 
-                    if cls._stop or attempt >= _MAX_ATTEMPTS:
-                        # Stopping. Discard the entire list upon failure.
-                        batch_size = len(readings_list)
+    @classmethod
+    async def _insert_batch(cls, start, end):
+        """Sends a range of buffered readings to storage. Retries when it fails."""
+        attempt = 0
+        batch_size = end - start
+        cls._last_insert_time = time.time()
+        payload = {"readings": cls._readings_buffer.readings(start, end)}
+
+        while True:
+            try:
+                # _LOGGER.debug('Begin insert: Batch size: %s', batch_size)
+                try:
+                    await cls.readings_storage_async.append(payload)
+                    cls._readings_stats += batch_size
+                except StorageServerError as ex:
+                    err_response = ex.error
+                    # if key error in next, it will be automatically in parent except block
+                    if err_response["retryable"]:  # retryable is bool
+                        # raise and exception handler will retry
+                        _LOGGER.warning("Got %s error, retrying ...", err_response["source"])
+                        raise
+                    else:
+                        # not retryable
+                        _LOGGER.error("%s, %s", err_response["source"], err_response["message"])
                         cls._discarded_readings_stats += batch_size
-                        _LOGGER.warning('Insert failed: Queue index: %s Batch size: %s', list_index, batch_size)
-                        break
-
-            await cls._write_statistics()
+                break
+            except Exception as ex:
+                attempt += 1
 
-            del readings_list[:batch_size]
+                _LOGGER.exception(ex, 'Insert failed on attempt #{}'.format(attempt))
 
-            if not lists_not_full.is_set():
-                lists_not_full.set()
-
-            # insert_end_time = time.time()
-            # _LOGGER.debug('Inserted %s records + stat in time %s', batch_size, insert_end_time - insert_start_time)
+                if cls._stop or attempt >= _MAX_ATTEMPTS:
+                    # Stopping. Discard the entire batch upon failure.
+                    cls._discarded_readings_stats += batch_size
+                    _LOGGER.warning('Insert failed: Batch size: %s', batch_size)
+                    break
 
-        _LOGGER.info('Insert readings loop stopped')
+    @classmethod
+    async def _write_statistics_loop(cls):
+        """Writes the collected statistics every _write_statistics_frequency_seconds, off the readings insert path"""
+        while not cls._stop:
+            cls._write_statistics_sleep_task = asyncio.ensure_future(
+                asyncio.sleep(cls._write_statistics_frequency_seconds))
+            try:
+                await cls._write_statistics_sleep_task
+            except asyncio.CancelledError:
+                pass
+            finally:
+                cls._write_statistics_sleep_task = None
+            if cls._stop:
+                break  # stop writes the final statistics once the pending readings are flushed
+            await cls._write_statistics()
 
     @classmethod
     async def _write_statistics(cls):
-        """Periodically commits collected readings statistics"""
+        """Commits the readings statistics collected since the previous write in a single bulk update
+
+        Counters without increments are left out. The counters are taken before the first await, so that concurrent
+        calls never count the same readings twice; they are given back if the write fails.
+        """
 
         updates = {}
 
         readings = cls._readings_stats
         cls._readings_stats -= readings
-        updates.update({'READINGS': readings})
+        if readings:
+            updates['READINGS'] = readings
 
         discarded_readings = cls._discarded_readings_stats
         cls._discarded_readings_stats -= discarded_readings
-        updates.update({'DISCARDED': discarded_readings})
+        if discarded_readings:
+            updates['DISCARDED'] = discarded_readings
 
-        """ Register the statistics keys as this may be the first time the key has come into existence """
-        sensor_readings = cls._sensor_stats.copy()
-        for key in sensor_readings:
-            description = 'Readings received by Fledge since startup for sensor {}'.format(key)
-            await cls.stats.register(key, description)
-            cls._sensor_stats[key] -= sensor_readings[key]
-            updates.update({key: sensor_readings[key]})
+        sensor_readings = {key: value for key, value in cls._sensor_stats.items() if value}
+        for key, value in sensor_readings.items():
+            cls._sensor_stats[key] -= value
+
+        if not updates and not sensor_readings:
+            return
 
         try:
+            """ Register the statistics keys as this may be the first time the key has come into existence """
+            for key in sensor_readings:
+                if key not in cls._registered_stats_keys:
+                    description = 'Readings received by Fledge since startup for sensor {}'.format(key)
+                    await cls.stats.register(key, description)
+                    cls._registered_stats_keys.add(key)
+            updates.update(sensor_readings)
             await cls.stats.update_bulk(updates)
         except Exception as ex:
             cls._readings_stats += readings
@@ -436,26 +536,19 @@ class Ingest(object):
 
     @classmethod
     def is_available(cls) -> bool:
-        """Indicates whether all lists are currently full
+        """Indicates whether the readings buffer is currently full
 
         Returns:
-            False - All of the lists are full
+            False - The buffer is full
             True - Otherwise
         """
         if cls._stop:
             return False
 
-        list_index = cls._current_readings_list_index
-        if len(cls._readings_lists[list_index]) < cls._readings_list_size:
+        if not cls._readings_buffer.is_full():
             return True
 
-        if cls._max_concurrent_readings_inserts > 1:
-            for list_index in range(cls._max_concurrent_readings_inserts):
-                if len(cls._readings_lists[list_index]) < cls._readings_list_size:
-                    cls._current_readings_list_index = list_index
-                    return True
-
-        _LOGGER.warning('The ingest service is unavailable %s', list_index)
+        _LOGGER.warning('The ingest service is unavailable, the readings buffer is full')
         return False
 
     @classmethod
@@ -515,16 +608,8 @@ class Ingest(object):
             cls.increment_discarded_readings()
             return
 
-        list_index = cls._current_readings_list_index
-        readings_list = cls._readings_lists[list_index]
-
-        read = dict()
-        read['asset_code'] = asset
-        read['reading'] = readings
-        read['user_ts'] = timestamp
-        readings_list.append(read)
-
-        list_size = len(readings_list)
+        buffer = cls._readings_buffer
+        buffer.append(asset, timestamp, readings)
 
         # Increment the count of received readings to be used for statistics update
         if asset.upper() in cls._sensor_stats:
@@ -533,28 +618,84 @@ class Ingest(object):
             cls._sensor_stats[asset.upper()] = 1
 
         # asset tracker checking
-        payload = {"asset": asset, "event": "Ingest", "service": cls._parent_service._name,
-                   "plugin": cls._parent_service._plugin_info['config']['plugin']['default']}
-        if payload not in cls._payload_events:
-            cls._parent_service._core_microservice_management_client.create_asset_tracker_event(payload)
-            cls._payload_events.append(payload)
-
-        # _LOGGER.debug('Add readings list index: %s size: %s', cls._current_readings_list_index, list_size)
-
-        if list_size == 1:
-            cls._readings_list_not_empty[list_index].set()
-
-        if list_size == cls._readings_insert_batch_size:
-            cls._readings_list_batch_size_reached[list_index].set()
-            # _LOGGER.debug('Set event list index: %s size: %s', cls._current_readings_list_index, len(readings_list))
-
-        # When the current list is full, move on to the next list
-        if cls._max_concurrent_readings_inserts > 1 and (
-                    list_size >= cls._readings_insert_batch_size):
-            # Start at the beginning to reduce the number of connections
-            for list_index in range(cls._max_concurrent_readings_inserts):
-                if len(cls._readings_lists[list_index]) < cls._readings_insert_batch_size:
-                    cls._current_readings_list_index = list_index
-                    # _LOGGER.debug('Change Ingest Queue: from #%s (len %s) to #%s', cls._current_readings_list_index,
-                    #               len(cls._readings_lists[list_index]), list_index)
-                    break
+        cls._track_asset(asset)
+
+        if buffer.pending == cls._readings_insert_batch_size:
+            cls._readings_batch_size_reached.set()
+
+    @classmethod
+    async def add_readings_batch(cls, readings_list: List[dict]) -> int:
+        """Adds the readings returned by one poll of a plugin to Fledge in a single operation
+
+        The readings are validated in one pass and buffered together. Invalid readings, and the readings that do not
+        fit in the buffer, are discarded and counted as such rather than failing the whole batch.
+
+        Args:
+            readings_list: A list of readings, each one a dictionary with the asset, timestamp and readings
+                           arguments of :meth:`add_readings`
+
+        Returns:
+            The number of readings added
+
+        Raises:
+            RuntimeError:
+                The server was not started
+        """
+        if cls._stop:
+            _LOGGER.warning('The South Service is stopping')
+            return 0
+
+        if not cls._started:
+            raise RuntimeError('The South Service was not started')
+
+        assets = []
+        timestamps = []
+        values = []
+        invalid = 0
+        error = None
+        for reading in readings_list:
+            try:
+                asset = reading['asset']
+                timestamp = reading['timestamp']
+                readings = reading.get('readings')
+                if asset is None:
+                    raise ValueError('asset can not be None')
+                if not isinstance(asset, str):
+                    raise TypeError('asset must be a string')
+                if timestamp is None:
+                    raise ValueError('timestamp can not be None')
+                if readings is None:
+                    readings = dict()
+                elif not isinstance(readings, dict):
+                    raise TypeError('readings must be a dictionary')
+            except (KeyError, TypeError, ValueError, AttributeError) as ex:
+                invalid += 1
+                error = ex
+                continue
+            assets.append(asset)
+            timestamps.append(timestamp)
+            values.append(readings)
+
+        if invalid:
+            _LOGGER.warning('Discarded %s invalid readings of a batch of %s, last error: %s', invalid,
+                            len(readings_list), repr(error))
+
+        buffer = cls._readings_buffer
+        added = buffer.extend(assets, timestamps, values)
+        if added < len(assets):
+            _LOGGER.warning('The ingest service is unavailable, the readings buffer is full')
+        cls._discarded_readings_stats += invalid + len(assets) - added
+
+        # Increment the count of received readings to be used for statistics update, and track the new assets
+        counts = {}
+        for asset in islice(assets, added):
+            counts[asset] = counts.get(asset, 0) + 1
+        for asset, count in counts.items():
+            key = asset.upper()
+            cls._sensor_stats[key] = cls._sensor_stats.get(key, 0) + count
+            cls._track_asset(asset)
+
+        if buffer.pending >= cls._readings_insert_batch_size and not cls._readings_batch_size_reached.is_set():
+            cls._readings_batch_size_reached.set()
+
+        return added
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+"""Fixed size ring buffer of the readings waiting to be sent to storage"""
+
+from itertools import chain, islice
+
+__author__ = "agent"
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+class ReadingsBuffer(object):
+    """ Preallocated ring buffer of (asset_code, user_ts, reading) records
+
+    A record takes one slot in each of three preallocated lists, one per field, so that buffering a reading does not
+    allocate anything. Records are addressed by monotonically increasing positions, the slot of a position being
+    position % capacity. Three positions split the buffer:
+
+        [head, reserved)    taken by flushers, not yet released
+        [reserved, tail)    pending, waiting to be taken
+
+    Flushers take disjoint ranges of pending records with :meth:`take` and hand them back with :meth:`release`, in
+    any order. The head only moves past a range once every range before it has been released too, so a slot is
+    never overwritten while its record is being sent.
+    """
+
+    __slots__ = ['_assets', '_timestamps', '_readings', '_capacity', '_head', '_reserved', '_tail', '_released']
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity: maximum number of buffered records, including those taken and not yet released
+        """
+        if not isinstance(capacity, int) or isinstance(capacity, bool) or capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+        self._assets = [None] * capacity
+        self._timestamps = [None] * capacity
+        self._readings = [None] * capacity
+        self._capacity = capacity
+        self._head = 0
+        self._reserved = 0
+        self._tail = 0
+        self._released = {}
+        """start: end of the ranges released ahead of the head"""
+
+    def __len__(self):
+        return self._tail - self._head
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def pending(self):
+        """Number of records not taken by a flusher yet"""
+        return self._tail - self._reserved
+
+    @property
+    def in_flight(self):
+        """Number of records taken and not released yet"""
+        return self._reserved - self._head
+
+    def is_full(self):
+        return self._tail - self._head >= self._capacity
+
+    def append(self, asset_code, user_ts, reading):
+        """ Buffers a record
+
+        Returns:
+            False when the buffer is full and the record was not added, True otherwise
+        """
+        tail = self._tail
+        if tail - self._head >= self._capacity:
+            return False
+        slot = tail % self._capacity
+        self._assets[slot] = asset_code
+        self._timestamps[slot] = user_ts
+        self._readings[slot] = reading
+        self._tail = tail + 1
+        return True
+
+    def extend(self, assets, timestamps, readings):
+        """ Buffers as many records as there is room for, given as one sequence per field
+
+        Returns:
+            the number of records added, from the start of the sequences
+        """
+        tail = self._tail
+        count = min(len(assets), self._capacity - (tail - self._head))
+        if count <= 0:
+            return 0
+        first = tail % self._capacity
+        first_part = min(count, self._capacity - first)
+        for slots, values in ((self._assets, assets), (self._timestamps, timestamps), (self._readings, readings)):
+            slots[first:first + first_part] = values[:first_part]
+            if count > first_part:
+                slots[:count - first_part] = values[first_part:count]
+        self._tail = tail + count
+        return count
+
+    def take(self, max_count):
+        """ Reserves up to max_count pending records for a flusher
+
+        Returns:
+            (start, end) positions of the reserved range, empty when there are no pending records
+        """
+        start = self._reserved
+        end = min(self._tail, start + max_count)
+        self._reserved = end
+        return start, end
+
+    def _segments(self, start, end):
+        """(first, last) slot indexes of the one or two contiguous segments of a range"""
+        first = start % self._capacity
+        last = first + (end - start)
+        if last <= self._capacity:
+            return (first, last),
+        return (first, self._capacity), (0, last - self._capacity)
+
+    def records(self, start, end):
+        """ Iterates over the (asset_code, user_ts, reading) records of a taken range, without copying the buffer """
+        return chain.from_iterable(
+            zip(islice(self._assets, first, last), islice(self._timestamps, first, last),
+                islice(self._readings, first, last)) for first, last in self._segments(start, end))
+
+    def readings(self, start, end):
+        """ Readings payload rows of a taken range """
+        return [{'asset_code': asset_code, 'reading': reading, 'user_ts': user_ts}
+                for asset_code, user_ts, reading in self.records(start, end)]
+
+    def release(self, start, end):
+        """ Frees the slots of a taken range once its records have been sent or discarded """
+        if start != self._head:
+            self._released[start] = end
+            return
+        self._clear(start, end)
+        while end in self._released:
+            next_end = self._released.pop(end)
+            self._clear(end, next_end)
+            end = next_end
+        self._head = end
+
+    def _clear(self, start, end):
+        # Drop the references so that sent readings can be garbage collected
+        for first, last in self._segments(start, end):
+            empty = [None] * (last - first)
+            self._assets[first:last] = empty
+            self._timestamps[first:last] = empty
+            self._readings[first:last] = empty
@@ -11,6 +11,8 @@ import asyncio
 import sys
 from fledge.services.south import exceptions
 from fledge.common import logger
+from fledge.common.microservice_management_client.microservice_management_client import MicroserviceManagementClient
+from fledge.common.storage_client.storage_client import StorageClientAsync
 from fledge.services.south.ingest import Ingest
 from fledge.services.common.microservice import FledgeMicroservice
 from aiohttp import web
@@ -188,10 +190,7 @@ class Server(FledgeMicroservice):
                 data = self._plugin.plugin_poll(self._plugin_handle)
                 if len(data) > 0:
                     if isinstance(data, list):
-                        for reading in data:
-                            asyncio.ensure_future(Ingest.add_readings(asset=reading['asset'],
-                                                                        timestamp=reading['timestamp'],
-                                                                        readings=reading['readings']))
+                        await Ingest.add_readings_batch(data)
                     elif isinstance(data, dict):
                         asyncio.ensure_future(Ingest.add_readings(asset=data['asset'],
                                                                   timestamp=data['timestamp'],
@@ -245,6 +244,10 @@ class Server(FledgeMicroservice):
             _LOGGER.exception('Unable to stop the Ingest server. %s', str(ex))
             raise ex
 
+        # Release the keep-alive connections to the storage service and the core
+        await StorageClientAsync.session_pool.close()
+        await MicroserviceManagementClient.session_pool.close()
+
         try:
             if self._task_main is not None:
                 self._task_main.cancel()
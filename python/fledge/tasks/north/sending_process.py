@@ -203,6 +203,8 @@ class SendingProcess(FledgeProcess):
     _logger = None  # type: logging.Logger
     _stop_execution = False
     """ sets to True when a signal is captured and a termination is needed """
+    _type_coercer = plugin_common.TypeCoercer()
+    """ Converts the reading values of a block, caching the datapoint types of the assets already seen """
     TASK_FETCH_SLEEP = 0.5
     """ The amount of time the fetch operation will sleep if there are no more data to load or in case of an error """
     TASK_SEND_SLEEP = 0.5
@@ -234,7 +236,7 @@ class SendingProcess(FledgeProcess):
             "displayName": "Duration"
         },
         "blockSize": {
-            "description": "Number of readings to send in each transmission",
+            "description": "Number of readings to fetch in each request to the Storage layer",
             "type": "integer",
             "default": "5000",
             "order": "8",
@@ -248,11 +250,19 @@ class SendingProcess(FledgeProcess):
             "displayName": "Sleep Interval"
         },
         "memory_buffer_size": {
-            "description": "Number of elements of blockSize size to be buffered in memory",
+            "description": "Number of elements of fetchChunkSize size to be buffered in memory",
             "type": "integer",
             "default": "10",
             "order": "12",
             "displayName": "Memory Buffer Size"
+        },
+        "fetchChunkSize": {
+            "description": "Number of readings decoded, converted and sent in each transmission",
+            "type": "integer",
+            "default": "500",
+            "order": "13",
+            "displayName": "Fetch Chunk Size",
+            "minimum": "1"
         }
     }
 
@@ -267,6 +277,7 @@ class SendingProcess(FledgeProcess):
             'blockSize': int(self._CONFIG_DEFAULT['blockSize']['default']),
             'sleepInterval': float(self._CONFIG_DEFAULT['sleepInterval']['default']),
             'memory_buffer_size': int(self._CONFIG_DEFAULT['memory_buffer_size']['default']),
+            'fetchChunkSize': int(self._CONFIG_DEFAULT['fetchChunkSize']['default']),
         }
         self._config_from_manager = ""
         self._module_template = "fledge.plugins.north." + "empty." + "empty"
@@ -284,6 +295,8 @@ class SendingProcess(FledgeProcess):
         """" Interfaces to the Fledge Storage Layer """
         self._audit = None
         """" Used to log operations in the Storage Layer """
+        self._jq_filter = None
+        """" Applies the filterRule to the blocks of data when applyFilter is enabled """
         self._log_performance = None
         """ Enable/Disable performance logging, enabled using a command line parameter"""
         self._debug_level = None
@@ -302,6 +315,8 @@ class SendingProcess(FledgeProcess):
         self._memory_buffer_fetch_idx = 0
         self._memory_buffer_send_idx = 0
         """" Used to to managed the in memory buffer for the fetch/send operations """
+        self._statistics = None
+        """ StatisticsAggregator buffering the statistics increments, created by the first update """
         self._event_loop = asyncio.get_event_loop() if loop is None else loop
 
     @staticmethod
@@ -319,12 +334,14 @@ class SendingProcess(FledgeProcess):
             process_memory = usage.ru_maxrss / 1000
 
     async def _update_statistics(self, num_sent):
-        """ Updates Fledge statistics"""
+        """ Updates Fledge statistics, the increments are buffered and written in bulk by the aggregator"""
         try:
-            key = self.statistics_key
-            _stats = await statistics.create_statistics(self._storage_async)
-            await _stats.update(key, num_sent)
-            await _stats.update(self.master_statistics_key, num_sent)
+            if self._statistics is None:
+                _stats = await statistics.create_statistics(self._storage_async)
+                self._statistics = statistics.StatisticsAggregator(_stats)
+                self._statistics.start()
+            self._statistics.add(self.statistics_key, num_sent)
+            self._statistics.add(self.master_statistics_key, num_sent)
         except Exception:
             _message = _MESSAGES_LIST["e000010"]
             SendingProcess._logger.error(_message)
@@ -488,19 +505,11 @@ class SendingProcess(FledgeProcess):
             so these rows will generate an exception and will be skipped.
         """
 
-        def recurse(reading_payload):
-            for k, v in reading_payload.items():
-                if isinstance(v, dict):
-                    for k1, v1 in v.items():
-                        if isinstance(v1, dict):
-                            reading_payload[k][k1] = plugin_common.convert_to_type(v1)
-                            recurse(v1)
-                else:
-                    reading_payload[k] = plugin_common.convert_to_type(v)
-            return reading_payload
+        # Converts values to the proper types for the whole block, for example "180.2" to float 180.2
+        conversion_errors = SendingProcess._type_coercer.convert_block(raw_data)
 
         converted_data = []
-        for row in raw_data:
+        for idx, row in enumerate(raw_data):
 
             try:
 
@@ -508,13 +517,13 @@ class SendingProcess(FledgeProcess):
 
                 # Skips row having undefined asset_code
                 if asset_code != "":
-                    # Converts values to the proper types, for example "180.2" to float 180.2
-                    payload = recurse(row['reading'])
+                    if idx in conversion_errors:
+                        raise conversion_errors[idx]
                     timestamp = apply_date_format(row['user_ts'])  # Adds timezone UTC
                     new_row = {
                         'id': row['id'],
                         'asset_code': asset_code,
-                        'reading': payload,
+                        'reading': row['reading'],
                         'user_ts': timestamp
                     }
                     converted_data.append(new_row)
@@ -527,35 +536,40 @@ class SendingProcess(FledgeProcess):
         return converted_data
 
     async def _load_data_into_memory_readings(self, last_object_id):
-        """ Extracts from the DB Layer data related to the readings loading into a memory structure"""
-        raw_data = None
-        converted_data = []
+        """ Extracts from the DB Layer a block of readings, yielding it in converted sub-batches
+
+        The block is decoded and converted while it is received and each sub-batch of at most fetchChunkSize
+        readings is yielded as soon as it is converted, so memory is bound by fetchChunkSize and not by blockSize.
+        """
         try:
             # Loads data, +1 as > is needed
-            readings = await self._readings.fetch(last_object_id + 1, self._config['blockSize'])
-            raw_data = readings['rows']
-            converted_data = self._transform_in_memory_data_readings(raw_data)
+            async for raw_data in self._readings.fetch_iter(last_object_id + 1, self._config['blockSize'],
+                                                            self._config['fetchChunkSize']):
+                converted_data = self._transform_in_memory_data_readings(raw_data)
+                if converted_data:
+                    yield converted_data
         except aiohttp.client_exceptions.ClientPayloadError as _ex:
             SendingProcess._logger.warning(_MESSAGES_LIST["e000009"].format(str(_ex)))
         except Exception as _ex:
             SendingProcess._logger.error(_MESSAGES_LIST["e000009"].format(str(_ex)))
             raise
-        return converted_data
 
     async def _load_data_into_memory(self, last_object_id):
-        """ Identifies the data source requested and call the appropriate handler"""
+        """ Identifies the data source requested and yields the data sets loaded by the appropriate handler"""
         try:
             if self._config['source'] == 'readings':
-                data_to_send = await self._load_data_into_memory_readings(last_object_id)
+                async for data_to_send in self._load_data_into_memory_readings(last_object_id):
+                    yield data_to_send
             elif self._config['source'] == 'statistics':
                 data_to_send = await self._load_data_into_memory_statistics(last_object_id)
+                if data_to_send:
+                    yield data_to_send
             else:
                 SendingProcess._logger.error(_MESSAGES_LIST["e000008"])
                 raise UnknownDataSource
         except Exception:
             SendingProcess._logger.error(_MESSAGES_LIST["e000009"])
             raise
-        return data_to_send
 
     async def _last_object_id_read(self):
         """ Retrieves the starting point for the send operation"""
@@ -586,42 +600,25 @@ class SendingProcess(FledgeProcess):
                 if self._memory_buffer_fetch_idx < self._config['memory_buffer_size']:
                     # Checks if there is enough space to load a new block of data
                     if self._memory_buffer[self._memory_buffer_fetch_idx] is None:
+                        loaded = False
+                        data_sets = self._load_data_into_memory(last_object_id)
                         try:
-                            data_to_send = await self._load_data_into_memory(last_object_id)
+                            # Each data set takes its own place in the in memory buffer as soon as it is loaded
+                            async for data_to_send in data_sets:
+                                last_object_id = data_to_send[-1]['id']
+                                loaded = True
+                                data_to_send = self._apply_filter(data_to_send)
+                                if data_to_send and not await self._memory_buffer_put(data_to_send):
+                                    break
                         except Exception as ex:
                             _message = _MESSAGES_LIST["e000028"].format(ex)
                             SendingProcess._logger.error(_message)
                             await self._audit.failure(self._AUDIT_CODE, {"error - on _task_fetch_data": _message})
-                            data_to_send = False
                             slept = True
                             await asyncio.sleep(sleep_time)
-                        if data_to_send:
-                            if 'applyFilter' in self._config_from_manager:
-                                # Handles the JQFilter functionality
-                                if self._config_from_manager['applyFilter']["value"].upper() == "TRUE":
-                                    jqfilter = JQFilter()
-                                    # Steps needed to proper format the data generated by the JQFilter
-                                    # to the one expected by the SP
-                                    if 'filterRule' in self._config_from_manager:
-                                        data_to_send_2 = jqfilter.transform(data_to_send,
-                                                                            self._config_from_manager['filterRule']["value"])
-                                        data_to_send_3 = json.dumps(data_to_send_2)
-                                        del data_to_send_2
-                                        data_to_send_4 = eval(data_to_send_3)
-                                        del data_to_send_3
-                                        data_to_send = data_to_send_4[0]
-                                        del data_to_send_4
-                                    else:
-                                        _LOGGER.warning("filterRule config item is missing to apply filter expression.")
-
-                            # Loads the block of data into the in memory buffer
-                            self._memory_buffer[self._memory_buffer_fetch_idx] = data_to_send
-                            last_position = len(data_to_send) - 1
-                            last_object_id = data_to_send[last_position]['id']
-                            self._memory_buffer_fetch_idx += 1
-                            self._task_fetch_data_sem.release()
-                            self.performance_track("task _task_fetch_data")
-                        else:
+                        finally:
+                            await data_sets.aclose()
+                        if not loaded and not slept:
                             # There is no more data to load
                             slept = True
                             await asyncio.sleep(sleep_time)
@@ -643,6 +640,40 @@ class SendingProcess(FledgeProcess):
             await self._audit.failure(self._AUDIT_CODE, {"error - on _task_fetch_data": _message})
             raise
 
+    def _apply_filter(self, data_to_send):
+        """ Applies the filterRule to a data set when applyFilter is enabled """
+        if 'applyFilter' in self._config_from_manager:
+            # Handles the JQFilter functionality
+            if self._config_from_manager['applyFilter']["value"].upper() == "TRUE":
+                if self._jq_filter is None:
+                    self._jq_filter = JQFilter()
+                # The filter rule is compiled once, the first result is the data set to send
+                if 'filterRule' in self._config_from_manager:
+                    data_to_send = self._jq_filter.transform(
+                        data_to_send, self._config_from_manager['filterRule']["value"])[0]
+                else:
+                    _LOGGER.warning("filterRule config item is missing to apply filter expression.")
+        return data_to_send
+
+    async def _memory_buffer_put(self, data_to_send):
+        """ Loads a data set into the next place of the in memory buffer, waiting for the send task to free it
+
+        Returns:
+            False when the task has been stopped while waiting, the data set is then dropped
+        """
+        if self._memory_buffer_fetch_idx >= self._config['memory_buffer_size']:
+            self._memory_buffer_fetch_idx = 0
+        while self._memory_buffer[self._memory_buffer_fetch_idx] is not None:
+            # There is no more space in the in memory buffer
+            await self._task_send_data_sem.acquire()
+            if not self._task_fetch_data_run:
+                return False
+        self._memory_buffer[self._memory_buffer_fetch_idx] = data_to_send
+        self._memory_buffer_fetch_idx += 1
+        self._task_fetch_data_sem.release()
+        self.performance_track("task _task_fetch_data")
+        return True
+
     async def send_data(self):
         """ Handles the sending of the data to the destination using the configured plugin for a defined amount of time"""
 
@@ -875,6 +906,8 @@ class SendingProcess(FledgeProcess):
                 self._config['plugin'] = _config_from_manager['plugin']['value']
 
             self._config['memory_buffer_size'] = int(_config_from_manager['memory_buffer_size']['value'])
+            if 'fetchChunkSize' in _config_from_manager:
+                self._config['fetchChunkSize'] = int(_config_from_manager['fetchChunkSize']['value'])
             _config_from_manager['_CONFIG_CATEGORY_NAME'] = cat_name
 
             if 'stream_id' in _config_from_manager:
@@ -1012,6 +1045,12 @@ class SendingProcess(FledgeProcess):
             except (ValueError, Exception) as ex:
                 SendingProcess._logger.exception(_MESSAGES_LIST["e000002"].format(str(ex)))
                 sys.exit(1)
+            finally:
+                if self._statistics is not None:
+                    await self._statistics.close()
+                if self._audit is not None:
+                    await self._audit.flush()
+                await StorageClientAsync.session_pool.close()
 
     def stop(self):
         """ Terminates the sending process and the related plugin"""
@@ -9,6 +9,7 @@
 
 import asyncio
 from fledge.common.logger import FLCoreLogger
+from fledge.common.storage_client.storage_client import StorageClientAsync
 from fledge.tasks.purge.purge import Purge
 
 
@@ -22,3 +23,4 @@ if __name__ == '__main__':
     loop = asyncio.get_event_loop()
     purge_process = Purge()
     loop.run_until_complete(purge_process.run())
+    loop.run_until_complete(StorageClientAsync.session_pool.close())
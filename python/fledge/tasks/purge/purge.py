@@ -101,8 +101,7 @@ class Purge(FledgeProcess):
 
     async def write_statistics(self, total_purged, unsent_purged):
         stats = await statistics.create_statistics(self._storage_async)
-        await stats.update('PURGED', total_purged)
-        await stats.update('UNSNPURGED', unsent_purged)
+        await stats.update_bulk({'PURGED': total_purged, 'UNSNPURGED': unsent_purged})
 
     async def set_configuration(self):
         """" set the default configuration for purge
@@ -252,7 +251,7 @@ class Purge(FledgeProcess):
                                                     "rowsRetained": unsent_retained,
                                                     "duration": duration,
                                                     "method": method
-                                                    })
+                                                    }, wait=True)
         else:
             self._logger.info("No rows purged")
 
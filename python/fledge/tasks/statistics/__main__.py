@@ -9,6 +9,7 @@
 
 import asyncio
 from fledge.common.logger import FLCoreLogger
+from fledge.common.storage_client.storage_client import StorageClientAsync
 from fledge.tasks.statistics.statistics_history import StatisticsHistory
 
 
@@ -22,3 +23,4 @@ if __name__ == '__main__':
     statistics_history_process = StatisticsHistory()
     loop = asyncio.get_event_loop()
     loop.run_until_complete(statistics_history_process.run())
+    loop.run_until_complete(StorageClientAsync.session_pool.close())
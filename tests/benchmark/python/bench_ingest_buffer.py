@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Benchmark the south Ingest readings buffer
+
+Compares the list per concurrent insert design the Ingest used to have against the ReadingsBuffer ring buffer, for
+    - throughput: readings/sec buffered and drained into readings payloads of batch size
+    - memory: bytes held per buffered reading, reading dicts excluded as both designs share them
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from fledge.services.south.readings_buffer import ReadingsBuffer
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+TS = "2024-01-02 01:02:03.232320+00:00"
+
+
+class ListsBuffer(object):
+    """ The former Ingest buffering: one list of dicts per concurrent insert, sliced and deleted on every flush """
+
+    def __init__(self, buffer_size, lists):
+        self._list_size = buffer_size // lists
+        self._lists = [[] for _ in range(lists)]
+        self._index = 0
+
+    def append(self, asset, timestamp, reading):
+        readings_list = self._lists[self._index]
+        if len(readings_list) >= self._list_size:
+            for index, candidate in enumerate(self._lists):
+                if len(candidate) < self._list_size:
+                    self._index = index
+                    readings_list = candidate
+                    break
+            else:
+                return False
+        read = dict()
+        read['asset_code'] = asset
+        read['reading'] = reading
+        read['user_ts'] = timestamp
+        readings_list.append(read)
+        return True
+
+    def drain(self, batch_size):
+        payloads = []
+        for readings_list in self._lists:
+            while readings_list:
+                batch = len(readings_list[:batch_size])
+                payloads.append({"readings": readings_list[:batch]})
+                del readings_list[:batch]
+        return payloads
+
+
+class RingBuffer(ReadingsBuffer):
+    def __init__(self, buffer_size, lists):
+        super().__init__(buffer_size)
+
+    def drain(self, batch_size):
+        payloads = []
+        while self.pending:
+            start, end = self.take(batch_size)
+            payloads.append({"readings": self.readings(start, end)})
+            self.release(start, end)
+        return payloads
+
+
+def _throughput(cls, args, readings):
+    buffer = cls(args.buffer_size, args.lists)
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for asset, reading in readings:
+            buffer.append(asset, TS, reading)
+        buffer.drain(args.batch_size)
+    return args.rounds * len(readings) / (time.perf_counter() - start)
+
+
+def _memory_per_reading(cls, args, readings):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    buffer = cls(args.buffer_size, args.lists)
+    for asset, reading in readings:
+        buffer.append(asset, TS, reading)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del buffer
+    return size / len(readings)
+
+
+def main(args):
+    readings = [("asset{}".format(i % 10), {"value": i}) for i in range(args.buffer_size)]
+    print("buffer size: {}, lists: {}, batch size: {}, rounds: {}".format(args.buffer_size, args.lists,
+                                                                         args.batch_size, args.rounds))
+    for name, cls in (("lists", ListsBuffer), ("ring buffer", RingBuffer)):
+        print("{:>12}: {:12.0f} readings/s {:8.1f} bytes/reading".format(
+            name, _throughput(cls, args, readings), _memory_per_reading(cls, args, readings)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the south Ingest readings buffer")
+    parser.add_argument("--buffer-size", type=int, default=4096)
+    parser.add_argument("--lists", type=int, default=4, help="max_concurrent_readings_inserts of the list design")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--rounds", type=int, default=200)
+    main(parser.parse_args())
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Benchmark the conversion of reading values done by the north sending process
+
+For a few block shapes, compares readings/sec of
+    - recurse: convert_to_type called for every value, as the sending process used to do
+    - convert_reading: the same traversal with the native number fast path
+    - TypeCoercer: whole block conversion with the per asset schema cache
+"""
+
+import argparse
+import copy
+import random
+import time
+
+import fledge.plugins.north.common.common as plugin_common
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+def _recurse(reading_payload):
+    for k, v in reading_payload.items():
+        if isinstance(v, dict):
+            for k1, v1 in v.items():
+                if isinstance(v1, dict):
+                    reading_payload[k][k1] = plugin_common.convert_to_type(v1)
+                    _recurse(v1)
+        else:
+            reading_payload[k] = plugin_common.convert_to_type(v)
+    return reading_payload
+
+
+def _block(shape, size, assets, datapoints):
+    rnd = random.Random(1)
+    values = {
+        "float": lambda: rnd.uniform(-1000, 1000),
+        "int": lambda: rnd.randint(-1000, 1000),
+        "string": lambda: str(round(rnd.uniform(-1000, 1000), 2)),
+        "mixed": lambda: rnd.choice([rnd.uniform(-1, 1), rnd.randint(0, 100), "on", "12.5"])
+    }[shape]
+    return [{"id": i, "asset_code": "asset{}".format(i % assets),
+             "reading": {"dp{}".format(d): values() for d in range(datapoints)}} for i in range(size)]
+
+
+def _time(func, blocks):
+    start = time.perf_counter()
+    for block in blocks:
+        func(block)
+    return time.perf_counter() - start
+
+
+def main(args):
+    print("block size: {}, assets: {}, datapoints: {}, blocks: {}".format(args.block_size, args.assets,
+                                                                          args.datapoints, args.blocks))
+    for shape in ("float", "int", "string", "mixed"):
+        block = _block(shape, args.block_size, args.assets, args.datapoints)
+        coercer = plugin_common.TypeCoercer()
+        cases = [
+            ("recurse", lambda rows: [_recurse(row["reading"]) for row in rows]),
+            ("convert_reading", lambda rows: [plugin_common.convert_reading(row["reading"]) for row in rows]),
+            ("TypeCoercer", coercer.convert_block)
+        ]
+        for name, func in cases:
+            blocks = [copy.deepcopy(block) for _ in range(args.blocks)]
+            elapsed = _time(func, blocks)
+            print("{:>7} {:>16}: {:12.0f} readings/s".format(shape, name, args.block_size * args.blocks / elapsed))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the north reading type conversion")
+    parser.add_argument("--block-size", type=int, default=5000)
+    parser.add_argument("--assets", type=int, default=10)
+    parser.add_argument("--datapoints", type=int, default=8)
+    parser.add_argument("--blocks", type=int, default=5)
+    main(parser.parse_args())
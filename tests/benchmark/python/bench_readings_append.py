@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Benchmark ReadingsStorageClientAsync.append payload handling
+
+Compares the payload bytes/sec of
+    - str:  batch serialised by the caller, then parsed again by the client for validation (previous Ingest path)
+    - dict: batch handed over as a dict and serialised once by the client
+    - orjson: as dict, with orjson plugged in as encoder (only when orjson is installed)
+
+The storage service is an in-process aiohttp server that discards the body.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock
+
+from aiohttp import web
+from aiohttp.test_utils import unused_port
+
+from fledge.common.service_record import ServiceRecord
+from fledge.common.storage_client.storage_client import ReadingsStorageClientAsync
+from fledge.common.storage_client.utils import Utils
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+HOST = '127.0.0.1'
+
+
+def _batch(batch_size, datapoints):
+    return [{"asset_code": "sinusoid", "user_ts": "2026-10-18 10:00:00.{:06d}+00:00".format(i),
+             "reading": {"dp{}".format(d): i * 0.5 + d for d in range(datapoints)}} for i in range(batch_size)]
+
+
+async def _start_storage(port):
+    async def append(request):
+        await request.read()
+        return web.json_response({"response": "appended", "readings_added": 0})
+
+    app = web.Application()
+    app.router.add_post('/storage/reading', append)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, port).start()
+    return runner
+
+
+async def _run(client, readings, iterations, as_dict):
+    payload_bytes = len(json.dumps({"readings": readings}))
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if as_dict:
+            await client.append({"readings": readings})
+        else:
+            await client.append(json.dumps({"readings": readings}))
+    elapsed = time.perf_counter() - start
+    return payload_bytes * iterations / elapsed, elapsed / iterations
+
+
+async def main(args):
+    port = unused_port()
+    runner = await _start_storage(port)
+    svc = MagicMock(ServiceRecord)
+    svc._address, svc._type, svc._port, svc._management_port = HOST, "Storage", port, 0
+    client = ReadingsStorageClientAsync(None, None, svc=svc)
+    readings = _batch(args.batch_size, args.datapoints)
+
+    cases = [("str", False, None), ("dict", True, None)]
+    try:
+        import orjson
+        cases.append(("orjson", True, orjson.dumps))
+    except ImportError:
+        pass
+    try:
+        # warm up the pooled connection
+        await client.append({"readings": readings})
+        print("batch size: {}, datapoints: {}, iterations: {}".format(args.batch_size, args.datapoints,
+                                                                      args.iterations))
+        for name, as_dict, encoder in cases:
+            Utils.set_encoder(encoder)
+            rate, per_call = await _run(client, readings, args.iterations, as_dict)
+            print("{:>8}: {:10.2f} MB/s {:10.3f} ms/append".format(name, rate / 1e6, per_call * 1e3))
+    finally:
+        Utils.set_encoder()
+        await client.session_pool.close()
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark ReadingsStorageClientAsync.append")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--datapoints", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.get_event_loop().run_until_complete(main(parser.parse_args()))
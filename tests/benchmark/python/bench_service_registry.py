@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Benchmark the core ServiceRegistry and InterestRegistry lookups
+
+Registers a number of services, each interested in a few categories, then times the lookups done on the request
+paths against the list scans the registries used to do
+"""
+
+import argparse
+import time
+from unittest.mock import MagicMock
+
+from fledge.common.configuration_manager import ConfigurationManager
+from fledge.common.service_record import ServiceRecord
+from fledge.services.core.interest_registry.interest_registry import InterestRegistry
+from fledge.services.core.service_registry.service_registry import ServiceRegistry
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+def scan_get(idx=None, name=None, s_type=None):
+    services = ServiceRegistry._registry
+    for k, v in (('_id', idx), ('_name', name), ('_type', s_type)):
+        if v:
+            services = [s for s in ServiceRegistry._registry if getattr(s, k, None) == v]
+    return services
+
+
+def scan_check_address_and_port(address, port):
+    return len([s for s in ServiceRegistry._registry if getattr(s, "_address") == address and
+                getattr(s, "_port") == port and getattr(s, "_status") != ServiceRecord.Status.Failed]) > 0
+
+
+def scan_interests(interest_registry, **kwargs):
+    return [s for s in interest_registry._registered_interests
+            if all(getattr(s, k, None) == v for k, v in kwargs.items() if v is not None)]
+
+
+def _time(lookups, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for lookup in lookups:
+            lookup()
+    return (time.perf_counter() - start) / (rounds * len(lookups)) * 1e6
+
+
+def main(args):
+    ServiceRegistry._logger = MagicMock()
+    interest_registry = InterestRegistry(MagicMock(spec=ConfigurationManager))
+    ids = []
+    for i in range(args.services):
+        s_id = ServiceRegistry.register("service{}".format(i), "Southbound", "localhost", 10000 + i, 40000 + i)
+        ids.append(s_id)
+        for c in range(args.categories):
+            interest_registry.register(s_id, "category{}".format((i + c) % args.services))
+    probes = range(0, args.services, max(1, args.services // 50))
+
+    cases = (
+        ("get by id", [lambda i=i: ServiceRegistry.get(idx=ids[i]) for i in probes],
+         [lambda i=i: scan_get(idx=ids[i]) for i in probes]),
+        ("get by name", [lambda i=i: ServiceRegistry.get(name="service{}".format(i)) for i in probes],
+         [lambda i=i: scan_get(name="service{}".format(i)) for i in probes]),
+        ("address and port", [lambda i=i: ServiceRegistry.check_address_and_port("localhost", 10000 + i)
+                              for i in probes],
+         [lambda i=i: scan_check_address_and_port("localhost", 10000 + i) for i in probes]),
+        ("interests by category", [lambda i=i: interest_registry.get(category_name="category{}".format(i))
+                                   for i in probes],
+         [lambda i=i: scan_interests(interest_registry, _category_name="category{}".format(i)) for i in probes]),
+    )
+    print("services: {}, interests: {}".format(args.services, len(interest_registry._registered_interests)))
+    for name, indexed, scanned in cases:
+        scan_us = _time(scanned, args.rounds)
+        index_us = _time(indexed, args.rounds)
+        print("{:>22}: scan {:10.2f} us  indexed {:8.2f} us  x{:.0f}".format(name, scan_us, index_us,
+                                                                           scan_us / index_us))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the core service and interest registries lookups")
+    parser.add_argument("--services", type=int, default=5000)
+    parser.add_argument("--categories", type=int, default=3, help="categories each service is interested in")
+    parser.add_argument("--rounds", type=int, default=20)
+    main(parser.parse_args())
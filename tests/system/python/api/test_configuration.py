@@ -109,6 +109,12 @@ class TestConfiguration:
                       'displayName': 'Configuration Manager',
                       'children': []
                   },
+                  {
+                      'key': 'STORAGE_CLIENT',
+                      'description': 'Connection pool of the Core to the Storage service',
+                      'displayName': 'Storage Client',
+                      'children': []
+                  },
                   {
                       'key': 'FEATURES',
                       'description': 'Control the inclusion of system features',
@@ -5,6 +5,8 @@ from unittest.mock import patch
 from http.client import HTTPConnection, HTTPResponse
 import json
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import unused_port
 
 from fledge.common.microservice_management_client import exceptions as client_exceptions
 from fledge.common.microservice_management_client.microservice_management_client import MicroserviceManagementClient, _logger
@@ -781,3 +783,58 @@ class TestMicroserviceManagementClient:
         assert 'POST' == kwargs['method']
         assert '/fledge/track' == kwargs['url']
         assert test_dict == json.loads(kwargs['body'])
+
+    @pytest.mark.asyncio
+    async def test_create_asset_tracker_events(self):
+        received = []
+
+        async def add_track(request):
+            data = await request.json()
+            received.append(data)
+            failed = [event for event in data if event['asset'] == 'bad']
+            return web.json_response({"track": [event for event in data if event not in failed], "failed": failed})
+
+        app = web.Application()
+        app.router.add_post('/fledge/track', add_track)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        port = unused_port()
+        site = web.TCPSite(runner, '127.0.0.1', port)
+        await site.start()
+        try:
+            ms_mgt_client = MicroserviceManagementClient('127.0.0.1', port)
+            events = [{'asset': asset, 'event': 'Ingest', 'service': 'PT100_In1', 'plugin': 'PT100'}
+                      for asset in ('AirIntake', 'bad', 'Exhaust')]
+            with patch.object(_logger, "error") as log_error:
+                failed = await ms_mgt_client.create_asset_tracker_events(events)
+            assert [events[1]] == failed
+            # The whole batch is sent with a single request
+            assert [events] == received
+            assert 1 == log_error.call_count
+        finally:
+            await MicroserviceManagementClient.session_pool.close()
+            await runner.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_create_asset_tracker_events_request_failure(self):
+        async def add_track(request):
+            raise web.HTTPInternalServerError(reason='storage down')
+
+        app = web.Application()
+        app.router.add_post('/fledge/track', add_track)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        port = unused_port()
+        site = web.TCPSite(runner, '127.0.0.1', port)
+        await site.start()
+        try:
+            ms_mgt_client = MicroserviceManagementClient('127.0.0.1', port)
+            events = [{'asset': asset, 'event': 'Ingest', 'service': 'PT100_In1', 'plugin': 'PT100'}
+                      for asset in ('AirIntake', 'Exhaust')]
+            with patch.object(_logger, "error") as log_error:
+                failed = await ms_mgt_client.create_asset_tracker_events(events)
+            assert events == failed
+            assert 1 == log_error.call_count
+        finally:
+            await MicroserviceManagementClient.session_pool.close()
+            await runner.cleanup()
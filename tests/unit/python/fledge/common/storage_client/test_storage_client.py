@@ -128,6 +128,13 @@ class FakeFledgeStorageSrvr:
         if request.query.get("id") == "internal_server_err":
             return web.HTTPInternalServerError(reason="something wrong", text='{"key": "value"}')
 
+        if request.query.get("id") == "with_rows":
+            count = int(request.query.get('count'))
+            return web.json_response({"count": count,
+                                      "rows": [{"id": i, "asset_code": "a", "reading": {"x": i},
+                                                "user_ts": "2018-01-01 00:00:00.000000+00"}
+                                               for i in range(1, count + 1)]})
+
         return web.json_response({"readings": [],
                                   "start": request.query.get('id'),
                                   "count": request.query.get('count')
@@ -142,6 +149,12 @@ class FakeFledgeStorageSrvr:
         if payload.get("internal_server_err", None):
             return web.HTTPInternalServerError(reason="something wrong", text='{"key": "value"}')
 
+        if "with_rows" in payload:
+            count = payload["with_rows"]
+            return web.json_response({"count": count,
+                                      "rows": [{"reading": {"x": i}, "timestamp": "2018-01-01 00:00:00.000000"}
+                                               for i in range(count)]})
+
         return web.json_response({
            "called": payload
         })
@@ -237,7 +250,7 @@ class TestStorageClientAsync:
         assert "Data to insert is missing" in str(excinfo.value)
 
         with pytest.raises(Exception) as excinfo:
-            args = "aTable", {"k": "v"}
+            args = "aTable", "blah"
             await sc.insert_into_tbl(*args)
         assert excinfo.type is TypeError
         assert "Provided data to insert must be a valid JSON" in str(excinfo.value)
@@ -246,6 +259,11 @@ class TestStorageClientAsync:
         response = await sc.insert_into_tbl(*args)
         assert {"k": "v"} == response["called"]
 
+        # dict payload is serialised by the client
+        args = "aTable", {"k": "v"}
+        response = await sc.insert_into_tbl(*args)
+        assert {"k": "v"} == response["called"]
+
         with pytest.raises(Exception) as excinfo:
             with patch.object(_LOGGER, "error") as log_e:
                 with patch.object(_LOGGER, "info") as log_i:
@@ -295,7 +313,7 @@ class TestStorageClientAsync:
         assert "Data to update is missing" in str(excinfo.value)
 
         with pytest.raises(Exception) as excinfo:
-            args = "aTable", {"k": "v"}
+            args = "aTable", "blah"
             await sc.update_tbl(*args)
         assert excinfo.type is TypeError
         assert "Provided data to update must be a valid JSON" in str(excinfo.value)
@@ -304,6 +322,11 @@ class TestStorageClientAsync:
         response = await sc.update_tbl(*args)
         assert {"k": "v"} == response["called"]
 
+        # dict payload is serialised by the client
+        args = "aTable", {"k": "v"}
+        response = await sc.update_tbl(*args)
+        assert {"k": "v"} == response["called"]
+
         with pytest.raises(Exception) as excinfo:
             with patch.object(_LOGGER, "error") as log_e:
                 with patch.object(_LOGGER, "info") as log_i:
@@ -351,7 +374,7 @@ class TestStorageClientAsync:
         assert 1 == response["called"]
 
         with pytest.raises(Exception) as excinfo:
-            args = "aTable", {"condition": "v"}
+            args = "aTable", "blah"
             await sc.delete_from_tbl(*args)
         assert excinfo.type is TypeError
         assert "condition payload must be a valid JSON" in str(excinfo.value)
@@ -360,6 +383,11 @@ class TestStorageClientAsync:
         response = await sc.delete_from_tbl(*args)
         assert {"condition": "v"} == response["called"]
 
+        # dict payload is serialised by the client
+        args = "aTable", {"condition": "v"}
+        response = await sc.delete_from_tbl(*args)
+        assert {"condition": "v"} == response["called"]
+
         with pytest.raises(Exception) as excinfo:
             with patch.object(_LOGGER, "error") as log_e:
                 with patch.object(_LOGGER, "info") as log_i:
@@ -459,7 +487,7 @@ class TestStorageClientAsync:
         assert "Query payload is missing" in str(excinfo.value)
 
         with pytest.raises(Exception) as excinfo:
-            args = "aTable", {"k": "v"}
+            args = "aTable", "blah"
             await sc.query_tbl_with_payload(*args)
         assert excinfo.type is TypeError
         assert "Query payload must be a valid JSON" in str(excinfo.value)
@@ -468,6 +496,11 @@ class TestStorageClientAsync:
         response = await sc.query_tbl_with_payload(*args)
         assert {"k": "v"} == response["called"]
 
+        # dict payload is serialised by the client
+        args = "aTable", {"k": "v"}
+        response = await sc.query_tbl_with_payload(*args)
+        assert {"k": "v"} == response["called"]
+
         with pytest.raises(Exception) as excinfo:
             with patch.object(_LOGGER, "error") as log_e:
                 with patch.object(_LOGGER, "info") as log_i:
@@ -550,6 +583,10 @@ class TestReadingsStorageAsyncClient:
         response = await rsc.append(readings)
         assert {'readings': []} == response['appended']
 
+        readings = {"readings": [{"asset_code": "a", "reading": {"x": 1}, "user_ts": "2017-09-21 15:00:09.025655"}]}
+        response = await rsc.append(readings)
+        assert readings == response['appended']
+
         await fake_storage_srvr.stop()
 
     @pytest.mark.asyncio
@@ -607,6 +644,53 @@ class TestReadingsStorageAsyncClient:
 
         await fake_storage_srvr.stop()
 
+    @pytest.mark.asyncio
+    async def test_fetch_iter(self, event_loop):
+        # GET, '/storage/reading?id={}&count={}', decoded while received
+
+        fake_storage_srvr = FakeFledgeStorageSrvr(loop=event_loop)
+        await fake_storage_srvr.start()
+
+        mockServiceRecord = MagicMock(ServiceRecord)
+        mockServiceRecord._address = HOST
+        mockServiceRecord._type = "Storage"
+        mockServiceRecord._port = PORT
+        mockServiceRecord._management_port = 2000
+
+        rsc = ReadingsStorageClientAsync(1, 2, mockServiceRecord)
+
+        async def collect(*args):
+            return [rows async for rows in rsc.fetch_iter(*args)]
+
+        with pytest.raises(Exception) as excinfo:
+            await collect(None, 3)
+        assert excinfo.type is ValueError
+        assert "first reading id to retrieve the readings block is required" in str(excinfo.value)
+
+        with pytest.raises(Exception) as excinfo:
+            await collect(2, None)
+        assert excinfo.type is ValueError
+        assert "count is required to retrieve the readings block" in str(excinfo.value)
+
+        with pytest.raises(Exception) as excinfo:
+            await collect(2, 3, 0)
+        assert excinfo.type is ValueError
+        assert "chunk_size must be a positive integer" in str(excinfo.value)
+
+        with pytest.raises(Exception) as excinfo:
+            with patch.object(_LOGGER, "error") as log_e:
+                await collect("bad_data", 3)
+        assert excinfo.type is aiohttp.client_exceptions.ContentTypeError
+
+        batches = await collect("with_rows", 1200, 500)
+        assert [500, 500, 200] == [len(rows) for rows in batches]
+        assert list(range(1, 1201)) == [row['id'] for rows in batches for row in rows]
+        assert {"x": 7} == batches[0][6]['reading']
+
+        assert [] == await collect("with_rows", 0)
+
+        await fake_storage_srvr.stop()
+
     @pytest.mark.asyncio
     async def test_query(self, event_loop):
         # 'PUT', '/storage/reading/query' query_payload
@@ -652,6 +736,56 @@ class TestReadingsStorageAsyncClient:
 
         await fake_storage_srvr.stop()
 
+    @pytest.mark.asyncio
+    async def test_query_iter(self, event_loop):
+        # 'PUT', '/storage/reading/query' query_payload, decoded while received
+
+        fake_storage_srvr = FakeFledgeStorageSrvr(loop=event_loop)
+        await fake_storage_srvr.start()
+
+        mockServiceRecord = MagicMock(ServiceRecord)
+        mockServiceRecord._address = HOST
+        mockServiceRecord._type = "Storage"
+        mockServiceRecord._port = PORT
+        mockServiceRecord._management_port = 2000
+
+        rsc = ReadingsStorageClientAsync(1, 2, mockServiceRecord)
+
+        async def collect(*args):
+            return [rows async for rows in rsc.query_iter(*args)]
+
+        with pytest.raises(Exception) as excinfo:
+            await collect(None)
+        assert excinfo.type is ValueError
+        assert "Query payload is missing" in str(excinfo.value)
+
+        with pytest.raises(Exception) as excinfo:
+            await collect({"with_rows": 1}, 0)
+        assert excinfo.type is ValueError
+        assert "chunk_size must be a positive integer" in str(excinfo.value)
+
+        with pytest.raises(Exception) as excinfo:
+            with patch.object(_LOGGER, "error") as log_e:
+                await collect(json.dumps({"bad_request": "v"}))
+            log_e.assert_called_once_with("PUT url %s with query payload: %s, Error code: %d, reason: %s, details: %s",
+                                          '/storage/reading/query', '{"bad_request": "v"}', 400, 'bad data',
+                                          {"key": "value"})
+        assert excinfo.type is aiohttp.client_exceptions.ContentTypeError
+
+        # A response without rows
+        with pytest.raises(Exception) as excinfo:
+            await collect({"k": "v"})
+        assert excinfo.type is StorageServerError
+        assert {"called": {"k": "v"}} == excinfo.value.error
+
+        batches = await collect({"with_rows": 1200}, 500)
+        assert [500, 500, 200] == [len(rows) for rows in batches]
+        assert list(range(1200)) == [row['reading']['x'] for rows in batches for row in rows]
+
+        assert [] == await collect({"with_rows": 0})
+
+        await fake_storage_srvr.stop()
+
     @pytest.mark.asyncio
     async def test_purge(self, event_loop):
         # 'PUT', url=put_url, /storage/reading/purge?age=&sent=&flags
@@ -6,8 +6,9 @@
 
 """ Test common/storage_client/utils.py """
 
+import json
 import pytest
-from fledge.common.storage_client.utils import Utils
+from fledge.common.storage_client.utils import Utils, RowsStreamDecoder
 
 __copyright__ = "Copyright (c) 2018 OSIsoft, LLC"
 __license__ = "Apache 2.0"
@@ -43,3 +44,74 @@ class TestUtils:
     def test_is_json_return_false_with_invalid_json(self, test_input):
         ret_val = Utils.is_json(test_input)
         assert ret_val is False
+
+    @pytest.mark.parametrize("test_input, expected", [
+        ({"k": "v"}, '{"k": "v"}'),
+        ([{"k": 1}], '[{"k": 1}]'),
+        ({}, '{}'),
+        ('{"k": "v"}', '{"k": "v"}'),
+        (b'{"k": "v"}', b'{"k": "v"}')
+    ])
+    def test_to_payload(self, test_input, expected):
+        assert expected == Utils.to_payload(test_input)
+
+    @pytest.mark.parametrize("test_input", ['{ k": "v"}', 'a', b'any', 1, {"k", "v"}, {"k": {1, 2}}, None])
+    def test_to_payload_with_invalid_payload(self, test_input):
+        assert Utils.to_payload(test_input) is None
+
+    def test_set_encoder(self):
+        calls = []
+
+        def encoder(obj):
+            calls.append(obj)
+            return b'{}'
+        try:
+            Utils.set_encoder(encoder)
+            assert b'{}' == Utils.to_payload({"k": "v"})
+            # str payload is never re-encoded
+            assert '{"k": "v"}' == Utils.to_payload('{"k": "v"}')
+            assert [{"k": "v"}] == calls
+        finally:
+            Utils.set_encoder()
+        assert '{"k": "v"}' == Utils.to_payload({"k": "v"})
+
+    def test_set_encoder_not_callable(self):
+        with pytest.raises(TypeError) as excinfo:
+            Utils.set_encoder("json")
+        assert "encoder must be callable" == str(excinfo.value)
+
+
+class TestRowsStreamDecoder:
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 4096])
+    def test_feed(self, chunk_size):
+        doc = {"count": 3, "rows": [{"id": 1, "reading": {"name": "caf\u00e9 \u2603", "v": [1, 2]}},
+                                    {"id": 2, "reading": {"s": "a,]}[{"}}, {"id": 3, "reading": {}}]}
+        body = json.dumps(doc, ensure_ascii=False).encode()
+        decoder = RowsStreamDecoder()
+        rows = []
+        for i in range(0, len(body), chunk_size):
+            rows.extend(decoder.feed(body[i:i + chunk_size]))
+        assert decoder.done
+        assert doc["rows"] == rows
+        assert {"count": 3, "rows": []} == decoder.close()
+
+    def test_no_rows(self):
+        decoder = RowsStreamDecoder()
+        assert [] == decoder.feed(b'{"message": "error"}')
+        assert not decoder.done
+        assert {"message": "error"} == decoder.close()
+
+    def test_empty_rows_and_trailing_members(self):
+        decoder = RowsStreamDecoder()
+        assert [] == decoder.feed(b'{"count": 0, "rows" : [ ]')
+        assert decoder.done
+        assert [] == decoder.feed(b', "more": true}')
+        assert {"count": 0, "rows": [], "more": True} == decoder.close()
+
+    def test_incomplete_rows(self):
+        decoder = RowsStreamDecoder()
+        assert [{"id": 1}] == decoder.feed(b'{"rows": [{"id": 1}, {"id": ')
+        with pytest.raises(ValueError) as excinfo:
+            decoder.close()
+        assert "Incomplete rows array in storage response" == str(excinfo.value)
@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import asyncio
+import json
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+from fledge.common import audit_logger
 from fledge.common.audit_logger import AuditLogger
+from fledge.common.storage_client.exceptions import StorageServerError
 from fledge.common.storage_client.storage_client import StorageClientAsync
 
 __copyright__ = "Copyright (c) 2018 OSIsoft, LLC"
@@ -49,6 +52,7 @@ class TestAuditLogger:
         storageMock.configure_mock(**attrs)
         audit = AuditLogger(storageMock)
         await audit.failure('AUDTCODE', {'message': 'failure'})
+        await audit.flush()
         assert audit._storage.insert_into_tbl.called is True
         audit._storage.insert_into_tbl.reset_mock()
 
@@ -60,6 +64,7 @@ class TestAuditLogger:
         storageMock.configure_mock(**attrs)
         audit = AuditLogger(storageMock)
         await audit.warning('AUDTCODE', { 'message': 'failure' })
+        await audit.flush()
         assert audit._storage.insert_into_tbl.called is True
         audit._storage.insert_into_tbl.reset_mock()
 
@@ -71,6 +76,7 @@ class TestAuditLogger:
         storageMock.configure_mock(**attrs)
         audit = AuditLogger(storageMock)
         await audit.information('AUDTCODE', { 'message': 'failure' })
+        await audit.flush()
         assert audit._storage.insert_into_tbl.called is True
         audit._storage.insert_into_tbl.reset_mock()
 
@@ -82,6 +88,7 @@ class TestAuditLogger:
         storageMock.configure_mock(**attrs)
         audit = AuditLogger(storageMock)
         await audit.success('AUDTCODE', { 'message': 'failure' })
+        await audit.flush()
         assert audit._storage.insert_into_tbl.called is True
         audit._storage.insert_into_tbl.reset_mock()
 
@@ -93,6 +100,7 @@ class TestAuditLogger:
         storageMock.configure_mock(**attrs)
         audit = AuditLogger(storageMock)
         await audit.failure('AUDTCODE', None)
+        await audit.flush()
         assert audit._storage.insert_into_tbl.called is True
         audit._storage.insert_into_tbl.reset_mock()
 
@@ -104,6 +112,7 @@ class TestAuditLogger:
         storageMock.configure_mock(**attrs)
         audit = AuditLogger(storageMock)
         await audit.warning('AUDTCODE', None)
+        await audit.flush()
         assert audit._storage.insert_into_tbl.called is True
         audit._storage.insert_into_tbl.reset_mock()
 
@@ -115,6 +124,7 @@ class TestAuditLogger:
         storageMock.configure_mock(**attrs)
         audit = AuditLogger(storageMock)
         await audit.information('AUDTCODE', None)
+        await audit.flush()
         assert audit._storage.insert_into_tbl.called is True
         audit._storage.insert_into_tbl.reset_mock()
 
@@ -126,5 +136,78 @@ class TestAuditLogger:
         storageMock.configure_mock(**attrs)
         audit = AuditLogger(storageMock)
         await audit.success('AUDTCODE', None)
+        await audit.flush()
         assert audit._storage.insert_into_tbl.called is True
         audit._storage.insert_into_tbl.reset_mock()
+
+    @pytest.fixture
+    def audit(self):
+        storage_mock = MagicMock(spec=StorageClientAsync)
+        audit = AuditLogger(storage_mock)
+        _storage = audit._storage
+        audit._storage = storage_mock
+        yield audit
+        audit._storage = _storage
+        audit._queue = []
+        audit._max_queue_size = 1000
+
+    @pytest.mark.asyncio
+    async def test_entries_are_batched(self, audit):
+        payloads = []
+
+        async def insert(table, payload):
+            payloads.append(json.loads(payload))
+            await asyncio.sleep(0.01)
+
+        audit._storage.insert_into_tbl.side_effect = insert
+        await audit.information('AUDTCODE', {'message': 0})
+        await asyncio.sleep(0)
+        # Queued while the first entry is being written
+        for i in range(1, 4):
+            await audit.warning('AUDTCODE', {'message': i})
+        await audit.flush()
+        assert [{'code': 'AUDTCODE', 'level': 4, 'log': {'message': 0}},
+                {'inserts': [{'code': 'AUDTCODE', 'level': 2, 'log': {'message': i}} for i in range(1, 4)]}
+                ] == payloads
+        assert [] == audit._queue
+
+    @pytest.mark.asyncio
+    async def test_wait_for_durability(self, audit):
+        written = []
+
+        async def insert(table, payload):
+            await asyncio.sleep(0.01)
+            written.append(json.loads(payload))
+
+        audit._storage.insert_into_tbl.side_effect = insert
+        await audit.success('AUDTCODE', None, wait=True)
+        assert [{'code': 'AUDTCODE', 'level': 0}] == written
+
+    @pytest.mark.asyncio
+    async def test_wait_raises_storage_error(self, audit):
+        audit._storage.insert_into_tbl.side_effect = StorageServerError(400, "Bad request", {})
+        with patch.object(audit_logger._logger, 'error') as patch_logger:
+            with pytest.raises(StorageServerError):
+                await audit.failure('AUDTCODE', {'message': 'failure'}, wait=True)
+            # Without wait the error is only logged
+            await audit.failure('AUDTCODE', {'message': 'failure'})
+            await audit.flush()
+        assert 2 == patch_logger.call_count
+
+    @pytest.mark.asyncio
+    async def test_back_pressure(self, audit):
+        batch_sizes = []
+
+        async def insert(table, payload):
+            payload = json.loads(payload)
+            batch_sizes.append(len(payload['inserts']) if 'inserts' in payload else 1)
+            await asyncio.sleep(0.01)
+
+        audit._storage.insert_into_tbl.side_effect = insert
+        audit._max_queue_size = 2
+        for i in range(7):
+            await audit.information('AUDTCODE', {'message': i})
+            assert len(audit._queue) <= 2
+        await audit.flush()
+        assert 7 == sum(batch_sizes)
+        assert max(batch_sizes) <= 2
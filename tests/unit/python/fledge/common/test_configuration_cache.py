@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+import json
+from unittest.mock import patch
 import pytest
 from fledge.common.configuration_manager import ConfigurationCache
 
@@ -118,3 +120,71 @@ class TestConfigurationCache:
         assert 'cat1' in cached_manager.cache
         assert 'cat3' in cached_manager.cache
         assert 'cat4' in cached_manager.cache
+
+    def test_hit_moves_entry_to_most_recently_used(self):
+        cached_manager = ConfigurationCache(3)
+        cached_manager.update("cat1", "desc1", {'value': {}})
+        cached_manager.update("cat2", "desc2", {'value': {}})
+        cached_manager.update("cat3", "desc3", {'value': {}})
+        assert "cat1" in cached_manager
+        cached_manager.update("cat4", "desc4", {'value': {}})
+        assert ['cat3', 'cat1', 'cat4'] == list(cached_manager.cache.keys())
+        assert 1 == cached_manager.cache['cat1']['hit']
+        assert 1 == cached_manager.evicted
+
+    def test_ttl(self):
+        cached_manager = ConfigurationCache(ttl=10)
+        with patch('fledge.common.configuration_manager.time.monotonic', return_value=100):
+            cached_manager.update("cat1", "desc1", {'value': {}})
+        with patch('fledge.common.configuration_manager.time.monotonic', return_value=109):
+            assert "cat1" in cached_manager
+        with patch('fledge.common.configuration_manager.time.monotonic', return_value=110):
+            assert "cat1" not in cached_manager
+        assert 'cat1' not in cached_manager.cache
+        assert 1 == cached_manager.hit
+        assert 1 == cached_manager.miss
+        assert 1 == cached_manager.expired
+
+    def test_max_bytes(self):
+        value = {'item': {'value': 'x' * 80}}
+        entry_bytes = len(json.dumps(value))
+        cached_manager = ConfigurationCache(10, max_bytes=entry_bytes * 2)
+        cached_manager.update("cat1", "desc1", value)
+        cached_manager.update("cat2", "desc2", value)
+        assert 2 * entry_bytes == cached_manager.stats()['bytes']
+        cached_manager.update("cat3", "desc3", value)
+        assert ['cat2', 'cat3'] == list(cached_manager.cache.keys())
+        # An update of a cached entry replaces its size
+        cached_manager.update("cat3", "desc3", {})
+        assert entry_bytes + 2 == cached_manager.stats()['bytes']
+        cached_manager.remove("cat2")
+        assert 2 == cached_manager.stats()['bytes']
+        # An entry over the limit on its own is kept
+        cached_manager.update("cat4", "desc4", {'item': {'value': 'x' * 500}})
+        assert ['cat4'] == list(cached_manager.cache.keys())
+
+    def test_update_value(self):
+        cached_manager = ConfigurationCache(ttl=10)
+        with patch('fledge.common.configuration_manager.time.monotonic', return_value=100):
+            cached_manager.update("cat1", "desc1", {}, "Cat 1")
+        value = {'item': {'value': 'x' * 80}}
+        with patch('fledge.common.configuration_manager.time.monotonic', return_value=105):
+            cached_manager.update_value("cat1", value)
+            # Not cached, nothing to update
+            cached_manager.update_value("cat2", value)
+        assert ['cat1'] == list(cached_manager.cache.keys())
+        assert 'desc1' == cached_manager.cache['cat1']['description']
+        assert 'Cat 1' == cached_manager.cache['cat1']['displayName']
+        assert value == cached_manager.cache['cat1']['value']
+        # Size and expiry are those of the new value
+        assert len(json.dumps(value)) == cached_manager.stats()['bytes']
+        with patch('fledge.common.configuration_manager.time.monotonic', return_value=114):
+            assert "cat1" in cached_manager
+
+    def test_stats(self):
+        cached_manager = ConfigurationCache(2, ttl=5)
+        cached_manager.update("cat1", "desc1", {})
+        assert "cat1" in cached_manager
+        assert "cat2" not in cached_manager
+        assert {'size': 1, 'maxSize': 2, 'bytes': 2, 'maxBytes': 0, 'ttl': 5, 'hit': 1, 'miss': 1, 'hitRatio': 0.5,
+                'expired': 0, 'evicted': 0} == cached_manager.stats()
@@ -2606,8 +2606,9 @@ class TestConfigurationManager:
                 return {"rows": [{"key": "General", "description": "General", "display_name": "GEN"}, {"key": "Advanced", "description": "Advanced", "display_name": "ADV"}, {"key": "service", "description": "Fledge service", "display_name": "SERV"}, {"key": "rest_api", "description": "User REST API", "display_name": "API"}], "count": 4}
 
             if table == "category_children":
-                assert {"return": ["child"], "modifier": "distinct"} == payload
-                return {"rows": [{"child": "SMNTR"}, {"child": "service"}, {"child": "rest_api"}], "count": 3}
+                assert {"return": ["parent", "child"], "sort": {"column": "id", "direction": "asc"}} == payload
+                return {"rows": [{"parent": "General", "child": "SMNTR"}, {"parent": "General", "child": "service"},
+                                 {"parent": "Advanced", "child": "rest_api"}], "count": 3}
 
         storage_client_mock = MagicMock(spec=StorageClientAsync)
         c_mgr = ConfigurationManager(storage_client_mock)
@@ -2616,6 +2617,49 @@ class TestConfigurationManager:
             assert expected_result == ret_val
         assert 2 == query_tbl_patch.call_count
 
+    async def test__read_all_groups_tree(self, reset_singleton):
+        async def q_result(*args):
+            table = args[0]
+            if table == "configuration":
+                return {"rows": [{"key": k, "description": "{} desc".format(k), "display_name": k.upper()}
+                                 for k in ("South", "Sine", "SineAdvanced", "North", "Loop")], "count": 5}
+            if table == "category_children":
+                return {"rows": [{"parent": "South", "child": "Sine"}, {"parent": "Sine", "child": "SineAdvanced"},
+                                 {"parent": "South", "child": "Deleted"}, {"parent": "Loop", "child": "North"},
+                                 {"parent": "North", "child": "Loop"}], "count": 5}
+
+        def node(key, children):
+            return {"key": key, "description": "{} desc".format(key), "displayName": key.upper(),
+                    "children": children}
+
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        c_mgr = ConfigurationManager(storage_client_mock)
+        with patch.object(storage_client_mock, 'query_tbl_with_payload', side_effect=q_result) as query_tbl_patch:
+            ret_val = await c_mgr._read_all_groups(root=True, children=True)
+            assert [node("South", [node("Sine", [node("SineAdvanced", [])])])] == ret_val
+            ret_val = await c_mgr._read_all_groups(root=False, children=True)
+            # Relations looping back to an ancestor are not followed
+            assert [node("Sine", [node("SineAdvanced", [])]), node("SineAdvanced", []),
+                    node("North", [node("Loop", [])]), node("Loop", [node("North", [])])] == ret_val
+            assert [('Sine', 'Sine desc', 'SINE'), ('SineAdvanced', 'SineAdvanced desc', 'SINEADVANCED'),
+                    ('North', 'North desc', 'NORTH'), ('Loop', 'Loop desc', 'LOOP')] == \
+                await c_mgr._read_all_groups(root=False, children=False)
+        # One query per table, whatever the number of categories and calls
+        assert 2 == query_tbl_patch.call_count
+
+    async def test__read_all_groups_invalidation(self, reset_singleton):
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        c_mgr = ConfigurationManager(storage_client_mock)
+        rows = {"rows": [], "count": 0}
+        with patch.object(storage_client_mock, 'query_tbl_with_payload', return_value=rows) as query_tbl_patch:
+            await c_mgr._read_all_groups(root=True, children=True)
+            await c_mgr._read_all_groups(root=True, children=True)
+            assert 2 == query_tbl_patch.call_count
+            with patch.object(storage_client_mock, 'insert_into_tbl', return_value={"response": "inserted"}):
+                await c_mgr._create_child("General", "SMNTR")
+            await c_mgr._read_all_groups(root=True, children=True)
+            assert 4 == query_tbl_patch.call_count
+
     async def test__read_category_val_1_row(self, reset_singleton):
         rows = {'rows': [{'value': 'value1'}]}
         category_name = 'catname'
@@ -4387,3 +4431,11 @@ class TestConfigurationManager:
         assert 1 == log_warn.call_count
         log_warn.assert_called_once_with('For {} category, DISCARDING unrecognized entry name {} for item name {}'.
                                          format(CAT_NAME, entry_name, ITEM_NAME))
+
+    def test__handle_config_items_storage_client(self):
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        c_mgr = ConfigurationManager(storage_client_mock)
+        cat_value = {'connectionLimit': {'value': '10'}, 'keepaliveTimeout': {'value': '2.5'}}
+        with patch.object(StorageClientAsync.session_pool, 'configure') as patch_configure:
+            c_mgr._handle_config_items('STORAGE_CLIENT', cat_value)
+        patch_configure.assert_called_once_with(limit=10, keepalive_timeout=2.5)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test fledge/common/jqfilter.py """
+
+import pytest
+from unittest.mock import patch
+
+pyjq = pytest.importorskip("pyjq")
+
+from fledge.common.jqfilter import JQFilter
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+@pytest.fixture(autouse=True)
+def clear_programs():
+    JQFilter._programs.clear()
+    yield
+    JQFilter._programs.clear()
+
+
+class TestJQFilter:
+
+    def test_transform(self):
+        block = [{"asset_code": "a", "reading": {"x": 1, "on": True, "off": None}}]
+        result = JQFilter().transform(block, ".")
+        assert [block] == result
+        assert result[0] is not block
+
+    def test_transform_reshape(self):
+        block = [{"asset_code": "a", "reading": {"x": 1}}, {"asset_code": "b", "reading": {"x": 2}}]
+        result = JQFilter().transform(block, "[.[] | select(.reading.x > 1)]")
+        assert [[{"asset_code": "b", "reading": {"x": 2}}]] == result
+
+    def test_program_is_compiled_once(self):
+        with patch.object(pyjq, 'compile', wraps=pyjq.compile) as patch_compile:
+            jq_filter = JQFilter()
+            for i in range(3):
+                assert [[i]] == jq_filter.transform([{"v": i}], "[.[].v]")
+            assert [[{"v": 1}]] == JQFilter().transform([{"v": 1}], ".")
+        assert 2 == patch_compile.call_count
+        assert ["[.[].v]", "."] == list(JQFilter._programs)
+
+    def test_programs_are_bounded(self):
+        with patch.object(JQFilter, '_MAX_PROGRAMS', 2):
+            for rule in (".", ".[0]", ".[1]"):
+                JQFilter.compile(rule)
+        assert [".[0]", ".[1]"] == list(JQFilter._programs)
+
+    def test_bad_filter(self):
+        jq_filter = JQFilter()
+        with patch.object(jq_filter._logger, "error") as patch_log:
+            with pytest.raises(ValueError):
+                jq_filter.transform([], ".[")
+        assert 1 == patch_log.call_count
+        assert {} == JQFilter._programs
+
+    def test_bad_block(self):
+        jq_filter = JQFilter()
+        with patch.object(jq_filter._logger, "error") as patch_log:
+            with pytest.raises(TypeError):
+                jq_filter.transform(object(), ".")
+        assert 1 == patch_log.call_count
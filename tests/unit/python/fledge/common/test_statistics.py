@@ -272,3 +272,97 @@ class TestStatistics:
                 with patch.object(statistics._logger, 'exception') as logger_exception:
                     await s.add_update(stat_dict)
                 logger_exception.assert_called_once_with(*msg)
+
+
+class TestStatisticsAggregator:
+
+    def setup_method(self):
+        statistics.Statistics._shared_state = {}
+
+    def teardown_method(self):
+        statistics.Statistics._shared_state = {}
+
+    async def test_init_with_no_statistics(self):
+        with pytest.raises(TypeError) as excinfo:
+            statistics.StatisticsAggregator(None)
+        assert 'Must be a valid Statistics object' == str(excinfo.value)
+
+    async def test_add_and_flush(self):
+        s = statistics.Statistics(MagicMock(spec=StorageClientAsync))
+        aggregator = statistics.StatisticsAggregator(s)
+        aggregator.add('SENT_1', 10)
+        aggregator.add('SENT', 10)
+        aggregator.add('SENT_1', 5)
+        aggregator.add('SENT', 0)
+        assert {'SENT_1': 15, 'SENT': 10} == aggregator.pending
+        with patch.object(s, 'update_bulk') as patch_update_bulk:
+            assert await aggregator.flush() is True
+            # Nothing left to write
+            assert await aggregator.flush() is True
+        patch_update_bulk.assert_called_once_with({'SENT_1': 15, 'SENT': 10})
+        assert {} == aggregator.pending
+
+    @pytest.mark.parametrize("key, value_increment, exception_name, exception_message", [
+        (123456, 120, TypeError, "key must be a string"),
+        ('PURGED', '120', ValueError, "value must be an integer")
+    ])
+    async def test_add_with_invalid_params(self, key, value_increment, exception_name, exception_message):
+        aggregator = statistics.StatisticsAggregator(statistics.Statistics(MagicMock(spec=StorageClientAsync)))
+        with pytest.raises(exception_name) as excinfo:
+            aggregator.add(key, value_increment)
+        assert exception_message == str(excinfo.value)
+
+    async def test_failed_flush_keeps_increments(self):
+        s = statistics.Statistics(MagicMock(spec=StorageClientAsync))
+        aggregator = statistics.StatisticsAggregator(s)
+        aggregator.add('SENT', 10)
+        with patch.object(s, 'update_bulk', side_effect=Exception) as patch_update_bulk:
+            assert await aggregator.flush() is False
+        aggregator.add('SENT', 5)
+        assert {'SENT': 15} == aggregator.pending
+        with patch.object(s, 'update_bulk') as patch_update_bulk:
+            assert await aggregator.flush() is True
+        patch_update_bulk.assert_called_once_with({'SENT': 15})
+
+    async def test_threshold(self):
+        s = statistics.Statistics(MagicMock(spec=StorageClientAsync))
+        aggregator = statistics.StatisticsAggregator(s, flush_interval=3600, flush_threshold=3)
+        with patch.object(s, 'update_bulk') as patch_update_bulk:
+            aggregator.add('SENT', 1)
+            aggregator.add('SENT', 1)
+            await asyncio.sleep(0)
+            patch_update_bulk.assert_not_called()
+            aggregator.add('SENT', 1)
+            await asyncio.sleep(0)
+        patch_update_bulk.assert_called_once_with({'SENT': 3})
+
+    async def test_timer_and_close(self):
+        s = statistics.Statistics(MagicMock(spec=StorageClientAsync))
+        aggregator = statistics.StatisticsAggregator(s, flush_interval=0.01)
+        with patch.object(s, 'update_bulk') as patch_update_bulk:
+            aggregator.start()
+            aggregator.add('SENT', 1)
+            await asyncio.sleep(0.05)
+            patch_update_bulk.assert_called_once_with({'SENT': 1})
+            aggregator.add('SENT', 2)
+            await aggregator.close()
+        patch_update_bulk.assert_called_with({'SENT': 2})
+        assert aggregator._timer_task is None
+
+    async def test_close_falls_back_to_key_updates(self):
+        s = statistics.Statistics(MagicMock(spec=StorageClientAsync))
+        aggregator = statistics.StatisticsAggregator(s)
+        aggregator.add('SENT', 1)
+        aggregator.add('BAD', 2)
+
+        async def update(key, value):
+            if key == 'BAD':
+                raise Exception
+
+        with patch.object(s, 'update_bulk', side_effect=Exception):
+            with patch.object(s, 'update', side_effect=update) as patch_update:
+                with patch.object(statistics._logger, 'error') as patch_logger:
+                    await aggregator.close()
+        assert 2 == patch_update.call_count
+        patch_logger.assert_called_once_with('Statistics increment %s of key %s has been lost', 2, 'BAD')
+        assert {} == aggregator.pending
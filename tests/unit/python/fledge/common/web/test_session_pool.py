@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test fledge/common/web/session_pool.py """
+
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import unused_port
+
+from fledge.common.web.session_pool import SessionPool
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+HOST = '127.0.0.1'
+
+
+async def _start_server(port):
+    async def ping(request):
+        return web.json_response({"pong": 1})
+
+    app = web.Application()
+    app.router.add_get('/ping', ping)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, HOST, port)
+    await site.start()
+    return runner
+
+
+class TestSessionPool:
+
+    def test_defaults(self):
+        pool = SessionPool()
+        metrics = pool.metrics()
+        assert 100 == metrics['limit']
+        assert 0 == metrics['limitPerHost']
+        assert 30.0 == metrics['keepaliveTimeout']
+        assert 0 == metrics['inUse']
+        assert 0 == metrics['idle']
+        assert 0 == metrics['waitCount']
+
+    def test_configure(self):
+        pool = SessionPool()
+        pool.configure(limit=4, limit_per_host=2, keepalive_timeout=5)
+        metrics = pool.metrics()
+        assert 4 == metrics['limit']
+        assert 2 == metrics['limitPerHost']
+        assert 5.0 == metrics['keepaliveTimeout']
+
+    @pytest.mark.parametrize("kwargs", [
+        {"limit": -1}, {"limit_per_host": -1}, {"keepalive_timeout": 0}
+    ])
+    def test_bad_configure(self, kwargs):
+        with pytest.raises(ValueError):
+            SessionPool().configure(**kwargs)
+
+    @pytest.mark.asyncio
+    async def test_session_is_shared_per_loop(self):
+        pool = SessionPool()
+        session = pool.get_session()
+        assert session is pool.get_session()
+        assert 100 == session.connector.limit
+        await pool.close()
+        assert session.closed
+        new_session = pool.get_session()
+        assert new_session is not session
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self):
+        port = unused_port()
+        runner = await _start_server(port)
+        pool = SessionPool(limit=1)
+        try:
+            url = 'http://{}:{}/ping'.format(HOST, port)
+            for _ in range(3):
+                async with pool.get_session().get(url) as resp:
+                    assert {"pong": 1} == await resp.json()
+            metrics = pool.metrics()
+            assert 1 == metrics['created']
+            assert 2 == metrics['reused']
+            assert 1 == metrics['idle']
+            assert 0 == metrics['inUse']
+
+            async def get():
+                async with pool.get_session().get(url) as resp:
+                    return await resp.json()
+            # limit is 1, so the concurrent requests have to wait for the connection
+            await asyncio.gather(get(), get(), get())
+            assert pool.metrics()['waitCount'] >= 1
+        finally:
+            await pool.close()
+            await runner.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_configure_replaces_sessions(self):
+        pool = SessionPool()
+        session = pool.get_session()
+        pool.configure(limit=100)
+        assert session is pool.get_session()
+        pool.configure(limit=4, keepalive_timeout=5)
+        new_session = pool.get_session()
+        assert new_session is not session
+        assert 4 == new_session.connector.limit
+        # The replaced session is kept open for its requests in flight until the pool is closed
+        assert not session.closed
+        await pool.close()
+        assert session.closed and new_session.closed
+
+    def test_sessions_of_closed_loops_are_discarded(self):
+        pool = SessionPool()
+        loop = asyncio.new_event_loop()
+
+        async def get_session():
+            return pool.get_session()
+        session = loop.run_until_complete(get_session())
+        loop.close()
+        other_loop = asyncio.new_event_loop()
+        try:
+            other_session = other_loop.run_until_complete(get_session())
+            assert other_session is not session
+            assert session.closed
+            assert [other_loop] == list(pool._sessions)
+            other_loop.run_until_complete(pool.close())
+        finally:
+            other_loop.close()
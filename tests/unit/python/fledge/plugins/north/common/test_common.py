@@ -6,6 +6,7 @@
 
 """ Unit tests about the common code available in plugins.north.common.common """
 
+import copy
 import pytest
 import fledge.plugins.north.common.common as plugin_common
 
@@ -151,3 +152,110 @@ class TestPluginsNorthCommon(object):
         """ """
 
         assert plugin_common.identify_unique_asset_codes(value) == expected
+
+    @pytest.mark.parametrize("value", [
+        "xxx", "180.2", "180.", "-10", "-0", "0.0", "007", " 10", "1_000", "1e3", "12345678901234567890", "nan", "",
+        True, False, None,
+        -180.2, 0.0, 180.0, float("nan"), -10, 0, 10, 2 ** 53, 2 ** 53 + 1, -(2 ** 60) - 1, [1, "2"]
+    ])
+    def test_convert_value(self, value):
+        """ convert_value is the same as convert_to_type """
+
+        try:
+            expected = plugin_common.convert_to_type(value)
+        except Exception as ex:
+            with pytest.raises(type(ex)):
+                plugin_common.convert_value(value)
+            return
+        converted = plugin_common.convert_value(value)
+        assert type(expected) is type(converted)
+        assert str(expected) == str(converted)
+
+    @pytest.mark.parametrize("value", [float("inf"), "inf", "1e400"])
+    def test_convert_value_infinite(self, value):
+        """ convert_value fails as convert_to_type does """
+
+        with pytest.raises(OverflowError):
+            plugin_common.convert_value(value)
+
+
+def _recurse(reading_payload):
+    """ Previous per value conversion of the sending process, used as reference """
+    for k, v in reading_payload.items():
+        if isinstance(v, dict):
+            for k1, v1 in v.items():
+                if isinstance(v1, dict):
+                    reading_payload[k][k1] = plugin_common.convert_to_type(v1)
+                    _recurse(v1)
+        else:
+            reading_payload[k] = plugin_common.convert_to_type(v)
+    return reading_payload
+
+
+class TestTypeCoercer(object):
+    """ Unit tests about plugins.north.common.common.TypeCoercer """
+
+    READINGS = [
+        {"a": 1, "b": 2.5, "c": "3", "d": "4.5", "e": "up"},
+        {"a": 2, "b": 3.0, "c": "x", "d": 4, "e": "down"},  # types changed for c and d
+        {"a": "7", "b": 2 ** 60 + 1, "c": 3, "d": 4.5, "e": None},  # int a and float b as string and huge int
+        {"a": {"x": "1", "y": {"z": "2.5", "w": {"v": "3"}}}, "b": [1, "2"]},  # nested values
+        {"a": 1, "b": {"x": "1"}, "c": "3", "d": "4.5", "e": "up"},  # dict in place of a float
+        {"b": 2.5, "a": 1}  # different datapoints
+    ]
+
+    @pytest.mark.parametrize("reading", READINGS)
+    def test_convert_reading(self, reading):
+        try:
+            expected = _recurse(copy.deepcopy(reading))
+        except Exception as ex:
+            with pytest.raises(type(ex)):
+                plugin_common.convert_reading(copy.deepcopy(reading))
+        else:
+            assert expected == plugin_common.convert_reading(copy.deepcopy(reading))
+
+    def test_convert_same_as_reference(self):
+        coercer = plugin_common.TypeCoercer()
+        for reading in self.READINGS:
+            try:
+                expected = _recurse(copy.deepcopy(reading))
+            except Exception as ex:
+                with pytest.raises(type(ex)):
+                    coercer.convert("asset", copy.deepcopy(reading))
+            else:
+                converted = coercer.convert("asset", copy.deepcopy(reading))
+                assert expected == converted
+                assert [type(v) for v in expected.values()] == [type(v) for v in converted.values()]
+
+    def test_schema_cache(self):
+        coercer = plugin_common.TypeCoercer()
+        for i in range(3):
+            assert {"a": i, "b": 1.5, "c": 2} == coercer.convert("asset1", {"a": i, "b": 1.5, "c": "2"})
+        assert 1 == coercer.misses
+        assert 2 == coercer.hits
+        coercer.convert("asset1", {"a": 1})
+        assert 2 == coercer.misses
+        coercer.clear()
+        coercer.convert("asset1", {"a": 1})
+        assert 3 == coercer.misses
+
+    def test_schema_cache_size(self):
+        coercer = plugin_common.TypeCoercer(max_assets=2)
+        for asset in ("a1", "a2", "a3"):
+            coercer.convert(asset, {"v": 1})
+        assert ["a2", "a3"] == list(coercer._schemas)
+
+    def test_convert_block(self):
+        coercer = plugin_common.TypeCoercer()
+        rows = [
+            {"asset_code": "a", "reading": {"v": "1"}},
+            {"asset_code": "a", "reading": 20},
+            {"asset_code": "b", "reading": {"v": None}},
+            {"asset_code": "b", "reading": {"v": "2.5"}},
+        ]
+        errors = coercer.convert_block(rows)
+        assert [1, 2] == sorted(errors)
+        assert 2 == coercer.misses
+        assert 2 == coercer.hits
+        assert {"v": 1} == rows[0]["reading"]
+        assert {"v": 2.5} == rows[3]["reading"]
@@ -21,10 +21,10 @@ __version__ = "${VERSION}"
 
 class TestInstance:
     def setup_method(self):
-        Service._registry = []
+        Service.reset()
 
     def teardown_method(self):
-        Service._registry = []
+        Service.reset()
 
     async def test_register(self):
         with patch.object(Service._logger, 'info') as log_info:
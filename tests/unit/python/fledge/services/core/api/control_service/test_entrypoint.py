@@ -306,7 +306,7 @@ class TestEntrypoint:
         from fledge.services.core.service_registry.service_registry import ServiceRegistry
         from fledge.common.service_record import ServiceRecord
 
-        ServiceRegistry._registry = []
+        ServiceRegistry.reset()
 
         with patch.object(ServiceRegistry._logger, 'info'):
             ServiceRegistry.register('Fledge Storage', 'Storage', '127.0.0.1', 1, 1, 'http')
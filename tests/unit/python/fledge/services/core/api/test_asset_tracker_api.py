@@ -187,7 +187,7 @@ class TestAssetTracker:
                                 assert 1 == log_info.call_count
                                 log_info.assert_called_once_with(message)
                             patch_audit.assert_called_once_with(
-                                'ASTDP', {'asset': asset, 'event': audit_event, 'service': service})
+                                'ASTDP', {'asset': asset, 'event': audit_event, 'service': service}, wait=True)
                     args, _ = patch_update_tbl.call_args
                     assert 'asset_tracker' == args[0]
                     assert update_payload == json.loads(args[1])
@@ -6,7 +6,11 @@
 
 
 import asyncio
+import copy
+import datetime
 import json
+import math
+import time
 from unittest.mock import MagicMock, patch
 import sys
 
@@ -16,7 +20,9 @@ import pytest
 
 from fledge.services.core.api import browser
 from fledge.services.core import connect
-from fledge.common.storage_client.storage_client import ReadingsStorageClientAsync
+from fledge.common.storage_client.exceptions import StorageServerError
+from fledge.common.audit_logger import AuditLogger
+from fledge.common.storage_client.storage_client import ReadingsStorageClientAsync, StorageClientAsync
 
 __author__ = "Ashish Jabble"
 __copyright__ = "Copyright (c) 2017 OSIsoft, LLC"
@@ -24,7 +30,7 @@ __license__ = "Apache 2.0"
 __version__ = "${VERSION}"
 
 
-URLS = ['fledge/asset',
+URLS = ['fledge/asset?exact=true',
         '/fledge/asset/fogbench%2fhumidity',
         '/fledge/asset/fogbench%2fhumidity/temperature',
         '/fledge/asset/fogbench%2fhumidity/temperature/series']
@@ -89,6 +95,19 @@ class TestBrowserAssets:
     def client(self, app, loop, test_client):
         return loop.run_until_complete(test_client(app))
 
+    @pytest.fixture(autouse=True)
+    def clear_reading_keys(self):
+        browser._reading_keys.clear()
+        browser._AssetCounts.clear()
+        browser._SeriesCache.clear()
+        browser._SeriesCache.purged_expiry = 0
+        yield
+        browser._reading_keys.clear()
+        browser._AssetCounts.clear()
+        browser._SeriesCache.clear()
+        browser._SeriesCache.purged_expiry = 0
+        browser._multi_aggregate_unsupported_until = 0
+
     def test_routes_count(self, app):
         assert 14 == len(app.router.resources())
 
@@ -169,7 +188,7 @@ class TestBrowserAssets:
                 json_response = json.loads(r)
                 if str(request_url).endswith("summary"):
                     assert {'temperature': result['rows'][0]} == json_response
-                elif str(request_url) == 'fledge/asset':
+                elif str(request_url) == 'fledge/asset?exact=true':
                     result['rows'][0]['assetCode'] = result['rows'][0].pop('asset_code')
                     assert result['rows'] == json_response
                 else:
@@ -415,6 +434,399 @@ class TestBrowserAssets:
             # FIXME: ordering issue and add tests for datetimeunits request param
             # assert '{"aggregate": [{"operation": "min", "json": {"column": "reading", "properties": "humidity"}, "alias": "min"}, {"operation": "max", "json": {"column": "reading", "properties": "humidity"}, "alias": "max"}, {"operation": "avg", "json": {"column": "reading", "properties": "humidity"}, "alias": "average"}], "where": {"column": "asset_code", "condition": "=", "value": "fogbench_humidity"}, "limit": 20}' in args1
 
+    async def test_asset_all_readings_summary_in_one_query(self, client):
+        async def q_result(payload):
+            payload = json.loads(payload)
+            if 'return' in payload:
+                return {'rows': [{'reading': {'x': 1, 'y': 2}}], 'count': 1}
+            aggregates.append(payload['aggregate'])
+            return {'count': 1, 'rows': [{'min_0': 1, 'max_0': 9, 'average_0': 5,
+                                          'min_1': 2, 'max_1': 8, 'average_1': 4.5}]}
+
+        aggregates = []
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+            with patch.object(readings_storage_client_mock, 'query', side_effect=q_result) as patch_query:
+                for _ in range(2):
+                    resp = await client.get('fledge/asset/vibration/summary')
+                    assert 200 == resp.status
+                    assert [{'x': {'min': 1, 'max': 9, 'average': 5}},
+                            {'y': {'min': 2, 'max': 8, 'average': 4.5}}] == json.loads(await resp.text())
+            # The datapoint names are read once
+            assert 3 == patch_query.call_count
+        assert {"operation": "avg", "json": {"column": "reading", "properties": "y"},
+                "alias": "average_1"} == aggregates[0][5]
+        assert 6 == len(aggregates[0])
+
+    async def test_asset_all_readings_summary_per_datapoint(self, client):
+        keys = ['dp{}'.format(i) for i in range(20)]
+        running = []
+
+        async def q_result(payload):
+            payload = json.loads(payload)
+            if 'return' in payload:
+                return {'rows': [{'reading': {key: 1 for key in keys}}], 'count': 1}
+            if len(payload['aggregate']) > 3:
+                raise StorageServerError(400, "Bad Request", {"message": "unsupported"})
+            running.append(1)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+            key = payload['aggregate'][0]['json']['properties']
+            return {'count': 1, 'rows': [{'min': key, 'max': key, 'average': key}]}
+
+        max_running = []
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+            with patch.object(readings_storage_client_mock, 'query', side_effect=q_result):
+                with patch.object(browser._logger, 'warning') as patch_logger:
+                    resp = await client.get('fledge/asset/plc/summary')
+                    assert 200 == resp.status
+                    assert [{key: {'min': key, 'max': key, 'average': key}} for key in keys] == json.loads(
+                        await resp.text())
+                patch_logger.assert_called_once()
+        assert browser._multi_aggregate_unsupported_until > time.monotonic()
+        assert 20 == len(max_running)
+        assert 1 < max(max_running) <= browser.SUMMARY_MAX_CONCURRENT_QUERIES
+
+    @pytest.mark.parametrize("code, single_queries", [(400, 1), (500, 2)])
+    async def test_asset_all_readings_summary_fallback(self, client, code, single_queries):
+        async def q_result(payload):
+            payload = json.loads(payload)
+            if 'return' in payload:
+                return {'rows': [{'reading': {'x': 1, 'y': 2}}], 'count': 1}
+            if len(payload['aggregate']) > 3:
+                aggregates.append(payload['aggregate'])
+                raise StorageServerError(code, "Error", {"message": "failed"})
+            return {'count': 1, 'rows': [{'min': 1, 'max': 2, 'average': 1.5}]}
+
+        aggregates = []
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+            with patch.object(readings_storage_client_mock, 'query', side_effect=q_result):
+                with patch.object(browser._logger, 'warning'):
+                    for _ in range(2):
+                        resp = await client.get('fledge/asset/vibration/summary')
+                        assert 200 == resp.status
+                    # Only a client error keeps the summaries on one query per datapoint
+                    assert single_queries == len(aggregates)
+                    # and not for longer than MULTI_AGGREGATE_RETRY_SECONDS
+                    browser._multi_aggregate_unsupported_until = time.monotonic() - 1
+                    resp = await client.get('fledge/asset/vibration/summary')
+                    assert 200 == resp.status
+                    assert single_queries + 1 == len(aggregates)
+
+    async def test_asset_counts_maintained_from_statistics(self, client):
+        statistics = [{'key': 'READINGS', 'value': 30}, {'key': 'SINUSOID', 'value': 20},
+                      {'key': 'RANDOM', 'value': 10}, {'key': 'PURGED', 'value': 0}]
+        counts = {'rows': [{'count': 20, 'asset_code': 'sinusoid'}, {'count': 10, 'asset_code': 'random'}],
+                  'count': 2}
+
+        async def stats_result(table, payload):
+            assert 'statistics' == table
+            return {'rows': copy.deepcopy(statistics), 'count': len(statistics)}
+
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        storage_client_mock = MagicMock(StorageClientAsync)
+        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+            with patch.object(storage_client_mock, 'query_tbl_with_payload', side_effect=stats_result):
+                with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+                    with patch.object(readings_storage_client_mock, 'query', return_value=counts) as query_patch:
+                        resp = await client.get('fledge/asset')
+                        assert 200 == resp.status
+                        assert [{'count': 20, 'assetCode': 'sinusoid'},
+                                {'count': 10, 'assetCode': 'random'}] == json.loads(await resp.text())
+                        # New readings are counted from the statistics, without querying the readings
+                        statistics[0]['value'] = 35
+                        statistics[1]['value'] = 25
+                        resp = await client.get('fledge/asset')
+                        assert 200 == resp.status
+                        assert [{'count': 25, 'assetCode': 'sinusoid'},
+                                {'count': 10, 'assetCode': 'random'}] == json.loads(await resp.text())
+                        assert 1 == query_patch.call_count
+                        resp = await client.get('fledge/asset?exact=true')
+                        assert 200 == resp.status
+                        assert [{'count': 20, 'assetCode': 'sinusoid'},
+                                {'count': 10, 'assetCode': 'random'}] == json.loads(await resp.text())
+                        assert 2 == query_patch.call_count
+
+    async def test_asset_counts_seeded_after_count(self, client):
+        statistics = {'SINUSOID': 20, 'PURGED': 0}
+
+        async def stats_result(table, payload):
+            return {'rows': [{'key': k, 'value': v} for k, v in statistics.items()], 'count': len(statistics)}
+
+        async def count_result(payload):
+            # Readings ingested while counting, the statistics catch up after the count
+            statistics['SINUSOID'] = 25
+            return {'rows': [{'count': 25, 'asset_code': 'sinusoid'}], 'count': 1}
+
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        storage_client_mock = MagicMock(StorageClientAsync)
+        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+            with patch.object(storage_client_mock, 'query_tbl_with_payload', side_effect=stats_result):
+                with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+                    with patch.object(readings_storage_client_mock, 'query', side_effect=count_result):
+                        for _ in range(2):
+                            resp = await client.get('fledge/asset')
+                            assert 200 == resp.status
+                            assert [{'count': 25, 'assetCode': 'sinusoid'}] == json.loads(await resp.text())
+        assert {'SINUSOID': 25, 'PURGED': 0} == browser._AssetCounts.statistics
+
+    async def test_asset_counts_bad_request(self, client):
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+            with patch.object(readings_storage_client_mock, 'query', return_value={'message': 'bad payload'}):
+                resp = await client.get('fledge/asset?exact=true')
+                assert 400 == resp.status
+                assert 'bad payload' == resp.reason
+
+    async def test_asset_counts_statistics_error(self, client):
+        storage_client_mock = MagicMock(StorageClientAsync)
+        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+            with patch.object(storage_client_mock, 'query_tbl_with_payload', return_value={'rows': [{'value': 1}]}):
+                with patch.object(browser._logger, 'error'):
+                    resp = await client.get('fledge/asset')
+                    assert 500 == resp.status
+                    assert "'key'" == resp.reason
+
+    @pytest.mark.parametrize("key, value", [
+        ('PURGED', 5),
+        ('NEWASSET', 1),
+        ('SINUSOID', 1)
+    ])
+    async def test_asset_counts_reconciled(self, client, key, value):
+        statistics = {'SINUSOID': 20, 'PURGED': 0}
+        browser._AssetCounts.seed([{'count': 20, 'asset_code': 'sinusoid'}], dict(statistics))
+        statistics[key] = value
+        counts = {'rows': [{'count': 16, 'asset_code': 'sinusoid'}], 'count': 1}
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        storage_client_mock = MagicMock(StorageClientAsync)
+        stats_rows = {'rows': [{'key': k, 'value': v} for k, v in statistics.items()], 'count': len(statistics)}
+        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+            with patch.object(storage_client_mock, 'query_tbl_with_payload', return_value=stats_rows):
+                with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+                    with patch.object(readings_storage_client_mock, 'query', return_value=counts) as query_patch:
+                        resp = await client.get('fledge/asset')
+                        assert 200 == resp.status
+                        assert [{'count': 16, 'assetCode': 'sinusoid'}] == json.loads(await resp.text())
+                    # A purge, a new statistic or a value going backwards count the readings again
+                    query_patch.assert_called_once()
+        assert statistics == browser._AssetCounts.statistics
+
+    async def test_asset_counts_after_asset_purge(self, client):
+        browser._AssetCounts.seed([{'count': 20, 'asset_code': 'sinusoid'}, {'count': 10, 'asset_code': 'random'}],
+                                  {'SINUSOID': 20, 'RANDOM': 10})
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+            with patch.object(readings_storage_client_mock, 'purge', return_value={'purged': 10}):
+                with patch.object(AuditLogger, 'information', return_value=None):
+                    resp = await client.delete('fledge/asset/random')
+                    assert 200 == resp.status
+        assert browser._AssetCounts.update({'SINUSOID': 20, 'RANDOM': 12})
+        assert [{'count': 20, 'assetCode': 'sinusoid'},
+                {'count': 2, 'assetCode': 'random'}] == browser._AssetCounts.response()
+
+    @pytest.fixture(params=['UTC', 'Asia/Kolkata'])
+    def local_tz(self, request, monkeypatch):
+        monkeypatch.setenv('TZ', request.param)
+        time.tzset()
+        yield request.param
+        monkeypatch.undo()
+        time.tzset()
+
+    @pytest.mark.parametrize("bucket_time", [
+        lambda epoch, size: size * (int(epoch) // size),
+        lambda epoch, size: size * round(int(epoch) / size)
+    ])
+    async def test_asset_readings_with_bucket_size_cached(self, client, bucket_time, local_tz):
+        def _ts(epoch):
+            return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+        now = int(time.time())
+        readings = [(_ts(epoch), epoch % 100) for epoch in (now - 10000 + 7.5 * i for i in range(1300))]
+
+        async def q_result(payload):
+            payload = json.loads(payload)
+            size = int(payload['timebucket']['size'])
+            where = payload['where']
+            conditions = []
+            while 'and' in where:
+                where = where['and']
+                conditions.append((where['condition'], where['value']))
+            buckets = {}
+            for ts, value in readings:
+                if all(ts >= date if condition == '>=' else ts <= date for condition, date in conditions):
+                    epoch = datetime.datetime.strptime(ts, "%Y-%m-%d %H:%M:%S.%f").replace(
+                        tzinfo=datetime.timezone.utc).timestamp()
+                    buckets.setdefault(bucket_time(epoch, size), []).append(value)
+            rows = [{'timestamp': time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(t)), 'min': min(values),
+                     'max': max(values), 'average': sum(values) / len(values)}
+                    for t, values in sorted(buckets.items(), reverse=True)]
+            return {'rows': rows[:payload['limit']] if 'limit' in payload else rows, 'count': len(rows)}
+
+        statistics = {'rows': [{'key': 'PURGED', 'value': 0}], 'count': 1}
+        url = 'fledge/asset/sinusoid/sinusoid/bucket/60?length=3600&start={}'
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        storage_client_mock = MagicMock(StorageClientAsync)
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock), \
+                patch.object(connect, 'get_storage_async', return_value=storage_client_mock), \
+                patch.object(storage_client_mock, 'query_tbl_with_payload', return_value=statistics) as stats_patch:
+            with patch.object(readings_storage_client_mock, 'query', side_effect=q_result) as query_patch:
+                resp = await client.get(url.format(now - 7200.5))
+                assert 200 == resp.status
+                assert 1 == query_patch.call_count
+                for start in (now - 7170.5, now - 7100, now - 6000):
+                    expected = (await q_result(query_patch.call_args_list[0][0][0].replace(
+                        time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now - 7201)),
+                        time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(int(start)))).replace(
+                        time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now - 3601)),
+                        time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(int(start + 3600))))))['rows']
+                    assert 60 == len(expected)
+                    calls = query_patch.call_count
+                    resp = await client.get(url.format(start))
+                    assert 200 == resp.status
+                    assert expected == json.loads(await resp.text())
+                    # Only the buckets at both ends of the window are queried
+                    assert calls + 2 == query_patch.call_count
+                    for args, kwargs in query_patch.call_args_list[calls:]:
+                        assert 'limit' not in json.loads(args[0])
+                with patch.object(readings_storage_client_mock, 'purge', return_value={'purged': 1300}):
+                    with patch.object(AuditLogger, 'information', return_value=None):
+                        resp = await client.delete('fledge/asset/sinusoid')
+                        assert 200 == resp.status
+                calls = query_patch.call_count
+                resp = await client.get(url.format(now - 6000))
+                assert 200 == resp.status
+                assert calls + 1 == query_patch.call_count
+                # Purged by the purge task, which is only seen once the PURGED statistic is read again
+                resp = await client.get(url.format(now - 6000))
+                assert calls + 3 == query_patch.call_count
+                statistics['rows'][0]['value'] = 100
+                resp = await client.get(url.format(now - 6000))
+                assert calls + 5 == query_patch.call_count
+                # Only the PURGED statistic is read, at most every SERIES_CACHE_PURGED_CHECK_SECONDS
+                stats_patch.assert_called_once()
+                args, kwargs = stats_patch.call_args
+                assert {'column': 'key', 'condition': '=', 'value': 'PURGED'} == json.loads(args[1])['where']
+                browser._SeriesCache.purged_expiry = 0
+                resp = await client.get(url.format(now - 6000))
+                assert 200 == resp.status
+                assert calls + 6 == query_patch.call_count
+        assert 0 == browser._SeriesCache.buckets - sum(len(e['rows']) for e in browser._SeriesCache.entries.values())
+
+    @pytest.mark.parametrize("drop", [
+        lambda key: browser._SeriesCache.clear('sinusoid'),
+        lambda key: browser._SeriesCache.store(key, [], 0, 60)
+    ])
+    async def test_bucket_series_entry_dropped_while_querying(self, drop):
+        now = 60 * (int(time.time()) // 60)
+        key = ('sinusoid', 'sinusoid', 60)
+
+        async def query(first, last, limit):
+            rows = [{'timestamp': time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(t)), 'average': t}
+                    for t in range(60 * (last // 60), first - 1, -60)]
+            if limit is None and refresh:
+                # Another request drops or replaces the entry while the ends are queried
+                drop(key)
+            return rows if limit is None else rows[:limit]
+
+        refresh = False
+        with patch.object(browser, '_get_purged', return_value=0):
+            await browser._bucket_series(key, 60, now - 7200, now - 3600, 60, query)
+            entry = browser._SeriesCache.entries[key]
+            assert 0 < len(entry['rows'])
+            refresh = True
+            rows = await browser._bucket_series(key, 60, now - 7000, now - 3400, 60, query)
+        refresh = False
+        assert (await query(now - 7000, now - 3400, 60)) == rows
+        assert entry is not browser._SeriesCache.entries.get(key)
+        assert 0 == browser._SeriesCache.buckets - sum(len(e['rows']) for e in browser._SeriesCache.entries.values())
+        # Extending a dropped series does nothing
+        browser._SeriesCache.clear()
+        browser._SeriesCache.extend(key, [], now)
+        assert {} == browser._SeriesCache.entries
+
+    async def test_asset_datapoints_with_bucket_size_not_cached(self, client, local_tz):
+        # The storage may label the buckets of all the datapoints in local time
+        rows = [{'timestamp': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(1700000000 - 60 * i)),
+                 'sinusoid': {'min': i, 'max': i, 'average': i}} for i in range(60)]
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+            with patch.object(readings_storage_client_mock, 'query',
+                              return_value={'rows': rows, 'count': len(rows)}) as query_patch:
+                for calls in (1, 2):
+                    resp = await client.get('fledge/asset/sinusoid/bucket/60?length=3600&start=1699996400')
+                    assert 200 == resp.status
+                    assert rows == json.loads(await resp.text())
+                    assert calls == query_patch.call_count
+        assert {} == browser._SeriesCache.entries
+
+    async def test_asset_downsampled(self, client):
+        rows = [{'reading': {'sinusoid': math.sin(i / 50), 'state': 'on', 'spike': 5 if i == 777 else 0},
+                 'timestamp': '2024-01-01 00:{:02d}:{:02d}.000000'.format(i // 60 % 60, i % 60)} for i in range(3000)]
+
+        async def q_result(payload, chunk_size=500):
+            for i in range(0, len(rows), chunk_size):
+                yield rows[i:i + chunk_size]
+
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+            with patch.object(readings_storage_client_mock, 'query_iter', side_effect=q_result) as query_patch:
+                resp = await client.get('fledge/asset/sinusoid?hours=1&points=50')
+                assert 200 == resp.status
+                json_response = json.loads(await resp.text())
+            args, kwargs = query_patch.call_args
+            assert {"column": "user_ts", "condition": "newer", "value": 3600} == json.loads(args[0])['where']['and']
+        assert 50 == sum(1 for r in json_response if 'sinusoid' in r['reading'])
+        assert 50 == sum(1 for r in json_response if 'spike' in r['reading'])
+        # Text datapoints are not downsampled, rows keep the selected datapoints only
+        assert all('state' not in r['reading'] for r in json_response)
+        assert {'reading': {'spike': 5}, 'timestamp': rows[777]['timestamp']} in json_response
+        assert rows[0] == dict(json_response[0], reading=rows[0]['reading'])
+
+    async def test_asset_reading_downsampled(self, client):
+        rows = [{'temperature': i % 100, 'timestamp': str(i)} for i in range(1000)]
+
+        async def q_result(payload, chunk_size=500):
+            yield rows
+
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+            with patch.object(readings_storage_client_mock, 'query_iter', side_effect=q_result):
+                resp = await client.get('fledge/asset/fogbench/temperature?minutes=60&points=20&method=minmax')
+                assert 200 == resp.status
+                json_response = json.loads(await resp.text())
+        assert 20 == len(json_response)
+        assert {0, 99} <= {r['temperature'] for r in json_response}
+        assert sorted(json_response, key=lambda r: int(r['timestamp'])) == json_response
+
+    @pytest.mark.parametrize("request_params, message", [
+        ('?points=abc', "points must be an integer greater than or equal to 3"),
+        ('?points=2', "points must be an integer greater than or equal to 3"),
+        ('?points=1&method=minmax', "points must be an integer greater than or equal to 2"),
+        ('?points=10&method=avg', "method must be one of lttb, minmax")
+    ])
+    async def test_bad_downsampling_params(self, client, request_params, message):
+        for url in ('fledge/asset/fogbench', 'fledge/asset/fogbench/temperature'):
+            resp = await client.get(url + request_params)
+            assert 400 == resp.status
+            assert message == resp.reason
+
+    async def test_asset_downsampled_storage_error(self, client):
+        result = {'message': 'ERROR: something went wrong', 'retryable': False, 'entryPoint': 'retrieve'}
+
+        async def q_result(payload, chunk_size=500):
+            raise StorageServerError(200, "OK", result)
+            yield
+
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+            with patch.object(readings_storage_client_mock, 'query_iter', side_effect=q_result):
+                resp = await client.get('fledge/asset/fogbench?points=10')
+                assert 400 == resp.status
+                assert result['message'] == resp.reason
+
     @pytest.mark.skip(reason='TODO: FOGL-3541 rewrite tests')
     @pytest.mark.parametrize("asset_code", [
         "fogbench%2fhumidity",
@@ -18,6 +18,7 @@ from fledge.common.storage_client.storage_client import StorageClientAsync
 from fledge.common.web import middleware
 from fledge.services.core import connect, routes
 from fledge.services.core.api import configuration
+from fledge.services.core.interest_registry import change_callback
 
 
 __author__ = "Ashish Jabble"
@@ -42,6 +43,31 @@ class TestConfiguration:
         yield
         ConfigurationManagerSingleton._shared_state = {}
 
+    async def test_get_cache_statistics(self, client, reset_singleton):
+        storage_client_mock = MagicMock(StorageClientAsync)
+        c_mgr = ConfigurationManager(storage_client_mock)
+        c_mgr._cacheManager.update("cat1", "desc1", {})
+        assert "cat1" in c_mgr._cacheManager
+        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+            resp = await client.get('/fledge/configuration/cache')
+            assert 200 == resp.status
+            r = await resp.text()
+            json_response = json.loads(r)
+            assert 1 == json_response['size']
+            assert 1 == json_response['hit']
+            assert 0 == json_response['miss']
+            assert 30 == json_response['maxSize']
+
+    async def test_get_notification_metrics(self, client):
+        metrics = {"sent": 4, "failed": 1, "coalesced": 2, "pending": 0, "latencyTotal": 0.5,
+                   "latencyAverage": 0.1, "latencyMax": 0.2}
+        with patch.object(change_callback, 'metrics', return_value=metrics) as patch_metrics:
+            resp = await client.get('/fledge/configuration/notifications')
+            assert 200 == resp.status
+            r = await resp.text()
+            assert metrics == json.loads(r)
+        patch_metrics.assert_called_once_with()
+
     async def test_get_categories(self, client):
         async def async_mock():
             return [('rest_api', 'User REST API', 'API'), ('service', 'Service configuration', 'SERV')]
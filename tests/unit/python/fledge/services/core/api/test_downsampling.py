@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test services/core/api/downsampling.py """
+
+import math
+
+import pytest
+
+from fledge.services.core.api.downsampling import Downsampler
+
+__author__ = "agent"
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+def _downsample(values, points, method):
+    sampler = Downsampler(points, method)
+    for index, value in enumerate(values):
+        sampler.add('x', index, value, "row{}".format(index))
+    return sampler, sampler.result().get('x', [])
+
+
+class TestDownsampler:
+
+    @pytest.mark.parametrize("points, method, message", [
+        (10, 'avg', "method must be one of lttb, minmax"),
+        (2, 'lttb', "points must be an integer greater than or equal to 3"),
+        (1, 'minmax', "points must be an integer greater than or equal to 2"),
+        (None, 'lttb', "points must be an integer greater than or equal to 3"),
+        ("10", 'lttb', "points must be an integer greater than or equal to 3"),
+        (True, 'minmax', "points must be an integer greater than or equal to 2")
+    ])
+    def test_bad_params(self, points, method, message):
+        with pytest.raises(ValueError) as excinfo:
+            Downsampler(points, method)
+        assert message == str(excinfo.value)
+
+    @pytest.mark.parametrize("value, expected", [
+        (1, True), (-2.5, True), (True, False), ("1", False), (None, False), (float('nan'), False), ({"a": 1}, False)
+    ])
+    def test_is_value(self, value, expected):
+        assert expected is Downsampler.is_value(value)
+
+    @pytest.mark.parametrize("method", ['lttb', 'minmax'])
+    def test_fewer_values_than_points(self, method):
+        sampler, points = _downsample([3, 1, 2], 4, method)
+        assert [(0, 3, "row0"), (1, 1, "row1"), (2, 2, "row2")] == points
+
+    def test_lttb(self):
+        values = [math.sin(i / 100) for i in range(100000)]
+        values[54321] = 10
+        sampler, points = _downsample(values, 200, 'lttb')
+        assert 200 == len(points)
+        assert (0, values[0], "row0") == points[0]
+        assert (99999, values[-1], "row99999") == points[-1]
+        # Points are in stream order and the spike is kept
+        assert sorted(p[0] for p in points) == [p[0] for p in points]
+        assert (54321, 10, "row54321") in points
+        # Only the min and max points of at most 2 * points buckets are held
+        assert len(sampler._series['x'].buckets) <= 400
+
+    def test_minmax(self):
+        values = [i % 50 for i in range(10000)]
+        values[1234] = -1
+        values[8765] = 100
+        sampler, points = _downsample(values, 20, 'minmax')
+        assert len(points) <= 20
+        assert sorted(p[0] for p in points) == [p[0] for p in points]
+        assert (1234, -1, "row1234") in points
+        assert (8765, 100, "row8765") in points
+        assert len(sampler._series['x'].buckets) <= 40
+
+    def test_series_are_independent(self):
+        sampler = Downsampler(3, 'lttb')
+        for index in range(10):
+            sampler.add('a', index, index, index)
+            if index % 2:
+                sampler.add('b', index, -index, index)
+        result = sampler.result()
+        assert [0, 9] == [result['a'][0][0], result['a'][-1][0]]
+        assert [1, 9] == [result['b'][0][0], result['b'][-1][0]]
+        assert 3 == len(result['a']) == len(result['b'])
@@ -982,6 +982,16 @@ class TestSchedules:
                                  {'name': 'INTERVAL', 'index': 3},
                                  {'name': 'MANUAL', 'index': 4}]} == json_response
 
+    async def test_get_schedule_metrics(self, client):
+        metrics = {'dispatched': 2, 'averageLatency': 0.25, 'maxLatency': 0.4, 'lastLatency': 0.1,
+                   'pendingTimers': 5}
+        with patch.object(server.Server.scheduler, 'dispatch_metrics', return_value=metrics) as patch_metrics:
+            resp = await client.get('/fledge/schedule/metrics')
+            assert 200 == resp.status
+            result = await resp.text()
+            assert metrics == json.loads(result)
+        patch_metrics.assert_called_once_with()
+
 
 class TestTasks:
     _random_uuid = uuid.uuid4()
@@ -1140,15 +1150,17 @@ class TestTasks:
         else:
             _rv1 = asyncio.ensure_future(mock_coro_response(response))
         
-        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
-            with patch.object(storage_client_mock, 'query_tbl_with_payload', return_value=_rv1):
-                resp = await client.get('/fledge/task/latest{}'.format(request_params))
-                assert 200 == resp.status
-                result = await resp.text()
-                json_response = json.loads(result)
-                assert {'tasks': [{'reason': '', 'name': 'bla', 'processName': 'bla',
-                                   'state': 'Complete', 'exitCode': '0', 'endTime': '2018',
-                                   'pid': '1', 'startTime': '2018', 'id': '1'}]} == json_response
+        with patch.object(server.Server.scheduler, 'flush_tasks') as patch_flush:
+            with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+                with patch.object(storage_client_mock, 'query_tbl_with_payload', return_value=_rv1):
+                    resp = await client.get('/fledge/task/latest{}'.format(request_params))
+                    assert 200 == resp.status
+                    result = await resp.text()
+                    json_response = json.loads(result)
+                    assert {'tasks': [{'reason': '', 'name': 'bla', 'processName': 'bla',
+                                       'state': 'Complete', 'exitCode': '0', 'endTime': '2018',
+                                       'pid': '1', 'startTime': '2018', 'id': '1'}]} == json_response
+        patch_flush.assert_called_once_with()
 
     @pytest.mark.parametrize("request_params", ['', '?name=not_exist'])
     async def test_get_tasks_latest_no_task_exception(self, client, request_params):
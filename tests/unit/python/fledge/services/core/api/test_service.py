@@ -35,10 +35,10 @@ __version__ = "${VERSION}"
 
 class TestService:
     def setup_method(self):
-        ServiceRegistry._registry = list()
+        ServiceRegistry.reset()
 
     def teardown_method(self):
-        ServiceRegistry._registry = list()
+        ServiceRegistry.reset()
 
     @pytest.fixture
     def client(self, loop, test_client):
@@ -1124,6 +1124,23 @@ class TestService:
             assert json_response == {'services': exp_result}
         assert 2 == mockwalk.call_count
 
+    async def test_get_monitor_metrics(self, client):
+        metrics = {'rounds': 3, 'servicesChecked': 2, 'unresponsive': 0, 'lastRoundDuration': 0.01,
+                   'maxRoundDuration': 0.02, 'averageRoundDuration': 0.015}
+        with patch.object(server.Server, 'service_monitor', MagicMock()) as patch_monitor:
+            patch_monitor.metrics.return_value = metrics
+            resp = await client.get('/fledge/service/monitor/metrics')
+            assert 200 == resp.status
+            result = await resp.text()
+            assert metrics == json.loads(result)
+        patch_monitor.metrics.assert_called_once_with()
+
+    async def test_get_monitor_metrics_not_running(self, client):
+        with patch.object(server.Server, 'service_monitor', None):
+            resp = await client.get('/fledge/service/monitor/metrics')
+            assert 404 == resp.status
+            assert 'Service monitor is not running' == resp.reason
+
     p1 = '{"name": "FL Agent", "type": "management"}'
     p2 = '{"name": "FL #1", "type": "management", "enabled": false}'
     p3 = '{"name": "FL_MGT", "type": "management", "enabled": true}'
@@ -32,10 +32,12 @@ __version__ = "${VERSION}"
 
 class TestTask:
     def setup_method(self):
-        ServiceRegistry._registry = list()
+        ServiceRegistry.reset()
+        server.Server.scheduler = Scheduler(None, None)
 
     def teardown_method(self):
-        ServiceRegistry._registry = list()
+        ServiceRegistry.reset()
+        server.Server.scheduler = None
 
     @pytest.fixture
     def client(self, loop, test_client):
@@ -339,13 +341,33 @@ class TestTask:
             with patch.object(common, 'load_and_fetch_python_plugin_info', side_effect=[mock_plugin_info]):
                 with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
                     with patch.object(storage_client_mock, 'query_tbl_with_payload', side_effect=q_result):
-                        resp = await client.post('/fledge/scheduled/task', data=json.dumps(data))
-                        result = await resp.text()
-                        assert resp.status == expected_http_code
-                        assert result == expected_message
-                        print(expected_message)
+                        with patch.object(server.Server.scheduler, 'flush_tasks') as patch_flush:
+                            resp = await client.post('/fledge/scheduled/task', data=json.dumps(data))
+                            result = await resp.text()
+                            assert resp.status == expected_http_code
+                            assert result == expected_message
+                            print(expected_message)
+                        # The queued tasks rows are written before the tasks are checked
+                        patch_flush.assert_called_once_with()
         assert 1 == patch_logger.call_count
 
+    async def test_delete_task_entry_with_schedule_id(self):
+        calls = []
+
+        async def flush_tasks():
+            calls.append('flush')
+
+        async def delete_from_tbl(table, payload):
+            calls.append(table)
+
+        storage_client_mock = MagicMock(StorageClientAsync)
+        with patch.object(server.Server.scheduler, 'flush_tasks', side_effect=flush_tasks):
+            with patch.object(storage_client_mock, 'delete_from_tbl', side_effect=delete_from_tbl):
+                await task.delete_task_entry_with_schedule_id(
+                    storage_client_mock, UUID('2129cc95-c841-441a-ad39-6469a87dbc8b'))
+        # A queued insert is written before the delete, not after
+        assert ['flush', 'tasks'] == calls
+
     async def test_add_task_with_config(self, client):
         async def async_mock_get_schedule():
             schedule = TimedSchedule()
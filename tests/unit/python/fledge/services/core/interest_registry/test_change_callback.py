@@ -1,7 +1,8 @@
-from unittest.mock import MagicMock, patch, Mock, call
+from unittest.mock import AsyncMock, MagicMock, patch, Mock, call
 import pytest
 import sys
 import asyncio
+import json
 
 import aiohttp
 from fledge.common.configuration_manager import ConfigurationManager
@@ -21,11 +22,11 @@ class TestChangeCallback:
 
     def setup_method(self):
         InterestRegistrySingleton._shared_state = {}
-        ServiceRegistry._registry = []
+        ServiceRegistry.reset()
 
     def teardown_method(self):
         InterestRegistrySingleton._shared_state = {}
-        ServiceRegistry._registry = []
+        ServiceRegistry.reset()
 
     @pytest.mark.asyncio
     async def test_run_good(self):
@@ -263,3 +264,119 @@ class TestChangeCallback:
                 [call('http://saddress1:1/fledge/change', data='{"category": "catname1", "items": null}',
                       headers={'content-type': 'application/json'})])
         cm_get_patch.assert_called_once_with('catname1')
+
+    @pytest.mark.asyncio
+    async def test_run_coalesces_changes_of_same_category(self):
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        cfg_mgr = ConfigurationManager(storage_client_mock)
+
+        with patch.object(ServiceRegistry._logger, 'info'):
+            s_id_1 = ServiceRegistry.register('sname1', 'Southbound', 'saddress1', 1, 1, 'http')
+            s_id_2 = ServiceRegistry.register('sname2', 'Southbound', 'saddress2', 2, 2, 'http')
+        i_reg = InterestRegistry(cfg_mgr)
+        i_reg.register(s_id_1, 'catname1')
+        i_reg.register(s_id_2, 'catname1')
+
+        class AsyncSessionContextManagerMock(MagicMock):
+            async def __aenter__(self):
+                client_response_mock = MagicMock(spec=aiohttp.ClientResponse)
+                client_response_mock.text = AsyncMock(return_value=None)
+                client_response_mock.status = 200
+                return client_response_mock
+
+            async def __aexit__(self, *args):
+                return None
+
+        before = cb.metrics()
+        values = [{"value": 1}, {"value": 2}, {"value": 3}]
+        with patch.object(ConfigurationManager, 'get_category_all_items', side_effect=values) as cm_get_patch:
+            with patch.object(aiohttp.ClientSession, 'post', return_value=AsyncSessionContextManagerMock()) as post_patch:
+                # Rapid successive changes, all made within the coalescing window
+                await asyncio.gather(cb.run('catname1'), cb.run('catname1'), cb.run('catname1'))
+            assert 3 == cm_get_patch.call_count
+        # Each service is notified once, with the latest value only
+        data = '{"category": "catname1", "items": {"value": 3}}'
+        assert 2 == post_patch.call_count
+        post_patch.assert_has_calls([call('http://saddress1:1/fledge/change', data=data, headers={'content-type': 'application/json'}),
+                                     call('http://saddress2:2/fledge/change', data=data, headers={'content-type': 'application/json'})],
+                                    any_order=True)
+        after = cb.metrics()
+        assert 2 == after['sent'] - before['sent']
+        assert 4 == after['coalesced'] - before['coalesced']
+        assert 0 == after['pending']
+
+    @pytest.mark.asyncio
+    async def test_run_child_create_metrics(self):
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        cfg_mgr = ConfigurationManager(storage_client_mock)
+
+        with patch.object(ServiceRegistry._logger, 'info'):
+            s_id_1 = ServiceRegistry.register('sname1', 'Southbound', 'saddress1', 1, 1, 'http')
+            s_id_2 = ServiceRegistry.register('sname2', 'Southbound', 'saddress2', 2, 2, 'http')
+        i_reg = InterestRegistry(cfg_mgr)
+        i_reg.register(s_id_1, 'parent')
+        i_reg.register(s_id_2, 'parent')
+
+        class AsyncSessionContextManagerMock:
+            def __init__(self, status):
+                self.status = status
+
+            async def __aenter__(self):
+                client_response_mock = MagicMock(spec=aiohttp.ClientResponse)
+                client_response_mock.text = AsyncMock(return_value=None)
+                client_response_mock.status = self.status
+                client_response_mock.reason = 'Internal Server Error'
+                return client_response_mock
+
+            async def __aexit__(self, *args):
+                return None
+
+        def post(url, **kwargs):
+            # The second service fails
+            return AsyncSessionContextManagerMock(500 if 'saddress2' in url else 200)
+
+        before = cb.metrics()
+        with patch.object(ConfigurationManager, 'get_category_all_items', return_value=None):
+            with patch.object(aiohttp.ClientSession, 'post', side_effect=post) as post_patch:
+                with patch.object(cb._LOGGER, 'error') as patch_logger:
+                    await cb.run_child('parent', ['child1', 'child2'], 'c')
+        # Every child is sent to every interested service
+        assert 4 == post_patch.call_count
+        assert {('http://saddress1:1/fledge/child_create', 'child1'), ('http://saddress1:1/fledge/child_create', 'child2'),
+                ('http://saddress2:2/fledge/child_create', 'child1'), ('http://saddress2:2/fledge/child_create', 'child2')} == \
+            {(args[0], json.loads(kwargs['data'])['category']) for args, kwargs in post_patch.call_args_list}
+        assert 2 == patch_logger.call_count
+        patch_logger.assert_called_with('Server error code: %d, reason: %s', 500, 'Internal Server Error')
+        after = cb.metrics()
+        assert 2 == after['sent'] - before['sent']
+        assert 2 == after['failed'] - before['failed']
+        assert after['latencyMax'] >= after['latencyAverage'] >= 0
+
+    @pytest.mark.asyncio
+    async def test_run_child_create_does_not_coalesce_parents(self):
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        cfg_mgr = ConfigurationManager(storage_client_mock)
+
+        with patch.object(ServiceRegistry._logger, 'info'):
+            s_id_1 = ServiceRegistry.register('sname1', 'Southbound', 'saddress1', 1, 1, 'http')
+        i_reg = InterestRegistry(cfg_mgr)
+        i_reg.register(s_id_1, 'parent1')
+        i_reg.register(s_id_1, 'parent2')
+
+        class AsyncSessionContextManagerMock(MagicMock):
+            async def __aenter__(self):
+                client_response_mock = MagicMock(spec=aiohttp.ClientResponse)
+                client_response_mock.text = AsyncMock(return_value=None)
+                client_response_mock.status = 200
+                return client_response_mock
+
+            async def __aexit__(self, *args):
+                return None
+
+        with patch.object(ConfigurationManager, 'get_category_all_items', return_value=None):
+            with patch.object(aiohttp.ClientSession, 'post', return_value=AsyncSessionContextManagerMock()) as post_patch:
+                # The same child added to two parents within the coalescing window
+                await asyncio.gather(cb.run_child('parent1', ['child'], 'c'), cb.run_child('parent2', ['child'], 'c'))
+        assert 2 == post_patch.call_count
+        assert {'parent1', 'parent2'} == {json.loads(kwargs['data'])['parent_category']
+                                          for args, kwargs in post_patch.call_args_list}
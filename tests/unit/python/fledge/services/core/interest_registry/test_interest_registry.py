@@ -191,3 +191,23 @@ class TestInterestRegistry:
         assert ret_val[0]._registration_id is id_2_2
         assert ret_val[0]._microservice_uuid is 'muuid2'
         assert ret_val[0]._category_name is 'catname2'
+
+    def test_indexes_follow_register_and_unregister(self, reset_singleton):
+        configuration_manager_mock = MagicMock(spec=ConfigurationManager)
+        i_reg = InterestRegistry(configuration_manager_mock)
+        id_1_1 = i_reg.register('muuid1', 'catname1')
+        id_2_1 = i_reg.register('muuid2', 'catname1')
+        assert [id_1_1, id_2_1] == [i._registration_id for i in i_reg.get(category_name='catname1')]
+        assert [id_2_1] == [i._registration_id for i in i_reg.get(registration_id=id_2_1)]
+
+        i_reg.unregister(id_1_1)
+        assert [id_2_1] == [i._registration_id for i in i_reg.get(category_name='catname1')]
+        with pytest.raises(interest_registry_exceptions.DoesNotExist):
+            i_reg.get(microservice_uuid='muuid1')
+        assert 'muuid1' not in i_reg._indexes['_microservice_uuid']
+
+        # A new registry starts with empty indexes
+        InterestRegistrySingleton._shared_state = {}
+        i_reg = InterestRegistry(configuration_manager_mock)
+        with pytest.raises(interest_registry_exceptions.DoesNotExist):
+            i_reg.get(category_name='catname1')
@@ -279,6 +279,144 @@ class TestScheduler:
         assert 'COAP listener south' in args1
         assert 'OMF to PI north' in args2
 
+    @pytest.mark.asyncio
+    async def test__check_schedules_pops_due_schedules(self, mocker):
+        # GIVEN
+        scheduler = Scheduler()
+        mocker.patch.object(scheduler._logger, "info")
+        mocker.patch.multiple(scheduler, _max_running_tasks=10)
+        start_task = mocker.patch.object(scheduler, '_start_task', return_value=asyncio.ensure_future(mock()))
+        now = time.time()
+        schedules = []
+        for i, next_start_time in enumerate([now + 100, now - 1, now + 30]):
+            schedule = scheduler._ScheduleRow(id=uuid.uuid4(), name='schedule {}'.format(i),
+                                              type=Schedule.Type.INTERVAL, time=None, day=None,
+                                              repeat=datetime.timedelta(seconds=60), repeat_seconds=60,
+                                              exclusive=False, enabled=True, process_name='purge')
+            schedule_execution = scheduler._ScheduleExecution()
+            schedule_execution.next_start_time = next_start_time
+            scheduler._schedules[schedule.id] = schedule
+            scheduler._schedule_executions[schedule.id] = schedule_execution
+            scheduler._push_schedule(schedule.id, schedule_execution)
+            schedules.append(schedule)
+        # The start time of the third schedule changes, its first heap entry is now stale
+        scheduler._schedule_executions[schedules[2].id].next_start_time = now + 50
+        scheduler._push_schedule(schedules[2].id, scheduler._schedule_executions[schedules[2].id])
+
+        # WHEN
+        earliest_start_time = await scheduler._check_schedules()
+
+        # THEN
+        start_task.assert_called_once_with(schedules[1])
+        assert now + 50 == earliest_start_time
+        assert now + 59 == scheduler._schedule_executions[schedules[1].id].next_start_time
+        assert [now + 50, now + 59, now + 100] == sorted(entry[0] for entry in scheduler._schedule_heap)
+        metrics = scheduler.dispatch_metrics()
+        assert 1 == metrics['dispatched']
+        assert 1 <= metrics['lastLatency'] == metrics['maxLatency'] == metrics['averageLatency'] < 2
+        assert 3 == metrics['pendingTimers']
+
+    @pytest.mark.asyncio
+    async def test__check_schedules_queued_task(self, mocker):
+        # GIVEN
+        scheduler = Scheduler()
+        mocker.patch.multiple(scheduler, _max_running_tasks=10)
+        start_task = mocker.patch.object(scheduler, '_start_task', return_value=asyncio.ensure_future(mock()))
+        schedule = scheduler._ScheduleRow(id=uuid.uuid4(), name='manual', type=Schedule.Type.MANUAL, time=None,
+                                          day=None, repeat=None, repeat_seconds=None, exclusive=True, enabled=True,
+                                          process_name='purge')
+        schedule_execution = scheduler._ScheduleExecution()
+        schedule_execution.start_now = True
+        scheduler._schedules[schedule.id] = schedule
+        scheduler._schedule_executions[schedule.id] = schedule_execution
+        scheduler._schedules_to_check[schedule.id] = True
+
+        # WHEN
+        earliest_start_time = await scheduler._check_schedules()
+
+        # THEN
+        start_task.assert_called_once_with(schedule)
+        assert earliest_start_time is None
+        assert schedule_execution.start_now is False
+        assert {} == scheduler._schedules_to_check
+        # Manual starts are not dispatch latencies
+        assert 0 == scheduler.dispatch_metrics()['dispatched']
+
+    @pytest.mark.asyncio
+    async def test__write_tasks(self, mocker):
+        # GIVEN
+        scheduler = Scheduler()
+        scheduler._storage_async = MockStorageAsync(core_management_host=None, core_management_port=None)
+        mocker.patch.object(scheduler, '_TASK_WRITE_INTERVAL_SECONDS', 3600)
+        insert = mocker.patch.object(scheduler._storage_async, 'insert_into_tbl',
+                                     return_value=asyncio.ensure_future(mock()))
+        update = mocker.patch.object(scheduler._storage_async, 'update_tbl',
+                                     return_value=asyncio.ensure_future(mock()))
+        delete = mocker.patch.object(scheduler._storage_async, 'delete_from_tbl',
+                                     return_value=asyncio.ensure_future(mock()))
+        scheduler._latest_task_only_schedules = {'purge'}
+        for task_id, schedule_name in (('1', 'purge'), ('2', 'stats collection')):
+            scheduler._queue_task_insert(dict(id=task_id, schedule_name=schedule_name, state=1))
+        # Written before the first write of the queued rows, folded into the row to insert
+        scheduler._queue_task_update('1', 'purge', state=2, exit_code=0)
+        # Written after the row was inserted
+        scheduler._queue_task_update('0', 'stats collection', state=3, exit_code=-15)
+        assert scheduler._write_tasks_task is not None
+
+        # WHEN
+        await scheduler._write_tasks()
+
+        # THEN
+        insert.assert_called_once_with('tasks', {'inserts': [
+            {'id': '1', 'schedule_name': 'purge', 'state': 2, 'exit_code': 0},
+            {'id': '2', 'schedule_name': 'stats collection', 'state': 1}]})
+        update.assert_called_once_with('tasks', {'updates': [
+            {'values': {'state': 3, 'exit_code': -15},
+             'where': {'column': 'id', 'condition': '=', 'value': '0'}}]})
+        args, _ = delete.call_args
+        assert 'tasks' == args[0]
+        assert {'column': 'schedule_name', 'condition': '=', 'value': 'purge',
+                'and': {'column': 'state', 'condition': '!=', 'value': 1,
+                        'and': {'column': 'id', 'condition': '!=', 'value': '1'}}} == json.loads(args[1])['where']
+        assert {} == scheduler._task_inserts == scheduler._task_updates == scheduler._latest_tasks
+
+        # Nothing left to write
+        await scheduler._write_tasks()
+        assert 1 == insert.call_count
+        scheduler._write_tasks_task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_flush_tasks_waits_for_write_in_progress(self, mocker):
+        # GIVEN
+        scheduler = Scheduler()
+        scheduler._storage_async = MockStorageAsync(core_management_host=None, core_management_port=None)
+        mocker.patch.object(scheduler, '_TASK_WRITE_INTERVAL_SECONDS', 3600)
+        written = []
+        release = asyncio.Event()
+
+        async def insert_into_tbl(table, payload):
+            ids = [row['id'] for row in payload['inserts']]
+            written.append(('start', ids))
+            await release.wait()
+            written.append(('end', ids))
+
+        mocker.patch.object(scheduler._storage_async, 'insert_into_tbl', side_effect=insert_into_tbl)
+        scheduler._queue_task_insert(dict(id='1', schedule_name='purge', state=1))
+        write = asyncio.ensure_future(scheduler._write_tasks())
+        await asyncio.sleep(0)
+        scheduler._queue_task_insert(dict(id='2', schedule_name='purge', state=1))
+
+        # WHEN
+        flush = asyncio.ensure_future(scheduler.flush_tasks())
+        await asyncio.sleep(0)
+        release.set()
+        await flush
+
+        # THEN
+        assert write.done()
+        assert [('start', ['1']), ('end', ['1']), ('start', ['2']), ('end', ['2'])] == written
+        scheduler._write_tasks_task.cancel()
+
     @pytest.mark.asyncio
     @pytest.mark.skip("_scheduler_loop() not suitable for unit testing. Will be tested during System tests.")
     async def test__scheduler_loop(self, mocker):
@@ -510,6 +648,13 @@ class TestScheduler:
                         "default": str(Scheduler._DEFAULT_MAX_COMPLETED_TASK_AGE_DAYS),
                         "value": str(Scheduler._DEFAULT_MAX_COMPLETED_TASK_AGE_DAYS)
                     },
+                    "latest_task_only_schedules": {
+                        "description": "Comma separated names of the schedules of which only the latest finished "
+                                       "task is kept in the tasks table",
+                        "type": "string",
+                        "default": "",
+                        "value": "stats collection, purge,"
+                    },
             }
         
         # Changed in version 3.8: patch() now returns an AsyncMock if the target is an async function.
@@ -535,6 +680,7 @@ class TestScheduler:
         assert 1 == get_cat.call_count
         assert scheduler._max_running_tasks is not None
         assert scheduler._max_completed_task_age is not None
+        assert {'stats collection', 'purge'} == scheduler._latest_task_only_schedules
 
     @pytest.mark.asyncio
     async def test_start(self, mocker):
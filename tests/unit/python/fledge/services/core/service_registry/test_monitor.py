@@ -23,10 +23,10 @@ __version__ = "${VERSION}"
 class TestMonitor:
 
     def setup_method(self):
-        ServiceRegistry._registry = []
+        ServiceRegistry.reset()
 
     def teardown_method(self):
-        ServiceRegistry._registry = []
+        ServiceRegistry.reset()
 
     @pytest.mark.asyncio
     async def test__monitor_good_uptime(self):
@@ -141,3 +141,55 @@ class TestMonitor:
                 assert excinfo.type in [TestMonitorException, TypeError]
 
         assert ServiceRegistry.get(idx=s_id_1)[0]._status is ServiceRecord.Status.Failed
+
+    @pytest.mark.asyncio
+    async def test__monitor_checks_services_concurrently(self):
+        class TestMonitorException(Exception):
+            pass
+
+        with patch.object(ServiceRegistry._logger, 'info'):
+            for i in range(4):
+                ServiceRegistry.register('sname{}'.format(i), 'Southbound', 'saddress', i + 1, i + 1, 'http')
+        monitor = Monitor()
+        monitor._sleep_interval = Monitor._DEFAULT_SLEEP_INTERVAL
+        monitor._max_attempts = Monitor._DEFAULT_MAX_ATTEMPTS
+        monitor._max_concurrent_checks = 2
+        in_flight = []
+        max_in_flight = []
+
+        async def ping(service_record, check_count):
+            in_flight.append(service_record._name)
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(0.05)
+            in_flight.remove(service_record._name)
+            return service_record._name != 'sname0'
+
+        with patch.object(Monitor, '_ping_service', side_effect=ping):
+            with patch.object(Monitor, '_sleep', side_effect=TestMonitorException()) as patch_sleep:
+                with pytest.raises(TestMonitorException):
+                    await monitor._monitor_loop()
+        # no more than max_concurrent_checks pings at the same time
+        assert 2 == max(max_in_flight)
+        metrics = monitor.metrics()
+        assert 1 == metrics['rounds']
+        assert 4 == metrics['servicesChecked']
+        assert 1 == metrics['unresponsive']
+        # two waves of two concurrent pings
+        assert 0.1 <= metrics['lastRoundDuration'] < 1
+        assert metrics['lastRoundDuration'] == metrics['maxRoundDuration'] == metrics['averageRoundDuration']
+        # the round duration is taken off the sleep interval
+        args, kwargs = patch_sleep.call_args
+        assert Monitor._DEFAULT_SLEEP_INTERVAL - 1 < args[0] <= Monitor._DEFAULT_SLEEP_INTERVAL - 0.1
+
+    def test__check_offset(self):
+        with patch.object(ServiceRegistry._logger, 'info'):
+            s_id_1 = ServiceRegistry.register('sname1', 'Southbound', 'saddress1', 1, 1, 'http')
+        service_record = ServiceRegistry.get(idx=s_id_1)[0]
+        monitor = Monitor()
+        monitor._sleep_interval = 5
+        assert 0 == monitor._check_offset(service_record)
+        monitor._jitter = 10
+        offset = monitor._check_offset(service_record)
+        assert 0 <= offset <= 0.5
+        # a service keeps its offset from one round to the next
+        assert offset == monitor._check_offset(service_record)
@@ -19,10 +19,10 @@ __version__ = "${VERSION}"
 class TestServiceRegistry:
 
     def setup_method(self):
-        ServiceRegistry._registry = list()
+        ServiceRegistry.reset()
 
     def teardown_method(self):
-        ServiceRegistry._registry = list()
+        ServiceRegistry.reset()
 
     def test_register(self):
         with patch.object(ServiceRegistry._logger, 'info') as log_info:
@@ -151,3 +151,46 @@ class TestServiceRegistry:
                 assert 0 == len(ServiceRegistry._registry)
             assert 0 == log_info.call_count
         assert excinfo.type is DoesNotExist
+
+    def test_lookups_follow_register_and_remove(self):
+        with patch.object(ServiceRegistry._logger, 'info'):
+            s_id_1 = ServiceRegistry.register("sname1", "Southbound", "127.0.0.1", 1001, 2001, 'http')
+            s_id_2 = ServiceRegistry.register("sname2", "Southbound", "127.0.0.1", 1002, 2002, 'http')
+            s_id_3 = ServiceRegistry.register("sname3", "Northbound", "127.0.0.1", 1003, 2003, 'http')
+        assert [s_id_1, s_id_2] == [s._id for s in ServiceRegistry.get(s_type="Southbound")]
+        assert [s_id_2] == [s._id for s in ServiceRegistry.get(name="sname2")]
+        assert [s_id_3] == [s._id for s in ServiceRegistry.get(idx=s_id_3)]
+        # Like before, the last given criteria wins
+        assert [s_id_3] == [s._id for s in ServiceRegistry.get(idx=s_id_1, s_type="Northbound")]
+        assert [s_id_1] == [s._id for s in ServiceRegistry.filter_by_name_and_type("sname1", "Southbound")]
+        with pytest.raises(DoesNotExist):
+            ServiceRegistry.filter_by_name_and_type("sname1", "Northbound")
+        assert ServiceRegistry.check_address_and_port("127.0.0.1", 1002) is True
+        assert ServiceRegistry.check_address_and_mgt_port("127.0.0.1", 2002) is True
+        assert ServiceRegistry.check_address_and_port("127.0.0.1", 2002) is False
+
+        ServiceRegistry.remove_from_registry(s_id_2)
+        assert [s_id_1] == [s._id for s in ServiceRegistry.get(s_type="Southbound")]
+        with pytest.raises(DoesNotExist):
+            ServiceRegistry.get(name="sname2")
+        assert ServiceRegistry.check_address_and_port("127.0.0.1", 1002) is False
+        assert ServiceRegistry.check_address_and_mgt_port("127.0.0.1", 2002) is False
+
+    def test_failed_service_frees_its_address_and_port(self, mocker):
+        mocker.patch.object(InterestRegistry, '__init__', return_value=None)
+        mocker.patch.object(InterestRegistry, 'get', return_value=list())
+        with patch.object(ServiceRegistry._logger, 'info'):
+            s_id = ServiceRegistry.register("sname1", "Southbound", "127.0.0.1", 1001, 2001, 'http')
+            ServiceRegistry.mark_as_failed(s_id)
+        assert ServiceRegistry.check_address_and_port("127.0.0.1", 1001) is False
+        assert ServiceRegistry.check_address_and_mgt_port("127.0.0.1", 2001) is False
+
+    def test_reset(self):
+        with patch.object(ServiceRegistry._logger, 'info'):
+            ServiceRegistry.register("sname1", "Southbound", "127.0.0.1", 1001, 2001, 'http')
+        ServiceRegistry.reset()
+        with pytest.raises(DoesNotExist):
+            ServiceRegistry.get(name="sname1")
+        with patch.object(ServiceRegistry._logger, 'info'):
+            s_id = ServiceRegistry.register("sname1", "Southbound", "127.0.0.1", 1001, 2001, 'http')
+        assert [s_id] == [s._id for s in ServiceRegistry.get(name="sname1")]
@@ -10,7 +10,8 @@ import pytest
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
 from fledge.services.core.service_registry.exceptions import DoesNotExist
 from fledge.services.core import connect
-from fledge.common.storage_client.storage_client import StorageClientAsync
+from fledge.common.storage_client.storage_client import StorageClientAsync, ReadingsStorageClientAsync
+from fledge.services.core.interest_registry.interest_registry import InterestRegistry
 
 __author__ = "Ashish Jabble"
 __copyright__ = "Copyright (c) 2017 OSIsoft, LLC"
@@ -21,10 +22,10 @@ __version__ = "${VERSION}"
 class TestConnect:
     """ Storage connection"""
     def setup_method(self):
-        ServiceRegistry._registry = []
+        ServiceRegistry.reset()
 
     def teardown_method(self):
-        ServiceRegistry._registry = []
+        ServiceRegistry.reset()
 
     def test_get_storage(self):
         with patch.object(ServiceRegistry._logger, 'info') as log_info:
@@ -57,3 +58,39 @@ class TestConnect:
             connect.get_storage_async()
         assert "DoesNotExist" in str(excinfo)
         assert 1 == mock_logger.error.call_count
+
+    def test_storage_clients_are_cached(self):
+        with patch.object(ServiceRegistry._logger, 'info'):
+            ServiceRegistry.register("Fledge Storage", "Storage", "127.0.0.1", 37449, 37843)
+        storage_client = connect.get_storage_async()
+        assert storage_client is connect.get_storage_async()
+        readings_client = connect.get_readings_async()
+        assert isinstance(readings_client, ReadingsStorageClientAsync)
+        assert readings_client is connect.get_readings_async()
+        assert readings_client is not storage_client
+
+    def test_storage_client_cache_invalidation(self, mocker):
+        mocker.patch.object(InterestRegistry, '__init__', return_value=None)
+        mocker.patch.object(InterestRegistry, 'get', return_value=list())
+        with patch.object(ServiceRegistry._logger, 'info'):
+            s_id = ServiceRegistry.register("Fledge Storage", "Storage", "127.0.0.1", 37449, 37843)
+        storage_client = connect.get_storage_async()
+        readings_client = connect.get_readings_async()
+
+        # The storage service registers again, on another port
+        with patch.object(ServiceRegistry._logger, 'info'):
+            ServiceRegistry.unregister(s_id)
+            ServiceRegistry.register("Fledge Storage", "Storage", "127.0.0.1", 37450, 37844)
+        new_storage_client = connect.get_storage_async()
+        assert new_storage_client is not storage_client
+        assert '127.0.0.1:37450' == new_storage_client.base_url
+        assert '127.0.0.1:37844' == new_storage_client.management_api_url
+        assert connect.get_readings_async() is not readings_client
+
+        # A failed storage service registers again with the same id, on another service port
+        with patch.object(ServiceRegistry._logger, 'info'):
+            s_id = ServiceRegistry.get(name="Fledge Storage")[0]._id
+            ServiceRegistry.mark_as_failed(s_id)
+            assert s_id == ServiceRegistry.register("Fledge Storage", "Storage", "127.0.0.1", 37451, 37844)
+        assert '127.0.0.1:37451' == connect.get_storage_async().base_url
+        assert '127.0.0.1:37451' == connect.get_readings_async().base_url
@@ -109,7 +109,9 @@ class TestServer:
         Server._configuration_manager = ConfigurationManager(storage_client_mock)
         value = {'cacheSize': {'description': 'To control the caching size of Core Configuration Manager',
                                'type': 'integer', 'displayName': 'Cache Size', 'default': '30', 'value': '30',
-                               'order': '1', 'minimum': '1', 'maximum': '1000'}}
+                               'order': '1', 'minimum': '1', 'maximum': '1000'},
+                 'cacheTTL': {'description': 'Cache TTL', 'type': 'integer', 'default': '0', 'value': '60'},
+                 'cacheMemoryLimit': {'description': 'Cache memory', 'type': 'integer', 'default': '0', 'value': '2'}}
 
         rv = await async_mock(value) if sys.version_info.major == 3 and sys.version_info.minor >= 8 else (
             asyncio.ensure_future(async_mock(value)))
@@ -119,10 +121,37 @@ class TestServer:
                               return_value=rv) as patch_get_all_cat:
                 await Server.setup_config_manager()
             patch_get_all_cat.assert_called_once_with('CONFIGURATION')
+        assert 30 == Server._configuration_manager._cacheManager.max_cache_size
+        assert 60 == Server._configuration_manager._cacheManager.ttl
+        assert 2048 == Server._configuration_manager._cacheManager.max_cache_bytes
         patch_create_cat.assert_called_once_with('CONFIGURATION', Server._CONFIGURATION_DEFAULT_CONFIG,
                                                  'Core Configuration Manager', True,
                                                  display_name='Configuration Manager')
 
+    async def test_storage_client_setup(self):
+        async def async_mock(return_value):
+            return return_value
+
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        Server._configuration_manager = ConfigurationManager(storage_client_mock)
+        value = {'connectionLimit': {'description': 'Limit', 'type': 'integer', 'default': '100', 'value': '20'},
+                 'connectionLimitPerHost': {'description': 'Limit', 'type': 'integer', 'default': '0', 'value': '5'},
+                 'keepaliveTimeout': {'description': 'Keepalive', 'type': 'float', 'default': '30', 'value': '7.5'}}
+
+        rv = await async_mock(value) if sys.version_info.major == 3 and sys.version_info.minor >= 8 else (
+            asyncio.ensure_future(async_mock(value)))
+        with patch.object(Server._configuration_manager, 'create_category',
+                          return_value=rv) as patch_create_cat:
+            with patch.object(Server._configuration_manager, 'get_category_all_items',
+                              return_value=rv) as patch_get_all_cat:
+                with patch.object(StorageClientAsync.session_pool, 'configure') as patch_configure:
+                    await Server.storage_client_setup()
+                patch_configure.assert_called_once_with(limit=20, limit_per_host=5, keepalive_timeout=7.5)
+            patch_get_all_cat.assert_called_once_with('STORAGE_CLIENT')
+        patch_create_cat.assert_called_once_with('STORAGE_CLIENT', Server._STORAGE_CLIENT_DEFAULT_CONFIG,
+                                                 'Connection pool of the Core to the Storage service', True,
+                                                 display_name='Storage Client')
+
     @pytest.mark.asyncio
     @pytest.mark.skip(reason="To be implemented")
     async def test__make_app(self):
@@ -673,6 +702,7 @@ class TestServer:
                     args, kwargs = audit_info_patch.call_args
                     assert 'SRVRG' == args[0]
                     assert {'name': request_data['name']} == args[1]
+                    assert {'wait': True} == kwargs
             args, _ = patch_register.call_args
             assert (request_data['name'], request_data['type'], request_data['address'],
                     request_data['service_port'], request_data['management_port'], 'http', None) == args
@@ -715,11 +745,33 @@ class TestServer:
                     args, kwargs = audit_info_patch.call_args
                     assert 'SRVUN' == args[0]
                     assert {'name': sname} == args[1]
+                    assert {'wait': True} == kwargs
             args1, kwargs1 = patch_unregister.call_args
             assert (service_id,) == args1
         args2, kwargs2 = patch_get_unregister.call_args
         assert {'idx': service_id} == kwargs2
 
+    ############################
+    # Asset Tracker
+    ############################
+
+    async def test_add_track_batch(self, client):
+        async def add_asset_record(*, asset, event, service, plugin, jsondata={}):
+            if asset == 'bad':
+                raise ValueError('Failed to add asset record')
+            return {"asset": asset, "event": event, "service": service, "plugin": plugin, "fledge": "fl"}
+
+        events = [{"asset": asset, "event": "Ingest", "service": "PT100_In1", "plugin": "PT100"}
+                  for asset in ("AirIntake", "bad")]
+        with patch.object(Server, "_asset_tracker", MagicMock(add_asset_record=add_asset_record)):
+            with patch.object(server._logger, "warning") as patch_warning:
+                resp = await client.post('/fledge/track', data=json.dumps(events))
+        assert 200 == resp.status
+        json_response = json.loads(await resp.text())
+        assert [dict(events[0], fledge="fl")] == json_response["track"]
+        assert [events[1]] == json_response["failed"]
+        assert 1 == patch_warning.call_count
+
     ############################
     # Common
     ############################
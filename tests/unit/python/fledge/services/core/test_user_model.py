@@ -8,6 +8,7 @@ import json
 import asyncio
 from unittest.mock import MagicMock, patch
 import sys
+import time
 import pytest
 from datetime import datetime
 
@@ -16,7 +17,8 @@ from fledge.common.configuration_manager import ConfigurationManager
 from fledge.common.storage_client.storage_client import StorageClientAsync
 from fledge.common.storage_client.exceptions import StorageServerError
 from fledge.services.core import connect
-from fledge.services.core.user_model import User
+from fledge.services.core import user_model
+from fledge.services.core.user_model import User, _logger
 
 __author__ = "Ashish Jabble"
 __copyright__ = "Copyright (c) 2017 OSIsoft, LLC"
@@ -32,6 +34,14 @@ async def mock_coro(*args, **kwargs):
 
 class TestUserModel:
 
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        yield
+        if User.Cache.write_task is not None:
+            User.Cache.write_task.cancel()
+            User.Cache.write_task = None
+        User.Cache.clear()
+
     async def test_initial_value(self):
         obj = User(1, 'admin', 'fledge')
         assert obj.uid == 1
@@ -820,9 +830,73 @@ class TestUserModel:
         with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
             with patch.object(storage_client_mock, 'update_tbl', return_value=_rv) as update_tbl_patch:
                 await User.Objects.refresh_token_expiry(token)
+                # Written lazily
+                assert User.Cache.write_task is not None
+                update_tbl_patch.assert_not_called()
+                await User.Objects.write_token_expiry()
             # FIXME: datetime.now() patch and then payload assertion
             args, kwargs = update_tbl_patch.call_args
             assert 'user_logins' == args[0]
+            update = args[1]['updates'][0]
+            assert ["allowzero"] == update['modifier']
+            assert payload['where'] == update['where']
+            assert {} == User.Cache.token_expiry
+
+    async def test_write_token_expiry_failure(self):
+        storage_client_mock = MagicMock(StorageClientAsync)
+        User.Cache.token_expiry.update({'token1': '2018-03-13 15:33:25.959408'})
+        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+            with patch.object(storage_client_mock, 'update_tbl', side_effect=Exception("blah")):
+                with patch.object(_logger, 'error') as patch_logger:
+                    await User.Objects.write_token_expiry()
+            patch_logger.assert_called_once()
+        # Kept for the next write
+        assert {'token1': '2018-03-13 15:33:25.959408'} == User.Cache.token_expiry
+
+    async def test_auth_lookups_are_cached(self):
+        token = ("eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzUxMiJ9.eyJ1aWQiOjIsImV4cCI6MTcxNzQxNzAwMH0."
+                 "J9y-y_ssMTQJm5vzZiBIj8OjcoreIPRDUskl3_X0HRibX5ck5f_J8Ii-_WXngeIFdOdEWGz6KG5mB6QQiPQYcg")
+        results = {'user_logins': {'rows': [{"token_expiration": "2017-03-14 15:09:19.800648"}], 'count': 1},
+                   'users': {'rows': [{'id': 2, 'uname': 'user', 'role_id': 2}], 'count': 1},
+                   'roles': {'rows': [{'id': 1}], 'count': 1}}
+
+        async def query_tbl_with_payload(table, payload):
+            return results[table]
+
+        storage_client_mock = MagicMock(StorageClientAsync)
+        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+            with patch.object(storage_client_mock, 'query_tbl_with_payload',
+                              side_effect=query_tbl_with_payload) as query_tbl_patch:
+                for _ in range(3):
+                    assert 2 == await User.Objects.validate_token(token)
+                    assert 'user' == (await User.Objects.get(uid=2))['uname']
+                    assert [{'id': 1}] == await User.Objects.get_role_id_by_name('admin')
+                assert 3 == query_tbl_patch.call_count
+                # Logout
+                User.Cache.invalidate_user(2)
+                assert 2 == await User.Objects.validate_token(token)
+                await User.Objects.get(uid=2)
+                await User.Objects.get_role_id_by_name('admin')
+                assert 5 == query_tbl_patch.call_count
+                # Expired entries
+                with patch.object(user_model, 'AUTH_CACHE_TTL_SECONDS', -1):
+                    User.Cache.store(User.Cache.users, '2', {'id': 2})
+                await User.Objects.get(uid=2)
+                assert 6 == query_tbl_patch.call_count
+
+    def test_cache_sweep(self):
+        # Not swept before next_sweep
+        User.Cache.next_sweep = time.monotonic() + 60
+        with patch.object(user_model, 'AUTH_CACHE_TTL_SECONDS', -1):
+            User.Cache.store(User.Cache.tokens, 'gone', {'uid': 2})
+            User.Cache.store(User.Cache.roles, 'admin', [{'id': 1}])
+        User.Cache.store(User.Cache.users, '2', {'id': 2})
+        assert 'gone' in User.Cache.tokens and 'admin' in User.Cache.roles
+        User.Cache.next_sweep = 0
+        User.Cache.store(User.Cache.users, '3', {'id': 3})
+        assert {} == User.Cache.tokens == User.Cache.roles
+        assert User.Cache.next_sweep > time.monotonic()
+        assert ['2', '3'] == sorted(User.Cache.users)
 
     async def test_invalid_token(self):
         storage_client_mock = MagicMock(StorageClientAsync)
@@ -14,6 +14,7 @@ import asyncio
 from unittest.mock import MagicMock, call
 from fledge.services.south.ingest import *
 from fledge.services.south import ingest
+from fledge.services.south.readings_buffer import ReadingsBuffer
 from fledge.common.storage_client.storage_client import StorageClientAsync, ReadingsStorageClientAsync
 from fledge.common.microservice_management_client.microservice_management_client import MicroserviceManagementClient
 
@@ -49,15 +50,11 @@ class TestIngest:
         Ingest._write_statistics_sleep_task = None  # type: asyncio.Task
         Ingest._stop = False
         Ingest._started = False
-        Ingest._readings_lists = None  # type: List
-        Ingest._current_readings_list_index = 0
+        Ingest._readings_buffer = None  # type: ReadingsBuffer
         Ingest._insert_readings_tasks = None  # type: List[asyncio.Task]
-        Ingest._readings_list_batch_size_reached = None  # type: List[asyncio.Event]
-        Ingest._readings_list_not_empty = None  # type: List[asyncio.Event]
-        Ingest._readings_lists_not_full = None  # type: asyncio.Event
+        Ingest._readings_batch_size_reached = None  # type: asyncio.Event
         Ingest._insert_readings_wait_tasks = None  # type: List[asyncio.Task]
         Ingest._last_insert_time = 0  # type: int
-        Ingest._readings_list_size = 0  # type: int
         Ingest._write_statistics_frequency_seconds = 5
         Ingest._readings_buffer_size = 500
         Ingest._max_concurrent_readings_inserts = 5
@@ -65,6 +62,12 @@ class TestIngest:
         Ingest._readings_insert_batch_timeout_seconds = 1
         Ingest._max_readings_insert_batch_connection_idle_seconds = 60
         Ingest._max_readings_insert_batch_reconnect_wait_seconds = 10
+        Ingest._tracked_asset_events = set()
+        Ingest._asset_tracker_service = None
+        Ingest._asset_tracker_plugin = None
+        Ingest._pending_asset_events = []
+        Ingest._register_asset_tracker_events_task = None
+        Ingest._asset_event_retries = {}
         Ingest.category = 'South'
         Ingest.default_config = {
             "readings_buffer_size": {
@@ -101,6 +104,11 @@ class TestIngest:
                 "type": "integer",
                 "default": str(Ingest._max_readings_insert_batch_reconnect_wait_seconds)
             },
+            "write_statistics_frequency_seconds": {
+                "description": "Number of seconds between two writes of the readings statistics to storage",
+                "type": "integer",
+                "default": str(Ingest._write_statistics_frequency_seconds)
+            },
         }
 
     @pytest.mark.asyncio
@@ -214,28 +222,37 @@ class TestIngest:
         mocker.patch.object(MicroserviceManagementClient, "__init__", return_value=None)
         create_cfg = mocker.patch.object(MicroserviceManagementClient, "create_configuration_category", return_value=None)
         get_cfg = mocker.patch.object(MicroserviceManagementClient, "get_configuration_category", return_value=get_cat(Ingest.default_config))
-        mocker.patch.object(MicroserviceManagementClient, "get_asset_tracker_events", return_value={'track':[]})
+        track = [{"asset": "pump1", "event": "Ingest", "service": "test", "plugin": "dummy", "fledge": "fl",
+                  "timestamp": "2024-01-01 00:00:00.000", "deprecatedTimestamp": "", "data": {}},
+                 {"asset": "pump2", "event": "Ingest", "service": "test", "plugin": "dummy", "fledge": "fl",
+                  "timestamp": "2024-01-01 00:00:00.000", "deprecatedTimestamp": "2024-01-02 00:00:00.000",
+                  "data": {}}]
+        mocker.patch.object(MicroserviceManagementClient, "get_asset_tracker_events", return_value={'track': track})
         mocker.patch.object(MicroserviceManagementClient, "create_child_category", return_value=None)
         mocker.patch.object(statistics, "create_statistics", return_value=_rv2)
         parent_service = MagicMock(_core_microservice_management_client=MicroserviceManagementClient())
+        parent_service._name = "test"
+        parent_service._plugin_info = {'config': {'plugin': {'default': 'dummy'}}}
         mocker.patch.object(Ingest, "_write_statistics", return_value=_rv1)
+        mocker.patch.object(Ingest, "_write_statistics_loop", return_value=_rv1)
         mocker.patch.object(Ingest, "_insert_readings", return_value=_rv1)
 
         # WHEN
         await Ingest.start(parent=parent_service)
 
         # THEN
+        # deprecated events are not indexed, so that they are registered again
+        assert {("test", "dummy", "pump1", "Ingest")} == Ingest._tracked_asset_events
         assert 1 == create_cfg.call_count
         assert 1 == get_cfg.call_count
         assert Ingest._stop is False
         assert Ingest._started is True
-        assert Ingest._readings_list_size == int(Ingest._readings_buffer_size / (
-            Ingest._max_concurrent_readings_inserts))
+        assert Ingest._readings_buffer_size == Ingest._readings_buffer.capacity
+        assert 0 == len(Ingest._readings_buffer)
         assert Ingest._last_insert_time is 0
-        assert Ingest._max_concurrent_readings_inserts == len(Ingest._insert_readings_wait_tasks)
-        assert Ingest._max_concurrent_readings_inserts == len(Ingest._readings_list_batch_size_reached)
-        assert Ingest._max_concurrent_readings_inserts == len(Ingest._readings_list_not_empty)
-        assert Ingest._max_concurrent_readings_inserts == len(Ingest._readings_lists)
+        assert [None] * Ingest._max_concurrent_readings_inserts == Ingest._insert_readings_wait_tasks
+        assert Ingest._max_concurrent_readings_inserts == len(Ingest._insert_readings_tasks)
+        assert isinstance(Ingest._readings_batch_size_reached, asyncio.Event)
         assert 0 == log_warning.call_count
 
     @pytest.mark.asyncio
@@ -271,6 +288,7 @@ class TestIngest:
         mocker.patch.object(statistics, "create_statistics", return_value=_rv2)
         parent_service = MagicMock(_core_microservice_management_client=MicroserviceManagementClient())
         mocker.patch.object(Ingest, "_write_statistics", return_value=_rv1)
+        mocker.patch.object(Ingest, "_write_statistics_loop", return_value=_rv1)
         mocker.patch.object(Ingest, "_insert_readings", return_value=_rv1)
 
         # WHEN
@@ -285,10 +303,8 @@ class TestIngest:
         assert Ingest._started is False
         assert Ingest._insert_readings_wait_tasks is None
         assert Ingest._insert_readings_tasks is None
-        assert Ingest._readings_lists is None
-        assert Ingest._readings_list_batch_size_reached is None
-        assert Ingest._readings_list_not_empty is None
-        assert Ingest._readings_lists_not_full is None
+        assert Ingest._readings_buffer is None
+        assert Ingest._readings_batch_size_reached is None
         assert 0 == log_exception.call_count
 
     @pytest.mark.asyncio
@@ -300,26 +316,148 @@ class TestIngest:
         # THEN
         assert 1 == Ingest._discarded_readings_stats
 
-    @pytest.mark.skip(reason="This method uses a while True loop. Investigate as to how to write unit test for an infinite loop.")
     @pytest.mark.asyncio
     async def test__insert_readings(self, mocker):
-        pass
+        # GIVEN
+        Ingest._readings_insert_batch_size = 2
+        Ingest._readings_buffer = ReadingsBuffer(4)
+        Ingest._readings_batch_size_reached = asyncio.Event()
+        for i in range(3):
+            Ingest._readings_buffer.append("pump1", "2017-01-02T01:02:03.23232Z-05:00", {"i": i})
+        Ingest._stop = True
+        payloads = []
+
+        async def append(payload):
+            payloads.append(payload)
+        Ingest.readings_storage_async = MagicMock(spec=ReadingsStorageClientAsync)
+        Ingest.readings_storage_async.append.side_effect = append
+        write_stats = mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
+
+        # WHEN
+        await Ingest._insert_readings()
+
+        # THEN
+        # Pending readings are sent in batches when stopping
+        assert [[0, 1], [2]] == [[r['reading']['i'] for r in p['readings']] for p in payloads]
+        assert {'asset_code': 'pump1', 'reading': {'i': 0}, 'user_ts': '2017-01-02T01:02:03.23232Z-05:00'} == \
+            payloads[0]['readings'][0]
+        assert 3 == Ingest._readings_stats
+        assert 0 == len(Ingest._readings_buffer)
+        # statistics are written by the statistics task, not by the flush workers
+        assert 0 == write_stats.call_count
+
+    @pytest.mark.asyncio
+    async def test__insert_readings_workers_send_in_parallel(self, mocker):
+        # GIVEN
+        Ingest._readings_insert_batch_size = 2
+        Ingest._max_concurrent_readings_inserts = 3
+        Ingest._readings_buffer = ReadingsBuffer(6)
+        Ingest._readings_batch_size_reached = asyncio.Event()
+        Ingest._insert_readings_wait_tasks = [None] * 3
+        for i in range(6):
+            Ingest._readings_buffer.append("pump1", "2017-01-02T01:02:03.23232Z-05:00", {"i": i})
+        in_flight = []
+        sent = asyncio.Event()
+
+        async def append(payload):
+            in_flight.append(payload)
+            await sent.wait()
+        Ingest.readings_storage_async = MagicMock(spec=ReadingsStorageClientAsync)
+        Ingest.readings_storage_async.append.side_effect = append
+        mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
+
+        # WHEN
+        workers = [asyncio.ensure_future(Ingest._insert_readings(i)) for i in range(3)]
+        await asyncio.sleep(0.1)
+
+        # THEN
+        # every worker has its own batch in flight
+        assert 3 == len(in_flight)
+        assert [[0, 1], [2, 3], [4, 5]] == [[r['reading']['i'] for r in p['readings']] for p in in_flight]
+        assert 6 == Ingest._readings_buffer.in_flight
+        Ingest._stop = True
+        sent.set()
+        await asyncio.gather(*workers)
+        assert 6 == Ingest._readings_stats
+        assert 0 == len(Ingest._readings_buffer)
 
-    @pytest.mark.skip(reason="This method uses a while True loop. Investigate as to how to write unit test for an infinite loop.")
     @pytest.mark.asyncio
     async def test_write_statistics(self, mocker):
-        pass
+        # GIVEN
+        Ingest._readings_stats = 10
+        Ingest._discarded_readings_stats = 0
+        Ingest._sensor_stats = {'PUMP1': 6, 'PUMP2': 4, 'PUMP3': 0}
+        Ingest._registered_stats_keys = {'READINGS', 'DISCARDED', 'PUMP1'}
+        Ingest.stats = MagicMock()
+        Ingest.stats.register.side_effect = lambda key, description: mock_coro()
+        Ingest.stats.update_bulk.side_effect = lambda updates: mock_coro()
+
+        # WHEN
+        await Ingest._write_statistics()
+        # nothing was collected since the previous write
+        await Ingest._write_statistics()
+
+        # THEN
+        # only the key not registered yet is registered, counters without increments are left out
+        Ingest.stats.register.assert_called_once_with(
+            'PUMP2', 'Readings received by Fledge since startup for sensor PUMP2')
+        Ingest.stats.update_bulk.assert_called_once_with({'READINGS': 10, 'PUMP1': 6, 'PUMP2': 4})
+        assert {'READINGS', 'DISCARDED', 'PUMP1', 'PUMP2'} == Ingest._registered_stats_keys
+        assert 0 == Ingest._readings_stats
+        assert {'PUMP1': 0, 'PUMP2': 0, 'PUMP3': 0} == Ingest._sensor_stats
+
+    @pytest.mark.asyncio
+    async def test_write_statistics_failure(self, mocker):
+        # GIVEN
+        Ingest._readings_stats = 10
+        Ingest._discarded_readings_stats = 2
+        Ingest._sensor_stats = {'PUMP1': 10}
+        Ingest._registered_stats_keys = {'READINGS', 'DISCARDED', 'PUMP1'}
+        Ingest.stats = MagicMock()
+
+        async def update_bulk(updates):
+            # readings added while the write is in progress are kept for the next write
+            Ingest._readings_stats += 1
+            Ingest._sensor_stats['PUMP1'] += 1
+            raise StorageServerError(400, "Bad Request", {"retryable": False})
+        Ingest.stats.update_bulk.side_effect = update_bulk
+        log_exception = mocker.patch.object(ingest._LOGGER, "exception")
+
+        # WHEN
+        await Ingest._write_statistics()
+
+        # THEN
+        # the counters are given back
+        assert 11 == Ingest._readings_stats
+        assert 2 == Ingest._discarded_readings_stats
+        assert {'PUMP1': 11} == Ingest._sensor_stats
+        assert 1 == log_exception.call_count
+
+    @pytest.mark.asyncio
+    async def test_write_statistics_loop(self, mocker):
+        # GIVEN
+        Ingest._write_statistics_frequency_seconds = 0.01
+        write_stats = mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
+
+        # WHEN
+        task = asyncio.ensure_future(Ingest._write_statistics_loop())
+        await asyncio.sleep(0.2)
+        Ingest._stop = True
+        if Ingest._write_statistics_sleep_task is not None:
+            Ingest._write_statistics_sleep_task.cancel()
+        await task
+
+        # THEN
+        assert write_stats.call_count >= 2
+        assert Ingest._write_statistics_sleep_task is None
 
     @pytest.mark.asyncio
     async def test_is_available_at_start(self, mocker):
         # GIVEN
         Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        # Insert one task and leave room for more
-        Ingest._readings_lists[0].append(await mock_coro())
+        Ingest._readings_buffer = ReadingsBuffer(2)
+        # Insert one reading and leave room for more
+        Ingest._readings_buffer.append("pump1", "2017-01-02T01:02:03.23232Z-05:00", {})
         log_warning = mocker.patch.object(ingest._LOGGER, "warning")
         mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
         mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
@@ -335,11 +473,8 @@ class TestIngest:
     async def test_is_available_at_stop(self, mocker):
         # GIVEN
         Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_lists[0].append(await mock_coro())
+        Ingest._readings_buffer = ReadingsBuffer(2)
+        Ingest._readings_buffer.append("pump1", "2017-01-02T01:02:03.23232Z-05:00", {})
         log_warning = mocker.patch.object(ingest._LOGGER, "warning")
         Ingest._stop = True
         mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
@@ -353,16 +488,13 @@ class TestIngest:
         assert 0 == log_warning.call_count
 
     @pytest.mark.asyncio
-    async def test_is_available_when_all_lists_full(self, mocker):
+    async def test_is_available_when_buffer_full(self, mocker):
         # GIVEN
         Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        # Insert two tasks
-        Ingest._readings_lists[0].append(await mock_coro())
-        Ingest._readings_lists[0].append(await mock_coro())
+        Ingest._readings_buffer = ReadingsBuffer(2)
+        # Insert two readings
+        Ingest._readings_buffer.append("pump1", "2017-01-02T01:02:03.23232Z-05:00", {})
+        Ingest._readings_buffer.append("pump1", "2017-01-02T01:02:03.23232Z-05:00", {})
         log_warning = mocker.patch.object(ingest._LOGGER, "warning")
         mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
         mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
@@ -373,7 +505,7 @@ class TestIngest:
         # THEN
         assert retval is False
         assert 1 == log_warning.call_count
-        log_warning.assert_called_with('The ingest service is unavailable %s', 0)
+        log_warning.assert_called_with('The ingest service is unavailable, the readings buffer is full')
 
     @pytest.mark.asyncio
     async def test_add_readings_all_ok(self, mocker):
@@ -390,18 +522,14 @@ class TestIngest:
                 }
         }
         Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_list_not_empty = []
-        Ingest._readings_list_not_empty.append(asyncio.Event())
+        Ingest._readings_buffer = ReadingsBuffer(2)
+        Ingest._readings_batch_size_reached = asyncio.Event()
         Ingest._started = True
         mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
         mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
         mocker.patch.object(MicroserviceManagementClient, "__init__", return_value=None)
-        mocker.patch.object(MicroserviceManagementClient, "create_asset_tracker_event", return_value=None)
-        assert 0 == len(Ingest._readings_lists[0])
+        mocker.patch.object(Ingest, "_register_asset_tracker_events", return_value=(await mock_coro()))
+        assert 0 == len(Ingest._readings_buffer)
         assert 'PUMP1' not in list(Ingest._sensor_stats.keys())
 
         # WHEN
@@ -410,7 +538,7 @@ class TestIngest:
                                   readings=data['readings'])
 
         # THEN
-        assert 1 == len(Ingest._readings_lists[0])
+        assert 1 == len(Ingest._readings_buffer)
 
     @pytest.mark.asyncio
     async def test_add_readings_if_stop(self, mocker):
@@ -427,17 +555,13 @@ class TestIngest:
                 }
         }
         Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_list_not_empty = []
-        Ingest._readings_list_not_empty.append(asyncio.Event())
+        Ingest._readings_buffer = ReadingsBuffer(2)
+        Ingest._readings_batch_size_reached = asyncio.Event()
         Ingest._stop = True
         log_warning = mocker.patch.object(ingest._LOGGER, "warning")
         mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
         mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
 
         # WHEN
         await Ingest.add_readings(asset=data['asset'],
@@ -445,7 +569,7 @@ class TestIngest:
                                   readings=data['readings'])
 
         # THEN
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
         assert 1 == log_warning.call_count
         log_warning.assert_called_with('The South Service is stopping')
 
@@ -464,16 +588,12 @@ class TestIngest:
                 }
         }
         Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_list_not_empty = []
-        Ingest._readings_list_not_empty.append(asyncio.Event())
+        Ingest._readings_buffer = ReadingsBuffer(2)
+        Ingest._readings_batch_size_reached = asyncio.Event()
         Ingest._started = False
         mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
         mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
 
         # WHEN
         with pytest.raises(RuntimeError):
@@ -482,7 +602,7 @@ class TestIngest:
                                       readings=data['readings'])
 
         # THEN
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
 
     @pytest.mark.asyncio
     async def test_add_readings_incorrect_data_values(self, mocker):
@@ -499,16 +619,12 @@ class TestIngest:
                 }
         }
         Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_list_not_empty = []
-        Ingest._readings_list_not_empty.append(asyncio.Event())
+        Ingest._readings_buffer = ReadingsBuffer(2)
+        Ingest._readings_batch_size_reached = asyncio.Event()
         Ingest._started = True
         mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
         mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
 
         # WHEN
         # Check for asset None
@@ -535,10 +651,10 @@ class TestIngest:
                                       timestamp=data['timestamp'],
                                       readings=123)
         # THEN
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
 
     @pytest.mark.asyncio
-    async def test_add_readings_when_one_list_becomes_full(self, mocker):
+    async def test_add_readings_when_buffer_becomes_full(self, mocker):
         # GIVEN
         data = {
                 "timestamp": "2017-01-02T01:02:03.23232Z-05:00",
@@ -552,36 +668,185 @@ class TestIngest:
                 }
         }
         Ingest._max_concurrent_readings_inserts = 2
-        Ingest._readings_list_size = 1
         Ingest._readings_insert_batch_size = 1
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_lists.append([])
-        Ingest._readings_list_not_empty = []
-        Ingest._readings_list_not_empty.append(asyncio.Event())
-        Ingest._readings_list_not_empty.append(asyncio.Event())
-        Ingest._readings_list_batch_size_reached = []
-        Ingest._readings_list_batch_size_reached.append(asyncio.Event())
-        Ingest._readings_list_batch_size_reached.append(asyncio.Event())
+        Ingest._readings_buffer = ReadingsBuffer(1)
+        Ingest._readings_batch_size_reached = asyncio.Event()
         Ingest._started = True
         mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
         mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
         mocker.patch.object(MicroserviceManagementClient, "__init__", return_value=None)
-        mocker.patch.object(MicroserviceManagementClient, "create_asset_tracker_event", return_value=None)
+        mocker.patch.object(Ingest, "_register_asset_tracker_events", return_value=(await mock_coro()))
 
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
         assert 'PUMP1' not in list(Ingest._sensor_stats.keys())
 
         # WHEN
         await Ingest.add_readings(asset=data['asset'],
                                   timestamp=data['timestamp'],
                                   readings=data['readings'])
-        # First reading_list is full, so now add to second list
+        assert Ingest._readings_batch_size_reached.is_set()
+        # The buffer is full, so the second reading is discarded
         await Ingest.add_readings(asset=data['asset'],
                                   timestamp=data['timestamp'],
                                   readings=data['readings'])
 
         # THEN
-        assert 1 == len(Ingest._readings_lists[0])
-        assert 1 == len(Ingest._readings_lists[1])
+        assert 1 == len(Ingest._readings_buffer)
+        assert 1 == Ingest._discarded_readings_stats
+        assert 1 == Ingest._sensor_stats['PUMP1']
+
+    @pytest.mark.asyncio
+    async def test_add_readings_tracks_asset_once(self, mocker):
+        Ingest._max_concurrent_readings_inserts = 1
+        Ingest._readings_buffer = ReadingsBuffer(10)
+        Ingest._readings_batch_size_reached = asyncio.Event()
+        Ingest._started = True
+        Ingest._asset_tracker_service = "test"
+        Ingest._asset_tracker_plugin = "dummy"
+        Ingest._tracked_asset_events = {("test", "dummy", "pump1", "Ingest")}
+        mocker.patch.object(MicroserviceManagementClient, "__init__", return_value=None)
+        Ingest._parent_service = MagicMock(_core_microservice_management_client=MicroserviceManagementClient())
+        create_events = mocker.patch.object(MicroserviceManagementClient, "create_asset_tracker_events",
+                                            return_value=[])
+        if sys.version_info < (3, 8):
+            create_events.return_value = asyncio.ensure_future(asyncio.sleep(0, result=[]))
+
+        # WHEN
+        for asset in ("pump1", "pump2", "pump3", "pump2", "pump1"):
+            await Ingest.add_readings(asset=asset, timestamp="2017-01-02T01:02:03.23232Z-05:00",
+                                      readings={"velocity": 500})
+        await Ingest._register_asset_tracker_events_task
+
+        # THEN
+        assert 5 == len(Ingest._readings_buffer)
+        create_events.assert_called_once_with([
+            {"asset": "pump2", "event": "Ingest", "service": "test", "plugin": "dummy"},
+            {"asset": "pump3", "event": "Ingest", "service": "test", "plugin": "dummy"}])
+        assert [] == Ingest._pending_asset_events
+        assert {("test", "dummy", "pump1", "Ingest"), ("test", "dummy", "pump2", "Ingest"),
+                ("test", "dummy", "pump3", "Ingest")} == Ingest._tracked_asset_events
+
+    @pytest.mark.asyncio
+    async def test_register_asset_tracker_events_failure(self, mocker):
+        events = [{"asset": asset, "event": "Ingest", "service": "test", "plugin": "dummy"}
+                  for asset in ("pump1", "pump2")]
+        Ingest._tracked_asset_events = {("test", "dummy", "pump1", "Ingest"), ("test", "dummy", "pump2", "Ingest")}
+        Ingest._pending_asset_events = list(events)
+        mocker.patch.object(MicroserviceManagementClient, "__init__", return_value=None)
+        Ingest._parent_service = MagicMock(_core_microservice_management_client=MicroserviceManagementClient())
+        create_events = mocker.patch.object(MicroserviceManagementClient, "create_asset_tracker_events",
+                                            return_value=[events[1]])
+        if sys.version_info < (3, 8):
+            create_events.return_value = asyncio.ensure_future(asyncio.sleep(0, result=[events[1]]))
+
+        # WHEN
+        await Ingest._register_asset_tracker_events()
+
+        # THEN
+        create_events.assert_called_once_with(events)
+        # failed events are dropped from the index, so that a reading of the asset queues them again after a delay
+        assert {("test", "dummy", "pump1", "Ingest")} == Ingest._tracked_asset_events
+        assert [] == Ingest._pending_asset_events
+        retry_at, delay = Ingest._asset_event_retries[("test", "dummy", "pump2", "Ingest")]
+        assert [("test", "dummy", "pump2", "Ingest")] == list(Ingest._asset_event_retries)
+        assert Ingest._ASSET_TRACKER_RETRY_SECONDS == delay
+
+    @pytest.mark.asyncio
+    async def test_track_asset_backoff(self, mocker):
+        Ingest._asset_tracker_service = "test"
+        Ingest._asset_tracker_plugin = "dummy"
+        key = ("test", "dummy", "pump1", "Ingest")
+        event = {"asset": "pump1", "event": "Ingest", "service": "test", "plugin": "dummy"}
+        mocker.patch.object(MicroserviceManagementClient, "__init__", return_value=None)
+        Ingest._parent_service = MagicMock(_core_microservice_management_client=MicroserviceManagementClient())
+        create_events = mocker.patch.object(MicroserviceManagementClient, "create_asset_tracker_events",
+                                            return_value=[event])
+        if sys.version_info < (3, 8):
+            create_events.return_value = asyncio.ensure_future(asyncio.sleep(0, result=[event]))
+        monotonic = mocker.patch.object(ingest, "time").monotonic
+        monotonic.return_value = 100
+
+        Ingest._track_asset("pump1")
+        await Ingest._register_asset_tracker_events_task
+        assert (101, 1) == Ingest._asset_event_retries[key]
+
+        # Not queued again before the retry delay has elapsed
+        Ingest._track_asset("pump1")
+        assert [] == Ingest._pending_asset_events
+        assert 1 == create_events.call_count
+
+        # The delay doubles on each consecutive failure
+        monotonic.return_value = 101
+        Ingest._track_asset("pump1")
+        await Ingest._register_asset_tracker_events_task
+        assert (103, 2) == Ingest._asset_event_retries[key]
+
+        # A successful registration indexes the event and clears its retry delay
+        create_events.return_value = []
+        if sys.version_info < (3, 8):
+            create_events.return_value = asyncio.ensure_future(asyncio.sleep(0, result=[]))
+        monotonic.return_value = 103
+        Ingest._track_asset("pump1")
+        await Ingest._register_asset_tracker_events_task
+        assert {key} == Ingest._tracked_asset_events
+        assert {} == Ingest._asset_event_retries
+        assert 3 == create_events.call_count
+
+    @pytest.mark.asyncio
+    async def test_add_readings_batch(self, mocker):
+        # GIVEN
+        Ingest._readings_insert_batch_size = 2
+        Ingest._readings_buffer = ReadingsBuffer(4)
+        Ingest._readings_batch_size_reached = asyncio.Event()
+        Ingest._started = True
+        track_asset = mocker.patch.object(Ingest, "_track_asset")
+        log_warning = mocker.patch.object(ingest._LOGGER, "warning")
+        ts = "2017-01-02T01:02:03.23232Z-05:00"
+        data = [
+            {"asset": "pump1", "timestamp": ts, "readings": {"velocity": 1}},
+            {"asset": "pump2", "timestamp": ts, "readings": {"velocity": 2}},
+            {"asset": 123, "timestamp": ts, "readings": {}},
+            {"asset": "pump1", "timestamp": None, "readings": {}},
+            {"asset": "pump1", "timestamp": ts, "readings": 5},
+            {"timestamp": ts, "readings": {}},
+            {"asset": "pump1", "timestamp": ts},
+        ]
+
+        # WHEN
+        added = await Ingest.add_readings_batch(data)
+
+        # THEN
+        assert 3 == added
+        assert [("pump1", ts, {"velocity": 1}), ("pump2", ts, {"velocity": 2}), ("pump1", ts, {})] == \
+            list(Ingest._readings_buffer.records(0, 3))
+        assert 4 == Ingest._discarded_readings_stats
+        assert {'PUMP1': 2, 'PUMP2': 1} == Ingest._sensor_stats
+        assert [call("pump1"), call("pump2")] == track_asset.call_args_list
+        assert Ingest._readings_batch_size_reached.is_set()
+        log_warning.assert_called_once_with('Discarded %s invalid readings of a batch of %s, last error: %s', 4, 7,
+                                            "KeyError('asset')")
+
+    @pytest.mark.asyncio
+    async def test_add_readings_batch_when_buffer_becomes_full(self, mocker):
+        # GIVEN
+        Ingest._readings_buffer = ReadingsBuffer(2)
+        Ingest._readings_batch_size_reached = asyncio.Event()
+        Ingest._started = True
+        mocker.patch.object(Ingest, "_track_asset")
+        log_warning = mocker.patch.object(ingest._LOGGER, "warning")
+        data = [{"asset": "pump1", "timestamp": "2017-01-02T01:02:03.23232Z-05:00", "readings": {"i": i}}
+                for i in range(3)]
+
+        # WHEN
+        added = await Ingest.add_readings_batch(data)
+
+        # THEN
+        assert 2 == added
+        assert 1 == Ingest._discarded_readings_stats
+        assert {'PUMP1': 2} == Ingest._sensor_stats
+        log_warning.assert_called_once_with('The ingest service is unavailable, the readings buffer is full')
+
+    @pytest.mark.asyncio
+    async def test_add_readings_batch_not_started(self):
+        with pytest.raises(RuntimeError):
+            await Ingest.add_readings_batch([])
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test services/south/readings_buffer.py """
+
+import pytest
+
+from fledge.services.south.readings_buffer import ReadingsBuffer
+
+__author__ = "agent"
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+TS = "2017-01-02T01:02:03.23232Z-05:00"
+
+
+def _fill(buffer, first, count):
+    for i in range(first, first + count):
+        assert buffer.append("asset{}".format(i), TS, {"i": i}) is True
+
+
+class TestReadingsBuffer:
+
+    @pytest.mark.parametrize("capacity", [0, -1, 1.5, "4", None, True])
+    def test_bad_capacity(self, capacity):
+        with pytest.raises(ValueError) as excinfo:
+            ReadingsBuffer(capacity)
+        assert "capacity must be a positive integer" == str(excinfo.value)
+
+    def test_append_until_full(self):
+        buffer = ReadingsBuffer(3)
+        assert 3 == buffer.capacity
+        _fill(buffer, 0, 3)
+        assert 3 == len(buffer)
+        assert 3 == buffer.pending
+        assert buffer.is_full()
+        assert buffer.append("asset3", TS, {}) is False
+        assert 3 == len(buffer)
+
+    def test_take_and_release(self):
+        buffer = ReadingsBuffer(4)
+        _fill(buffer, 0, 3)
+        start, end = buffer.take(2)
+        assert (0, 2) == (start, end)
+        assert 1 == buffer.pending
+        assert 2 == buffer.in_flight
+        assert [{'asset_code': 'asset0', 'reading': {'i': 0}, 'user_ts': TS},
+                {'asset_code': 'asset1', 'reading': {'i': 1}, 'user_ts': TS}] == buffer.readings(start, end)
+        buffer.release(start, end)
+        assert 1 == len(buffer)
+        assert 0 == buffer.in_flight
+        assert [None, None] == buffer._assets[:2] == buffer._readings[:2]
+
+    def test_take_from_empty(self):
+        buffer = ReadingsBuffer(2)
+        start, end = buffer.take(10)
+        assert start == end
+        assert [] == buffer.readings(start, end)
+
+    def test_wrap_around(self):
+        buffer = ReadingsBuffer(4)
+        _fill(buffer, 0, 3)
+        buffer.release(*buffer.take(3))
+        _fill(buffer, 3, 4)
+        assert buffer.is_full()
+        start, end = buffer.take(4)
+        assert ["asset3", "asset4", "asset5", "asset6"] == [r['asset_code'] for r in buffer.readings(start, end)]
+        buffer.release(start, end)
+        assert 0 == len(buffer)
+        assert [None] * 4 == buffer._assets == buffer._timestamps == buffer._readings
+
+    def test_concurrent_ranges_are_disjoint_and_released_in_order(self):
+        buffer = ReadingsBuffer(6)
+        _fill(buffer, 0, 6)
+        first = buffer.take(2)
+        second = buffer.take(2)
+        third = buffer.take(2)
+        assert [(0, 2), (2, 4), (4, 6)] == [first, second, third]
+        # Ranges released ahead of the head keep their slots until every range before them is released
+        buffer.release(*third)
+        buffer.release(*second)
+        assert 6 == len(buffer)
+        assert buffer.append("asset6", TS, {}) is False
+        buffer.release(*first)
+        assert 0 == len(buffer)
+        assert {} == buffer._released
+        _fill(buffer, 6, 6)
+
+    def test_extend(self):
+        buffer = ReadingsBuffer(4)
+        _fill(buffer, 0, 3)
+        buffer.release(*buffer.take(2))
+        assets = ["asset{}".format(i) for i in range(3, 7)]
+        readings = [{"i": i} for i in range(3, 7)]
+        # Only three slots are free, the last record does not fit
+        assert 3 == buffer.extend(assets, [TS] * 4, readings)
+        assert buffer.is_full()
+        assert 0 == buffer.extend(assets, [TS] * 4, readings)
+        start, end = buffer.take(4)
+        assert [("asset2", TS, {"i": 2}), ("asset3", TS, {"i": 3}), ("asset4", TS, {"i": 4}),
+                ("asset5", TS, {"i": 5})] == list(buffer.records(start, end))
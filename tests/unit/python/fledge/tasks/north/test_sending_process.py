@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test tasks/north/sending_process.py """
+
+import asyncio
+from unittest.mock import patch, MagicMock
+
+import aiohttp
+import pytest
+
+from fledge.common.process import FledgeProcess
+from fledge.common.storage_client.storage_client import ReadingsStorageClientAsync
+from fledge.tasks.north.sending_process import SendingProcess
+
+__author__ = "agent"
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+async def _collect(data_sets):
+    return [data_set async for data_set in data_sets]
+
+
+def _row(_id):
+    return {'id': _id, 'asset_code': 'sinusoid', 'reading': {'sinusoid': '{}.5'.format(_id)},
+            'user_ts': '2026-10-18 10:00:00.{:06d}'.format(_id)}
+
+
+@pytest.fixture
+def sending_process():
+    with patch.object(FledgeProcess, '__init__', return_value=None):
+        sp = SendingProcess(loop=asyncio.new_event_loop())
+    sp._readings = MagicMock(spec=ReadingsStorageClientAsync)
+    yield sp
+    sp._event_loop.close()
+
+
+class TestLoadDataIntoMemoryReadings:
+
+    async def test_sub_batches_are_converted(self, sending_process):
+        calls = []
+
+        async def fetch_iter(reading_id, count, chunk_size):
+            calls.append((reading_id, count, chunk_size))
+            yield [_row(11), _row(12)]
+            yield [_row(13)]
+
+        sending_process._config['blockSize'] = 3
+        sending_process._config['fetchChunkSize'] = 2
+        sending_process._readings.fetch_iter = fetch_iter
+        converted = await _collect(sending_process._load_data_into_memory_readings(10))
+        # +1 as the block starts after the last object sent
+        assert [(11, 3, 2)] == calls
+        # Each sub-batch is yielded on its own
+        assert [[11, 12], [13]] == [[row['id'] for row in rows] for rows in converted]
+        assert {'sinusoid': 11.5} == converted[0][0]['reading']
+        assert '2026-10-18T10:00:00.000011Z' == converted[0][0]['user_ts']
+        sending_process._readings.fetch.assert_not_called()
+
+    async def test_payload_error_keeps_converted_sub_batches(self, sending_process):
+        async def fetch_iter(reading_id, count, chunk_size):
+            yield [_row(1)]
+            raise aiohttp.client_exceptions.ClientPayloadError("Response payload is not completed")
+
+        sending_process._readings.fetch_iter = fetch_iter
+        with patch.object(SendingProcess._logger, 'warning') as patch_warning:
+            converted = await _collect(sending_process._load_data_into_memory_readings(0))
+        assert [[1]] == [[row['id'] for row in rows] for rows in converted]
+        assert 1 == patch_warning.call_count
+
+    async def test_storage_error_is_raised(self, sending_process):
+        async def fetch_iter(reading_id, count, chunk_size):
+            raise ValueError("bad block")
+            yield
+
+        sending_process._readings.fetch_iter = fetch_iter
+        with patch.object(SendingProcess._logger, 'error') as patch_error:
+            with pytest.raises(ValueError):
+                await _collect(sending_process._load_data_into_memory_readings(0))
+        assert 1 == patch_error.call_count
+
+
+class TestTaskFetchData:
+
+    async def test_sub_batches_are_buffered_one_by_one(self, sending_process):
+        fetched = []
+
+        async def fetch_iter(reading_id, count, chunk_size):
+            fetched.append(reading_id)
+            if reading_id > 1:
+                return
+            for _id in range(1, 6):
+                yield [_row(_id)]
+
+        sending_process._config['source'] = 'readings'
+        sending_process._config['memory_buffer_size'] = 2
+        sending_process._readings.fetch_iter = fetch_iter
+        sending_process._memory_buffer = [None, None]
+        sending_process._task_fetch_data_sem = asyncio.Semaphore(0)
+        sending_process._task_send_data_sem = asyncio.Semaphore(0)
+        sending_process._task_fetch_data_run = True
+        sent = []
+
+        async def last_object_id_read():
+            return 0
+
+        with patch.object(sending_process, '_last_object_id_read', side_effect=last_object_id_read):
+            task = asyncio.ensure_future(sending_process._task_fetch_data())
+            for _ in range(5):
+                await sending_process._task_fetch_data_sem.acquire()
+                # Never more sub-batches in memory than the in memory buffer holds
+                assert 2 >= len([rows for rows in sending_process._memory_buffer if rows is not None])
+                idx = len(sent) % 2
+                sent.append(sending_process._memory_buffer[idx][0]['id'])
+                sending_process._memory_buffer[idx] = None
+                sending_process._task_send_data_sem.release()
+            await asyncio.sleep(0.1)
+            sending_process._task_fetch_data_run = False
+            sending_process._task_send_data_sem.release()
+            task.cancel()
+        assert [1, 2, 3, 4, 5] == sent
+        # The next block starts after the last sub-batch buffered
+        assert [1, 6] == fetched[:2]